@@ -0,0 +1,40 @@
+"""Add generated start_lat/start_lng columns to courses for viewport queries.
+
+- courses.start_lat / start_lng: STORED generated from start_point so the
+  map-bounds query reads plain doubles instead of running ST_X/ST_Y per row
+- idx_courses_public_start_lng_lat: partial btree on (start_lng, start_lat)
+  WHERE is_public for index-range viewport scans
+
+Revision ID: 0063
+Revises: 0062
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0063"
+down_revision = "0062"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("""
+        ALTER TABLE courses
+            ADD COLUMN start_lat double precision
+                GENERATED ALWAYS AS (ST_Y(start_point::geometry)) STORED,
+            ADD COLUMN start_lng double precision
+                GENERATED ALWAYS AS (ST_X(start_point::geometry)) STORED
+    """))
+    op.create_index(
+        "idx_courses_public_start_lng_lat",
+        "courses",
+        ["start_lng", "start_lat"],
+        postgresql_where=sa.text("is_public = true"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_courses_public_start_lng_lat", table_name="courses")
+    op.drop_column("courses", "start_lng")
+    op.drop_column("courses", "start_lat")
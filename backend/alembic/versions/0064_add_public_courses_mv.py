@@ -0,0 +1,62 @@
+"""Add mv_public_courses materialized view for the course list endpoint.
+
+- mv_public_courses: public courses with creator and stats columns joined in
+- uq_mv_public_courses_id: unique index required by REFRESH ... CONCURRENTLY
+- gist on start_point, btree on (created_at DESC, id), distance_meters and
+  total_runs for the list filters/sorts
+
+Revision ID: 0064
+Revises: 0063
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0064"
+down_revision = "0063"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("""
+        CREATE MATERIALIZED VIEW mv_public_courses AS
+        SELECT
+            c.id,
+            c.title,
+            c.route_geometry,
+            c.start_point,
+            c.distance_meters,
+            c.estimated_duration_seconds,
+            c.elevation_gain_meters,
+            c.thumbnail_url,
+            c.created_at,
+            c.creator_id,
+            u.nickname AS creator_nickname,
+            u.avatar_url AS creator_avatar_url,
+            COALESCE(s.total_runs, 0) AS total_runs,
+            COALESCE(s.unique_runners, 0) AS unique_runners,
+            s.avg_pace_seconds_per_km
+        FROM courses c
+        JOIN users u ON u.id = c.creator_id
+        LEFT JOIN course_stats s ON s.course_id = c.id
+        WHERE c.is_public = true
+    """))
+    op.create_index("uq_mv_public_courses_id", "mv_public_courses", ["id"], unique=True)
+    op.create_index(
+        "idx_mv_public_courses_start_point",
+        "mv_public_courses",
+        ["start_point"],
+        postgresql_using="gist",
+    )
+    op.create_index(
+        "idx_mv_public_courses_created",
+        "mv_public_courses",
+        [sa.text("created_at DESC"), "id"],
+    )
+    op.create_index("idx_mv_public_courses_distance", "mv_public_courses", ["distance_meters"])
+    op.create_index("idx_mv_public_courses_total_runs", "mv_public_courses", ["total_runs"])
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP MATERIALIZED VIEW IF EXISTS mv_public_courses"))
@@ -0,0 +1,28 @@
+"""Add courses.is_processing for background route map matching.
+
+- courses.is_processing: true while a newly created course's route is
+  being map matched in the background; cleared once the matched route
+  (or the raw route, if matching fails) is final
+
+Revision ID: 0065
+Revises: 0064
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0065"
+down_revision = "0064"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "courses",
+        sa.Column("is_processing", sa.Boolean(), nullable=False, server_default="false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("courses", "is_processing")
@@ -0,0 +1,30 @@
+"""Add a trigram index on mv_public_courses titles for course search.
+
+- pg_trgm extension
+- idx_mv_public_courses_title_trgm: GIN (lower(title) gin_trgm_ops) so the
+  list endpoint's substring search (lower(title) LIKE '%q%') can use an
+  index instead of scanning every public course
+
+Revision ID: 0066
+Revises: 0065
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0066"
+down_revision = "0065"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    op.execute(sa.text("""
+        CREATE INDEX idx_mv_public_courses_title_trgm
+            ON mv_public_courses USING gin (lower(title) gin_trgm_ops)
+    """))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP INDEX IF EXISTS idx_mv_public_courses_title_trgm"))
@@ -0,0 +1,32 @@
+"""Add courses.route_geojson so course detail skips the WKB decode.
+
+- courses.route_geojson: JSONB copy of route_geometry as GeoJSON with
+  [lng, lat, alt] coordinates (alt = 0), written by the app whenever the
+  route changes
+- backfilled from route_geometry for existing rows
+
+Revision ID: 0067
+Revises: 0066
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "0067"
+down_revision = "0066"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("courses", sa.Column("route_geojson", JSONB(), nullable=True))
+    op.execute(sa.text("""
+        UPDATE courses
+        SET route_geojson = ST_AsGeoJSON(ST_Force3D(route_geometry::geometry), 15)::jsonb
+        WHERE route_geometry IS NOT NULL
+    """))
+
+
+def downgrade() -> None:
+    op.drop_column("courses", "route_geojson")
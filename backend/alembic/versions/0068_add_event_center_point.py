@@ -0,0 +1,49 @@
+"""Add a generated center_point column to events for map-marker queries.
+
+- events.center_point: STORED geometry(Point, 4326) generated from
+  center_lng/center_lat, so the viewport filter is one bbox test instead of
+  four float comparisons a btree can only prune on one axis
+- idx_events_active_center_point: partial GiST on center_point WHERE is_active
+- idx_events_active_ends_at: partial btree on ends_at WHERE is_active for the
+  "not yet ended" range filter
+
+Revision ID: 0068
+Revises: 0067
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0068"
+down_revision = "0067"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("""
+        ALTER TABLE events
+            ADD COLUMN center_point geometry(Point, 4326)
+                GENERATED ALWAYS AS (
+                    ST_SetSRID(ST_MakePoint(center_lng, center_lat), 4326)
+                ) STORED
+    """))
+    op.create_index(
+        "idx_events_active_center_point",
+        "events",
+        ["center_point"],
+        postgresql_using="gist",
+        postgresql_where=sa.text("is_active = true"),
+    )
+    op.create_index(
+        "idx_events_active_ends_at",
+        "events",
+        ["ends_at"],
+        postgresql_where=sa.text("is_active = true"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_events_active_ends_at", table_name="events")
+    op.drop_index("idx_events_active_center_point", table_name="events")
+    op.drop_column("events", "center_point")
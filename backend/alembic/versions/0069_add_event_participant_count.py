@@ -0,0 +1,39 @@
+"""Add a denormalized participant_count to events.
+
+- events.participant_count: kept in step by EventService.join_event /
+  leave_event, so listings and markers read a column instead of counting
+  event_participants per event
+- backfilled from the current participant rows
+
+Revision ID: 0069
+Revises: 0068
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0069"
+down_revision = "0068"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "events",
+        sa.Column("participant_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(sa.text("""
+        UPDATE events e
+        SET participant_count = p.cnt
+        FROM (
+            SELECT event_id, count(*) AS cnt
+            FROM event_participants
+            GROUP BY event_id
+        ) p
+        WHERE p.event_id = e.id
+    """))
+
+
+def downgrade() -> None:
+    op.drop_column("events", "participant_count")
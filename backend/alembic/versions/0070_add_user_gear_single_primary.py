@@ -0,0 +1,48 @@
+"""Enforce a single primary gear per user.
+
+- demotes all but the most recently created primary gear for users that
+  ended up with several (the old demote-then-set sequence could race)
+- ex_user_gear_single_primary: partial exclusion on user_id WHERE
+  is_primary, DEFERRABLE INITIALLY IMMEDIATE so GearService can move the
+  flag between rows in one UPDATE (a plain unique index is checked per row
+  and would reject the swap mid-statement)
+
+Revision ID: 0070
+Revises: 0069
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0070"
+down_revision = "0069"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("""
+        UPDATE user_gear g
+        SET is_primary = false
+        FROM (
+            SELECT id,
+                   row_number() OVER (
+                       PARTITION BY user_id ORDER BY created_at DESC, id
+                   ) AS rn
+            FROM user_gear
+            WHERE is_primary
+        ) ranked
+        WHERE ranked.id = g.id AND ranked.rn > 1
+    """))
+    op.execute(sa.text("""
+        ALTER TABLE user_gear
+        ADD CONSTRAINT ex_user_gear_single_primary
+        EXCLUDE USING btree (user_id WITH =) WHERE (is_primary)
+        DEFERRABLE INITIALLY IMMEDIATE
+    """))
+
+
+def downgrade() -> None:
+    op.execute(sa.text(
+        "ALTER TABLE user_gear DROP CONSTRAINT ex_user_gear_single_primary"
+    ))
@@ -0,0 +1,41 @@
+"""Index follows for keyset pagination.
+
+- idx_follows_following_created / idx_follows_follower_created: serve
+  "newest followers/following of a user" (WHERE owner ORDER BY created_at
+  DESC, optionally created_at < cursor) as a bounded index range scan
+- replace the single-column idx_follows_following / idx_follows_follower,
+  which are prefixes of the new indexes
+
+Revision ID: 0071
+Revises: 0070
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0071"
+down_revision = "0070"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_follows_following_created",
+        "follows",
+        ["following_id", sa.text("created_at DESC")],
+    )
+    op.create_index(
+        "idx_follows_follower_created",
+        "follows",
+        ["follower_id", sa.text("created_at DESC")],
+    )
+    op.drop_index("idx_follows_following", table_name="follows")
+    op.drop_index("idx_follows_follower", table_name="follows")
+
+
+def downgrade() -> None:
+    op.create_index("idx_follows_follower", "follows", ["follower_id"])
+    op.create_index("idx_follows_following", "follows", ["following_id"])
+    op.drop_index("idx_follows_follower_created", table_name="follows")
+    op.drop_index("idx_follows_following_created", table_name="follows")
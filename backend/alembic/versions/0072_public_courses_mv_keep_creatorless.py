@@ -0,0 +1,71 @@
+"""Keep courses of deleted accounts in mv_public_courses.
+
+- mv_public_courses: LEFT JOIN users, since delete_account nulls
+  courses.creator_id to keep the courses alive; the inner join from 0064
+  dropped them from the course list and its total
+- the view is recreated, so its 0064 and 0066 indexes are recreated too
+
+Revision ID: 0072
+Revises: 0071
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0072"
+down_revision = "0071"
+branch_labels = None
+depends_on = None
+
+
+def _create_view(users_join: str) -> None:
+    op.execute(sa.text("DROP MATERIALIZED VIEW IF EXISTS mv_public_courses"))
+    op.execute(sa.text(f"""
+        CREATE MATERIALIZED VIEW mv_public_courses AS
+        SELECT
+            c.id,
+            c.title,
+            c.route_geometry,
+            c.start_point,
+            c.distance_meters,
+            c.estimated_duration_seconds,
+            c.elevation_gain_meters,
+            c.thumbnail_url,
+            c.created_at,
+            c.creator_id,
+            u.nickname AS creator_nickname,
+            u.avatar_url AS creator_avatar_url,
+            COALESCE(s.total_runs, 0) AS total_runs,
+            COALESCE(s.unique_runners, 0) AS unique_runners,
+            s.avg_pace_seconds_per_km
+        FROM courses c
+        {users_join} users u ON u.id = c.creator_id
+        LEFT JOIN course_stats s ON s.course_id = c.id
+        WHERE c.is_public = true
+    """))
+    op.create_index("uq_mv_public_courses_id", "mv_public_courses", ["id"], unique=True)
+    op.create_index(
+        "idx_mv_public_courses_start_point",
+        "mv_public_courses",
+        ["start_point"],
+        postgresql_using="gist",
+    )
+    op.create_index(
+        "idx_mv_public_courses_created",
+        "mv_public_courses",
+        [sa.text("created_at DESC"), "id"],
+    )
+    op.create_index("idx_mv_public_courses_distance", "mv_public_courses", ["distance_meters"])
+    op.create_index("idx_mv_public_courses_total_runs", "mv_public_courses", ["total_runs"])
+    op.execute(sa.text("""
+        CREATE INDEX idx_mv_public_courses_title_trgm
+            ON mv_public_courses USING gin (lower(title) gin_trgm_ops)
+    """))
+
+
+def upgrade() -> None:
+    _create_view("LEFT JOIN")
+
+
+def downgrade() -> None:
+    _create_view("JOIN")
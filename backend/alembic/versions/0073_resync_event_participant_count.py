@@ -0,0 +1,31 @@
+"""Resync events.participant_count with event_participants.
+
+- account deletion removed participant rows by cascade without
+  decrementing the counter, leaking seats; recount every event once now
+  that delete_account releases them (EventService.release_user_seats)
+
+Revision ID: 0073
+Revises: 0072
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0073"
+down_revision = "0072"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("""
+        UPDATE events e
+        SET participant_count = (
+            SELECT count(*) FROM event_participants p WHERE p.event_id = e.id
+        )
+    """))
+
+
+def downgrade() -> None:
+    # Recount only; there is no earlier state to restore
+    pass
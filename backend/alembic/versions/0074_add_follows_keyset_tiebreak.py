@@ -0,0 +1,46 @@
+"""Add id to the follows keyset indexes.
+
+- idx_follows_following_created / idx_follows_follower_created: now
+  (owner, created_at DESC, id DESC), matching the follow lists' ORDER BY
+  created_at DESC, id DESC and their (created_at, id) < cursor filter, so
+  ties on created_at still page as a bounded index range scan
+
+Revision ID: 0074
+Revises: 0073
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0074"
+down_revision = "0073"
+branch_labels = None
+depends_on = None
+
+
+def _create_indexes(*tiebreak) -> None:
+    op.create_index(
+        "idx_follows_following_created",
+        "follows",
+        ["following_id", sa.text("created_at DESC"), *tiebreak],
+    )
+    op.create_index(
+        "idx_follows_follower_created",
+        "follows",
+        ["follower_id", sa.text("created_at DESC"), *tiebreak],
+    )
+
+
+def _drop_indexes() -> None:
+    op.drop_index("idx_follows_following_created", table_name="follows")
+    op.drop_index("idx_follows_follower_created", table_name="follows")
+
+
+def upgrade() -> None:
+    _drop_indexes()
+    _create_indexes(sa.text("id DESC"))
+
+
+def downgrade() -> None:
+    _drop_indexes()
+    _create_indexes()
@@ -4,8 +4,9 @@ from typing import Literal
 from uuid import UUID
 
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, BackgroundTasks, Depends, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Response, status
 
+from app.core.cache import cache_delete
 from app.core.container import Container
 from app.core.deps import CurrentUser, DbSession, OptionalCurrentUser
 from app.core.exceptions import NotFoundError
@@ -25,6 +26,9 @@ from app.schemas.course import (
     NearbyCourse,
 )
 from app.services.course_service import CourseService
+from app.services.like_service import LikeService
+from app.tasks.course_matching import match_course_route
+from app.tasks.public_courses import request_public_courses_refresh
 from app.tasks.ranking import recalculate_course_ranking
 from app.tasks.thumbnail import generate_course_thumbnail
 
@@ -58,7 +62,19 @@ async def create_course(
         lap_count=body.lap_count,
     )
 
+    # Background tasks run before the request session commits, and each
+    # opens its own session, so the course must be committed first.
+    await db.commit()
+
+    # Tasks run in order: the thumbnail is rendered from the matched route
+    if course.is_processing:
+        background_tasks.add_task(
+            match_course_route,
+            course_id=course.id,
+            coordinates=body.route_geometry.coordinates,
+        )
     background_tasks.add_task(generate_course_thumbnail, course_id=course.id)
+    background_tasks.add_task(request_public_courses_refresh)
 
     # Register the creator's run on the course leaderboard
     background_tasks.add_task(
@@ -73,6 +89,7 @@ async def create_course(
         title=course.title,
         distance_meters=course.distance_meters,
         thumbnail_url=course.thumbnail_url,
+        is_processing=course.is_processing,
         created_at=course.created_at,
     )
 
@@ -94,7 +111,10 @@ async def list_courses(
     per_page: int = Query(20, ge=1, le=100),
     course_service: CourseService = Depends(Provide[Container.course_service]),
 ) -> CourseListResponse:
-    """List public courses with filtering, spatial search, and pagination."""
+    """List public courses with filtering, spatial search, and pagination.
+
+    near_lat/near_lng are rounded to 3 decimal places (~111 m) before querying.
+    """
     courses_data, total_count = await course_service.list_courses(
         db=db,
         search=search,
@@ -144,7 +164,10 @@ async def get_nearby_courses(
     limit: int = Query(5, ge=1, le=50),
     course_service: CourseService = Depends(Provide[Container.course_service]),
 ) -> list[NearbyCourse]:
-    """Get nearby courses for the home screen."""
+    """Get nearby courses for the home screen.
+
+    lat/lng are rounded to 3 decimal places (~111 m) before querying.
+    """
     nearby_data = await course_service.get_nearby_courses(db=db, lat=lat, lng=lng, radius=radius, limit=limit)
     return [NearbyCourse(**c) for c in nearby_data]
 
@@ -159,12 +182,16 @@ async def get_courses_in_bounds(
     ne_lng: float = Query(..., ge=-180, le=180),
     limit: int = Query(500, ge=1, le=1000),
     course_service: CourseService = Depends(Provide[Container.course_service]),
-) -> list[CourseMarker]:
-    """Get course markers within a map viewport bounding box."""
-    markers_data = await course_service.get_courses_in_bounds(
+) -> Response:
+    """Get course markers within a map viewport bounding box.
+
+    The marker array is built as JSON by PostgreSQL and sent through as is,
+    so large viewports are never decoded into Python objects.
+    """
+    markers_json = await course_service.get_courses_in_bounds_json(
         db=db, sw_lat=sw_lat, sw_lng=sw_lng, ne_lat=ne_lat, ne_lng=ne_lng, limit=limit,
     )
-    return [CourseMarker(**m) for m in markers_data]
+    return Response(content=markers_json, media_type="application/json")
 
 
 @router.get("/{course_id}", response_model=CourseDetail)
@@ -190,6 +217,7 @@ async def get_course_detail(
         elevation_profile=detail["elevation_profile"],
         thumbnail_url=detail["thumbnail_url"],
         is_public=detail["is_public"],
+        is_processing=detail["is_processing"],
         created_at=detail["created_at"],
         creator=CourseCreatorInfo(**detail["creator"]),
         checkpoints=detail.get("checkpoints"),
@@ -234,11 +262,15 @@ async def update_course(
     body: CourseUpdateRequest,
     current_user: CurrentUser,
     db: DbSession,
+    background_tasks: BackgroundTasks,
     course_service: CourseService = Depends(Provide[Container.course_service]),
 ) -> dict:
     """Update a course (owner only)."""
     update_data = body.model_dump(exclude_unset=True)
     course = await course_service.update_course(db=db, course_id=course_id, user_id=current_user.id, update_data=update_data)
+    # Commit first: background tasks run before the request session commits
+    await db.commit()
+    background_tasks.add_task(request_public_courses_refresh)
     return {"id": str(course.id), "title": course.title, "updated": True}
 
 
@@ -249,6 +281,7 @@ async def correct_course_route(
     body: CourseRouteCorrectRequest,
     current_user: CurrentUser,
     db: DbSession,
+    background_tasks: BackgroundTasks,
     course_service: CourseService = Depends(Provide[Container.course_service]),
 ) -> dict:
     """Correct a course route (owner only). Each point must be within 50m of original."""
@@ -259,6 +292,9 @@ async def correct_course_route(
             user_id=current_user.id,
             new_coordinates=body.route_geometry.coordinates,
         )
+        # Commit first: background tasks run before the request session commits
+        await db.commit()
+        background_tasks.add_task(request_public_courses_refresh)
         return {
             "id": str(course.id),
             "distance_meters": course.distance_meters,
@@ -275,7 +311,12 @@ async def delete_course(
     course_id: UUID,
     current_user: CurrentUser,
     db: DbSession,
+    background_tasks: BackgroundTasks,
     course_service: CourseService = Depends(Provide[Container.course_service]),
 ) -> None:
     """Delete a course (owner only)."""
     await course_service.delete_course(db=db, course_id=course_id, user_id=current_user.id)
+    # Commit first: background tasks run before the request session commits
+    await db.commit()
+    background_tasks.add_task(request_public_courses_refresh)
+    background_tasks.add_task(cache_delete, LikeService.count_cache_key(course_id))
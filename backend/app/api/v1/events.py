@@ -3,8 +3,9 @@
 from uuid import UUID
 
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 
+from app.core.cache import invalidate_namespace
 from app.core.container import Container
 from app.core.deps import CurrentUser, DbSession
 from app.schemas.event import (
@@ -29,19 +30,26 @@ async def get_active_events(
     page: int = Query(0, ge=0),
     per_page: int = Query(20, ge=1, le=100),
     event_type: str | None = Query(None, pattern="^(challenge|crew|event)$"),
+    include_total: bool = Query(True),
     event_service: EventService = Depends(Provide[Container.event_service]),
 ) -> EventListResponse:
-    """Get paginated list of active events, optionally filtered by event_type."""
-    events, total_count = await event_service.get_active_events(
+    """Get paginated list of active events, optionally filtered by event_type.
+
+    Infinite-scroll clients pass include_total=false to skip the total count
+    and page on has_more instead.
+    """
+    events, total_count, has_more = await event_service.get_active_events(
         db=db,
         page=page,
         per_page=per_page,
         current_user_id=current_user.id,
         event_type=event_type,
+        include_total=include_total,
     )
     return EventListResponse(
         data=[EventResponse(**e) for e in events],
         total_count=total_count,
+        has_more=has_more,
     )
 
 
@@ -51,6 +59,7 @@ async def create_event(
     body: EventCreateRequest,
     current_user: CurrentUser,
     db: DbSession,
+    background_tasks: BackgroundTasks,
     event_service: EventService = Depends(Provide[Container.event_service]),
 ) -> EventResponse:
     """Create a new event."""
@@ -65,6 +74,10 @@ async def create_event(
         event_id=event.id,
         current_user_id=current_user.id,
     )
+    # Commit before invalidating: background tasks run before the request
+    # session commits, and a read in between would re-cache the old listing.
+    await db.commit()
+    background_tasks.add_task(invalidate_namespace, EventService.CACHE_NAMESPACE)
     return EventResponse(**enriched)
 
 
@@ -113,6 +126,7 @@ async def join_event(
     event_id: UUID,
     current_user: CurrentUser,
     db: DbSession,
+    background_tasks: BackgroundTasks,
     event_service: EventService = Depends(Provide[Container.event_service]),
 ) -> EventParticipantResponse:
     """Join an event."""
@@ -121,6 +135,10 @@ async def join_event(
         event_id=event_id,
         user_id=current_user.id,
     )
+    # Cached listings carry participant counts; commit first so a read in
+    # between cannot re-cache the old ones.
+    await db.commit()
+    background_tasks.add_task(invalidate_namespace, EventService.CACHE_NAMESPACE)
     return EventParticipantResponse(
         event_id=str(participant.event_id),
         user_id=str(participant.user_id),
@@ -137,6 +155,7 @@ async def leave_event(
     event_id: UUID,
     current_user: CurrentUser,
     db: DbSession,
+    background_tasks: BackgroundTasks,
     event_service: EventService = Depends(Provide[Container.event_service]),
 ) -> None:
     """Leave an event."""
@@ -145,6 +164,8 @@ async def leave_event(
         event_id=event_id,
         user_id=current_user.id,
     )
+    await db.commit()
+    background_tasks.add_task(invalidate_namespace, EventService.CACHE_NAMESPACE)
 
 
 @router.get("/{event_id}/participants", response_model=EventMemberListResponse)
@@ -1,10 +1,13 @@
 """Follow endpoints: follow/unfollow users, list followers/following, friend activity."""
 
+from datetime import datetime
 from uuid import UUID
 
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache_delete
 from app.core.container import Container
 from app.core.deps import CurrentUser, DbSession
 from app.schemas.follow import (
@@ -51,12 +54,41 @@ def _to_follow_response_for_following(follow) -> FollowResponse:
     )
 
 
+def _follow_list_response(
+    data: list[FollowResponse], total_count: int | None, has_more: bool
+) -> FollowListResponse:
+    """Wrap a follow page, with the last item as the next keyset cursor."""
+    last = data[-1] if has_more else None
+    return FollowListResponse(
+        data=data,
+        total_count=total_count,
+        has_more=has_more,
+        next_before=last.created_at if last else None,
+        next_before_id=last.id if last else None,
+    )
+
+
+async def _drop_follow_counts(
+    db: AsyncSession, background_tasks: BackgroundTasks, *user_ids: UUID
+) -> None:
+    """Commit the follow change, then evict the affected cached counts.
+
+    Background tasks run before the request session commits, so without the
+    explicit commit a concurrent status read could re-cache stale counts.
+    """
+    await db.commit()
+    background_tasks.add_task(
+        cache_delete, *(FollowService.counts_cache_key(uid) for uid in user_ids)
+    )
+
+
 @router.post("/users/{user_id}/follow", response_model=FollowResponse, status_code=201)
 @inject
 async def follow_user(
     user_id: UUID,
     current_user: CurrentUser,
     db: DbSession,
+    background_tasks: BackgroundTasks,
     follow_service: FollowService = Depends(Provide[Container.follow_service]),
     notification_service: NotificationService = Depends(Provide[Container.notification_service]),
 ) -> FollowResponse:
@@ -77,6 +109,7 @@ async def follow_user(
         target_id=str(current_user.id),
         target_type="user",
     )
+    await _drop_follow_counts(db, background_tasks, current_user.id, follow.following_id)
     return _to_follow_response_for_following(follow)
 
 
@@ -86,6 +119,7 @@ async def unfollow_user(
     user_id: UUID,
     current_user: CurrentUser,
     db: DbSession,
+    background_tasks: BackgroundTasks,
     follow_service: FollowService = Depends(Provide[Container.follow_service]),
 ) -> None:
     """Unfollow a user."""
@@ -94,6 +128,7 @@ async def unfollow_user(
         follower_id=current_user.id,
         following_id=user_id,
     )
+    await _drop_follow_counts(db, background_tasks, current_user.id, user_id)
 
 
 @router.get("/users/{user_id}/followers", response_model=FollowListResponse)
@@ -104,18 +139,34 @@ async def get_followers(
     db: DbSession,
     page: int = Query(0, ge=0),
     per_page: int = Query(20, ge=1, le=100),
+    before: datetime | None = Query(
+        None, description="Cursor: return follows created before this timestamp"
+    ),
+    before_id: UUID | None = Query(
+        None, description="Cursor tie-breaker: id of the last follow seen"
+    ),
+    include_total: bool = Query(True),
     follow_service: FollowService = Depends(Provide[Container.follow_service]),
 ) -> FollowListResponse:
-    """Get a user's followers."""
-    follows, total_count = await follow_service.get_followers(
+    """Get a user's followers.
+
+    Infinite-scroll clients page with ``before`` / ``before_id`` (the
+    response's next_before / next_before_id) and include_total=false, which
+    avoids both the OFFSET scan and the count query.
+    """
+    follows, total_count, has_more = await follow_service.get_followers(
         db=db,
         user_id=user_id,
         page=page,
         per_page=per_page,
+        before=before,
+        before_id=before_id,
+        include_total=include_total,
     )
-    return FollowListResponse(
-        data=[_to_follow_response_for_follower(f) for f in follows],
-        total_count=total_count,
+    return _follow_list_response(
+        [_to_follow_response_for_follower(f) for f in follows],
+        total_count,
+        has_more,
     )
 
 
@@ -127,18 +178,29 @@ async def get_following(
     db: DbSession,
     page: int = Query(0, ge=0),
     per_page: int = Query(20, ge=1, le=100),
+    before: datetime | None = Query(
+        None, description="Cursor: return follows created before this timestamp"
+    ),
+    before_id: UUID | None = Query(
+        None, description="Cursor tie-breaker: id of the last follow seen"
+    ),
+    include_total: bool = Query(True),
     follow_service: FollowService = Depends(Provide[Container.follow_service]),
 ) -> FollowListResponse:
     """Get users that a user is following."""
-    follows, total_count = await follow_service.get_following(
+    follows, total_count, has_more = await follow_service.get_following(
         db=db,
         user_id=user_id,
         page=page,
         per_page=per_page,
+        before=before,
+        before_id=before_id,
+        include_total=include_total,
     )
-    return FollowListResponse(
-        data=[_to_follow_response_for_following(f) for f in follows],
-        total_count=total_count,
+    return _follow_list_response(
+        [_to_follow_response_for_following(f) for f in follows],
+        total_count,
+        has_more,
     )
 
 
@@ -184,6 +246,7 @@ async def follow_by_code(
     body: FollowByCodeRequest,
     current_user: CurrentUser,
     db: DbSession,
+    background_tasks: BackgroundTasks,
     follow_service: FollowService = Depends(Provide[Container.follow_service]),
     notification_service: NotificationService = Depends(Provide[Container.notification_service]),
 ) -> FollowResponse:
@@ -203,6 +266,7 @@ async def follow_by_code(
         target_id=str(current_user.id),
         target_type="user",
     )
+    await _drop_follow_counts(db, background_tasks, current_user.id, follow.following_id)
     return _to_follow_response_for_following(follow)
 
 
@@ -1,12 +1,14 @@
 """Import endpoints: GPX/FIT file upload and management."""
 
 import os
+from collections.abc import AsyncIterator
 from uuid import UUID
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException, UploadFile, status
 from sqlalchemy import func, select
 
 from app.core.deps import CurrentUser, DbSession
+from app.core.exceptions import PayloadTooLargeError
 from app.db.session import async_session_factory
 from app.models.external_import import ExternalImport
 from app.schemas.external_import import (
@@ -22,6 +24,12 @@ router = APIRouter(prefix="/imports", tags=["imports"])
 
 ALLOWED_EXTENSIONS = {".gpx", ".fit"}
 MAX_FILE_SIZE = 20 * 1024 * 1024  # 20MB
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB
+
+
+async def _iter_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
 
 
 def _source_from_extension(ext: str) -> str:
@@ -89,9 +97,17 @@ async def upload_activity_file(
             },
         )
 
-    # Read and validate size
-    contents = await file.read()
-    if len(contents) > MAX_FILE_SIZE:
+    # Stream to disk, enforcing the size limit as chunks arrive
+    import_service = ImportService()
+    source = _source_from_extension(ext)
+    try:
+        file_path = await import_service.save_upload_file(
+            _iter_upload(file),
+            file.filename or f"upload{ext}",
+            source,
+            max_size=MAX_FILE_SIZE,
+        )
+    except PayloadTooLargeError:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail={
@@ -100,13 +116,6 @@ async def upload_activity_file(
             },
         )
 
-    # Save file to disk
-    import_service = ImportService()
-    source = _source_from_extension(ext)
-    file_path = await import_service.save_upload_file(
-        contents, file.filename or f"upload{ext}", source
-    )
-
     # Create import record
     ext_import = ExternalImport(
         user_id=current_user.id,
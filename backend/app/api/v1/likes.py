@@ -3,8 +3,9 @@
 from uuid import UUID
 
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends
 
+from app.core.cache import cache_delete
 from app.core.container import Container
 from app.core.deps import CurrentUser, DbSession
 from app.services.like_service import LikeService
@@ -18,6 +19,7 @@ async def toggle_like(
     course_id: UUID,
     current_user: CurrentUser,
     db: DbSession,
+    background_tasks: BackgroundTasks,
     like_service: LikeService = Depends(Provide[Container.like_service]),
 ) -> dict:
     """Toggle like status for a course.
@@ -27,11 +29,16 @@ async def toggle_like(
 
     Returns {"is_liked": bool, "like_count": int}.
     """
-    return await like_service.toggle_like(
+    result = await like_service.toggle_like(
         db=db,
         course_id=course_id,
         user_id=current_user.id,
     )
+    # Commit before evicting: background tasks run before the request session
+    # commits, and a read in between would re-cache the old count.
+    await db.commit()
+    background_tasks.add_task(cache_delete, LikeService.count_cache_key(course_id))
+    return result
 
 
 @router.get("/{course_id}/like/status", status_code=200)
@@ -5,12 +5,13 @@ from typing import Literal
 from uuid import UUID
 
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Query, status
 import json
 
 from geoalchemy2.functions import ST_AsGeoJSON
 from sqlalchemy import desc, func, select, update
 
+from app.core.cache import invalidate_namespace
 from app.core.container import Container
 from app.core.deps import CurrentUser, CurrentUserAllowBanned, DbSession
 from app.core.exceptions import AuthenticationError, BadRequestError, ConflictError, NotFoundError
@@ -22,6 +23,7 @@ from app.models.run_session import RunSession
 from app.models.user import User
 from app.schemas.course import CourseStatsInfo, MyCourseItem
 from app.services.course_service import get_route_preview, get_thumbnail_url_for_course
+from app.services.event_service import EventService
 from app.schemas.run import (
     RunCourseInfo, RunHistoryItem, RunHistoryResponse,
     AnalyticsResponse, WeeklyStatItem, PaceTrendItem, ActivityDay, BestEffortItem,
@@ -864,9 +866,12 @@ async def submit_ban_appeal(
 
 
 @router.delete("/me/account", status_code=status.HTTP_200_OK)
+@inject
 async def delete_account(
     current_user: CurrentUser,
     db: DbSession,
+    background_tasks: BackgroundTasks,
+    event_service: EventService = Depends(Provide[Container.event_service]),
 ):
     """Permanently delete the current user's account and all associated data."""
     user_id = current_user.id
@@ -884,10 +889,15 @@ async def delete_account(
         update(Course).where(Course.creator_id == user_id).values(creator_id=None)
     )
 
+    # event_participants rows go with the user by cascade; free their seats first
+    await event_service.release_user_seats(db, user_id)
+
     # Delete the user — cascading FKs handle:
     # social_accounts, refresh_tokens, gear_items, follows, rankings,
     # community_posts, notifications, ban_appeals, device_tokens, etc.
     await db.delete(current_user)
     await db.commit()
+    # Cached event listings carry participant counts
+    background_tasks.add_task(invalidate_namespace, EventService.CACHE_NAMESPACE)
 
     return {"deleted": True}
@@ -0,0 +1,89 @@
+"""Redis-backed response cache.
+
+Cache helpers fail open: if Redis is unreachable, reads miss and writes
+are dropped so requests fall through to the database instead of erroring.
+Namespaces are invalidated by bumping a version counter that is folded
+into every key, so no key scanning is needed.
+"""
+
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Any
+
+import orjson
+import redis.asyncio as redis
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache
+def get_redis() -> redis.Redis:
+    """Shared async Redis client (connection-pooled)."""
+    return redis.from_url(
+        get_settings().REDIS_URL,
+        socket_connect_timeout=1,
+        socket_timeout=1,
+    )
+
+
+async def _namespace_version(namespace: str) -> int:
+    value = await get_redis().get(f"{namespace}:version")
+    return int(value) if value else 0
+
+
+async def make_cache_key(namespace: str, params: dict) -> str | None:
+    """Build a versioned key for *params*, or None when Redis is unavailable."""
+    try:
+        version = await _namespace_version(namespace)
+    except Exception:
+        logger.warning("Redis unavailable, bypassing %s cache", namespace)
+        return None
+    digest = hashlib.sha1(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return f"{namespace}:v{version}:{digest}"
+
+
+async def cache_get(key: str | None) -> Any | None:
+    """Return the cached JSON value for *key*, or None on miss/error."""
+    if key is None:
+        return None
+    try:
+        raw = await get_redis().get(key)
+    except Exception:
+        logger.warning("Redis GET failed for %s", key)
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def cache_set(key: str | None, value: Any, ttl_seconds: int) -> None:
+    """Store *value* as JSON under *key* for *ttl_seconds*.
+
+    orjson encodes datetimes and UUIDs natively (as ISO-8601 / hex strings);
+    Pydantic parses them back when cached dicts become response models.
+    """
+    if key is None:
+        return
+    try:
+        await get_redis().setex(key, ttl_seconds, orjson.dumps(value))
+    except Exception:
+        logger.warning("Redis SETEX failed for %s", key)
+
+
+async def invalidate_namespace(namespace: str) -> None:
+    """Orphan every cached entry in *namespace* by bumping its version."""
+    try:
+        await get_redis().incr(f"{namespace}:version")
+    except Exception:
+        logger.warning("Redis INCR failed, %s cache not invalidated", namespace)
+
+
+async def cache_delete(*keys: str) -> None:
+    """Drop unversioned *keys* (e.g. per-user counters) after a write."""
+    if not keys:
+        return
+    try:
+        await get_redis().delete(*keys)
+    except Exception:
+        logger.warning("Redis DEL failed for %s", ", ".join(keys))
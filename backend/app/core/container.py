@@ -20,7 +20,7 @@ from app.services.review_service import ReviewService
 from app.services.run_service import RunService
 from app.services.stats_service import StatsService
 from app.services.notification_service import NotificationService
-from app.services.map_matching_service import MapMatchingService
+from app.services.map_matching_service import get_map_matcher
 from app.services.announcement_service import AnnouncementService
 from app.services.crew_join_request_service import CrewJoinRequestService
 from app.services.group_ranking_service import GroupRankingService
@@ -94,7 +94,7 @@ class Container(containers.DeclarativeContainer):
     live_group_run_service = providers.Factory(LiveGroupRunService)
     import_service = providers.Factory(ImportService)
     like_service = providers.Factory(LikeService)
-    map_matching_service = providers.Singleton(MapMatchingService)
+    map_matching_service = providers.Callable(get_map_matcher)
     run_service = providers.Factory(RunService)
     ranking_service = providers.Factory(RankingService)
     review_service = providers.Factory(ReviewService)
@@ -39,3 +39,7 @@ class BadRequestError(AppError):
 
 class ValidationError(AppError):
     status_code = 422
+
+
+class PayloadTooLargeError(AppError):
+    status_code = 413
@@ -17,6 +17,9 @@ engine: AsyncEngine = create_async_engine(
     pool_size=20,
     max_overflow=10,
     pool_pre_ping=True,
+    # Per-connection cache of asyncpg prepared statements (default 100);
+    # sized for the many filter/order variants of the course queries.
+    connect_args={"prepared_statement_cache_size": 500},
 )
 
 async_session_factory = async_sessionmaker(
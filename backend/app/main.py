@@ -8,6 +8,7 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from slowapi import _rate_limit_exceeded_handler
@@ -56,6 +57,15 @@ async def _cleanup_expired_tokens():
             logger.exception("Token cleanup failed")
 
 
+async def _refresh_public_courses_periodically():
+    """Keep mv_public_courses (course list endpoint) at most a few minutes stale."""
+    from app.tasks.public_courses import REFRESH_INTERVAL_SECONDS, request_public_courses_refresh
+
+    while True:
+        await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+        await request_public_courses_refresh()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifecycle manager."""
@@ -66,13 +76,17 @@ async def lifespan(app: FastAPI):
     (upload_dir / "avatars").mkdir(parents=True, exist_ok=True)
 
     cleanup_task = asyncio.create_task(_cleanup_expired_tokens())
+    public_courses_task = asyncio.create_task(_refresh_public_courses_periodically())
 
     yield
 
     cleanup_task.cancel()
+    public_courses_task.cancel()
     logger.info("Shutting down %s", settings.APP_NAME)
     from app.db.session import engine
     await engine.dispose()
+    from app.services.map_matching_service import get_map_matcher
+    await get_map_matcher().close()
 
 
 app = FastAPI(
@@ -80,6 +94,7 @@ app = FastAPI(
     description="RUNVS running app backend API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
 )
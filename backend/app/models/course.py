@@ -6,14 +6,19 @@ from datetime import datetime
 from geoalchemy2 import Geography
 from sqlalchemy import (
     Boolean,
+    Column,
+    Computed,
     DateTime,
     ForeignKey,
     Integer,
+    MetaData,
     String,
+    Table,
     Text,
     Float,
     Index,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -27,6 +32,12 @@ class Course(Base, UUIDPrimaryKeyMixin, TimestampMixin):
         Index("idx_courses_start_point", "start_point", postgresql_using="gist"),
         Index("idx_courses_public_created", "is_public", "created_at"),
         Index("idx_courses_creator", "creator_id"),
+        Index(
+            "idx_courses_public_start_lng_lat",
+            "start_lng",
+            "start_lat",
+            postgresql_where=text("is_public = true"),
+        ),
     )
 
     creator_id: Mapped[uuid.UUID] = mapped_column(
@@ -50,10 +61,24 @@ class Course(Base, UUIDPrimaryKeyMixin, TimestampMixin):
         Geography(geometry_type="LINESTRING", srid=4326),
         nullable=True,
     )
+    # route_geometry as GeoJSON ({"type", "coordinates": [[lng, lat, 0.0], ...]}),
+    # written alongside it so course detail needs no WKB decode
+    route_geojson: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     start_point = mapped_column(
         Geography(geometry_type="POINT", srid=4326),
         nullable=True,
     )
+    # Generated from start_point so viewport queries can use a plain btree range
+    start_lat: Mapped[float | None] = mapped_column(
+        Float,
+        Computed("ST_Y(start_point::geometry)", persisted=True),
+        nullable=True,
+    )
+    start_lng: Mapped[float | None] = mapped_column(
+        Float,
+        Computed("ST_X(start_point::geometry)", persisted=True),
+        nullable=True,
+    )
 
     distance_meters: Mapped[int] = mapped_column(Integer, nullable=False)
     estimated_duration_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -61,6 +86,8 @@ class Course(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     elevation_profile: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     thumbnail_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     is_public: Mapped[bool] = mapped_column(Boolean, default=True, server_default="true")
+    # True while the route is being map matched in the background
+    is_processing: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false")
     tags: Mapped[list[str] | None] = mapped_column(ARRAY(Text), server_default="{}")
     difficulty: Mapped[str | None] = mapped_column(String(10), nullable=True, default=None)
     course_type: Mapped[str | None] = mapped_column(String(10), nullable=True, default=None)
@@ -103,3 +130,27 @@ class CourseStats(Base):
 
     # Relationships
     course: Mapped["Course"] = relationship(back_populates="stats")
+
+
+# Read-only mapping of the mv_public_courses materialized view (migrations
+# 0064/0072). creator_* columns are NULL for courses of deleted accounts.
+# Kept on its own MetaData so create_all/autogenerate never treat it as a table.
+public_courses_mv = Table(
+    "mv_public_courses",
+    MetaData(),
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("title", String(30)),
+    Column("route_geometry", Geography(geometry_type="LINESTRING", srid=4326)),
+    Column("start_point", Geography(geometry_type="POINT", srid=4326)),
+    Column("distance_meters", Integer),
+    Column("estimated_duration_seconds", Integer),
+    Column("elevation_gain_meters", Integer),
+    Column("thumbnail_url", Text),
+    Column("created_at", DateTime(timezone=True)),
+    Column("creator_id", UUID(as_uuid=True)),
+    Column("creator_nickname", String),
+    Column("creator_avatar_url", Text),
+    Column("total_runs", Integer),
+    Column("unique_runners", Integer),
+    Column("avg_pace_seconds_per_km", Integer),
+)
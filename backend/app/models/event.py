@@ -3,8 +3,10 @@
 import uuid
 from datetime import datetime
 
+from geoalchemy2 import Geometry
 from sqlalchemy import (
     Boolean,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
@@ -14,6 +16,7 @@ from sqlalchemy import (
     UniqueConstraint,
     Index,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -25,6 +28,17 @@ class Event(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     __tablename__ = "events"
     __table_args__ = (
         Index("idx_events_active_dates", "is_active", "starts_at", "ends_at"),
+        Index(
+            "idx_events_active_center_point",
+            "center_point",
+            postgresql_using="gist",
+            postgresql_where=text("is_active = true"),
+        ),
+        Index(
+            "idx_events_active_ends_at",
+            "ends_at",
+            postgresql_where=text("is_active = true"),
+        ),
     )
 
     title: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -62,6 +76,11 @@ class Event(Base, UUIDPrimaryKeyMixin, TimestampMixin):
 
     # Participation
     max_participants: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Denormalized count of event_participants rows, maintained by
+    # EventService.join_event / leave_event / release_user_seats
+    participant_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
     is_active: Mapped[bool] = mapped_column(
         Boolean, default=True, server_default="true"
     )
@@ -69,6 +88,14 @@ class Event(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     # Location for map markers (for events without a course)
     center_lat: Mapped[float | None] = mapped_column(Float, nullable=True)
     center_lng: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Generated from center_lng/center_lat for GiST viewport lookups; only
+    # used in filters, so never loaded
+    center_point = mapped_column(
+        Geometry(geometry_type="POINT", srid=4326, spatial_index=False),
+        Computed("ST_SetSRID(ST_MakePoint(center_lng, center_lat), 4326)", persisted=True),
+        nullable=True,
+        deferred=True,
+    )
 
     # Crew-specific fields
     recurring_schedule: Mapped[str | None] = mapped_column(
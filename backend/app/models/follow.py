@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, UniqueConstraint, func
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -15,6 +15,8 @@ class Follow(Base, UUIDPrimaryKeyMixin):
     __table_args__ = (
         UniqueConstraint("follower_id", "following_id", name="uq_follow_pair"),
         CheckConstraint("follower_id != following_id", name="ck_no_self_follow"),
+        Index("idx_follows_following_created", "following_id", text("created_at DESC")),
+        Index("idx_follows_follower_created", "follower_id", text("created_at DESC")),
     )
 
     follower_id: Mapped[uuid.UUID] = mapped_column(
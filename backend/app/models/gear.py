@@ -3,8 +3,8 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, String, Text, text
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, UUIDPrimaryKeyMixin
@@ -18,6 +18,18 @@ class UserGear(Base, UUIDPrimaryKeyMixin):
     """
 
     __tablename__ = "user_gear"
+    __table_args__ = (
+        # At most one primary per user, checked at statement end so a single
+        # UPDATE can hand the flag from one row to another.
+        ExcludeConstraint(
+            ("user_id", "="),
+            name="ex_user_gear_single_primary",
+            using="btree",
+            where=text("is_primary"),
+            deferrable=True,
+            initially="IMMEDIATE",
+        ),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -40,5 +40,5 @@ class Ranking(Base, UUIDPrimaryKeyMixin):
     )
 
     # Relationships
-    user: Mapped["User"] = relationship("User", lazy="joined")
+    user: Mapped["User"] = relationship("User", lazy="noload")
     course: Mapped["Course"] = relationship("Course", lazy="noload")
@@ -51,6 +51,7 @@ class CourseCreateResponse(BaseModel):
     distance_meters: int
     thumbnail_url: str | None = None
     share_url: str | None = None
+    is_processing: bool = False
     created_at: datetime
 
 
@@ -110,6 +111,7 @@ class CourseDetail(BaseModel):
     elevation_profile: list[float] | None
     thumbnail_url: str | None
     is_public: bool
+    is_processing: bool = Field(False, description="Route map matching still in progress")
     created_at: datetime
     creator: CourseCreatorInfo
     checkpoints: list[CourseCheckpoint] | None = None
@@ -33,7 +33,8 @@ class EventResponse(BaseModel):
 class EventListResponse(BaseModel):
     """Paginated list of events."""
     data: list[EventResponse]
-    total_count: int
+    total_count: int | None = None
+    has_more: bool = False
 
 
 class EventMapMarker(BaseModel):
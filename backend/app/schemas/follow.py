@@ -39,7 +39,11 @@ class FollowResponse(BaseModel):
 class FollowListResponse(BaseModel):
     """Paginated list of follow relationships."""
     data: list[FollowResponse]
-    total_count: int
+    total_count: int | None = None
+    has_more: bool = False
+    # Keyset cursor for the next page (pass back as before / before_id)
+    next_before: datetime | None = None
+    next_before_id: str | None = None
 
 
 class FollowStatusResponse(BaseModel):
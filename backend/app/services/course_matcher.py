@@ -8,6 +8,8 @@ import math
 from dataclasses import dataclass
 from typing import Sequence
 
+import numpy as np
+
 
 @dataclass
 class RouteMatchResult:
@@ -37,6 +39,10 @@ WARNING_THRESHOLD = 30.0
 COMPLETION_MIN_MATCH = 0.8
 CURVATURE_THRESHOLD = 0.001  # radians/meter
 
+# Upper bound on runner-point x course-segment cells evaluated at once,
+# which caps the temporaries of the vectorized matcher at a few MB each
+MATCH_CHUNK_CELLS = 1 << 20
+
 
 def haversine_distance(p1: Point2D, p2: Point2D) -> float:
     """Calculate the great-circle distance between two points in meters.
@@ -234,51 +240,123 @@ def calculate_route_match(
     Returns:
         RouteMatchResult with completion status and statistics.
     """
-    if not runner_points or len(course_points) < 2:
+    return calculate_route_match_arrays(
+        _latlng_array(runner_points),
+        _latlng_array(course_points),
+        straight_threshold=straight_threshold,
+        curve_threshold=curve_threshold,
+    )
+
+
+def calculate_route_match_arrays(
+    runner: np.ndarray,
+    course: np.ndarray,
+    straight_threshold: float = STRAIGHT_THRESHOLD,
+    curve_threshold: float = CURVE_THRESHOLD,
+) -> RouteMatchResult:
+    """Vectorized :func:`calculate_route_match` over (N, 2) [lat, lng] arrays.
+
+    Runner-to-segment distances are evaluated as a matrix, in row chunks
+    bounded by MATCH_CHUNK_CELLS, with the same planar projection and
+    haversine metric as :func:`point_to_segment_distance`.
+    """
+    total = len(runner)
+    if total == 0 or len(course) < 2:
         return RouteMatchResult(
             is_completed=False,
             route_match_percent=0.0,
             max_deviation_meters=0.0,
             deviation_points=0,
-            total_points=len(runner_points),
+            total_points=total,
             curve_section_count=0,
         )
 
     # Classify segments
-    is_curved = classify_segments(course_points)
-    curve_section_count = sum(is_curved)
-
-    matched_count = 0
-    deviation_count = 0
-    max_deviation = 0.0
-
-    for runner_point in runner_points:
-        # Find nearest segment
-        seg_idx = find_nearest_segment(runner_point, course_points)
-        dist = point_to_segment_distance(
-            runner_point,
-            course_points[seg_idx],
-            course_points[seg_idx + 1],
-        )
-
-        # Apply threshold based on segment type
-        threshold = curve_threshold if is_curved[seg_idx] else straight_threshold
-
-        if dist <= threshold:
-            matched_count += 1
-        else:
-            deviation_count += 1
-
-        max_deviation = max(max_deviation, dist)
-
-    total = len(runner_points)
-    match_ratio = matched_count / total if total > 0 else 0.0
+    is_curved = _classify_segments_array(course)
+    curve_section_count = int(is_curved.sum())
+    seg_threshold = np.where(is_curved, curve_threshold, straight_threshold)
+
+    a = course[:-1]
+    ab = course[1:] - a
+    len_sq = (ab * ab).sum(axis=1)
+    safe_len_sq = np.where(len_sq > 0, len_sq, 1.0)
+
+    rows = max(1, MATCH_CHUNK_CELLS // len(a))
+    nearest_dist = np.empty(total)
+    nearest_seg = np.empty(total, dtype=np.intp)
+
+    for start in range(0, total, rows):
+        p = runner[start:start + rows, None, :]  # (n, 1, 2)
+        ap = p - a  # (n, m, 2)
+        t = np.where(len_sq > 0, (ap * ab).sum(axis=2) / safe_len_sq, 0.0)
+        np.clip(t, 0.0, 1.0, out=t)
+        proj = a + t[..., None] * ab
+        dist = _haversine_array(p[..., 0], p[..., 1], proj[..., 0], proj[..., 1])
+        # argmin keeps the first of equal distances, as the scalar scan did
+        idx = dist.argmin(axis=1)
+        nearest_seg[start:start + rows] = idx
+        nearest_dist[start:start + rows] = dist[np.arange(len(idx)), idx]
+
+    matched = nearest_dist <= seg_threshold[nearest_seg]
+    matched_count = int(matched.sum())
+    match_ratio = matched_count / total
 
     return RouteMatchResult(
         is_completed=match_ratio >= COMPLETION_MIN_MATCH,
         route_match_percent=round(match_ratio * 100, 1),
-        max_deviation_meters=round(max_deviation, 1),
-        deviation_points=deviation_count,
+        max_deviation_meters=round(float(nearest_dist.max()), 1),
+        deviation_points=total - matched_count,
         total_points=total,
         curve_section_count=curve_section_count,
     )
+
+
+def _latlng_array(points: Sequence[Point2D]) -> np.ndarray:
+    """Pack points into a contiguous (N, 2) float64 [lat, lng] array."""
+    arr = np.empty((len(points), 2))
+    for i, pt in enumerate(points):
+        arr[i, 0] = pt.lat
+        arr[i, 1] = pt.lng
+    return arr
+
+
+def _haversine_array(
+    lat1: np.ndarray, lng1: np.ndarray, lat2: np.ndarray, lng2: np.ndarray
+) -> np.ndarray:
+    """Elementwise :func:`haversine_distance` in meters (degree inputs)."""
+    rlat1 = np.radians(lat1)
+    rlat2 = np.radians(lat2)
+    dlat = np.radians(lat2 - lat1)
+    dlng = np.radians(lng2 - lng1)
+    h = np.sin(dlat / 2) ** 2 + np.cos(rlat1) * np.cos(rlat2) * np.sin(dlng / 2) ** 2
+    return EARTH_RADIUS * 2 * np.arctan2(np.sqrt(h), np.sqrt(1 - h))
+
+
+def _classify_segments_array(
+    course: np.ndarray,
+    curvature_threshold: float = CURVATURE_THRESHOLD,
+) -> np.ndarray:
+    """Vectorized :func:`classify_segments` over an (N, 2) [lat, lng] array."""
+    n = len(course)
+    is_curved = np.zeros(max(0, n - 1), dtype=bool)
+    if n < 3:
+        return is_curved
+
+    p1, p2, p3 = course[:-2], course[1:-1], course[2:]
+    a = _haversine_array(p1[:, 0], p1[:, 1], p2[:, 0], p2[:, 1])
+    b = _haversine_array(p2[:, 0], p2[:, 1], p3[:, 0], p3[:, 1])
+    c = _haversine_array(p1[:, 0], p1[:, 1], p3[:, 0], p3[:, 1])
+
+    # Menger curvature via Heron's formula, zero for degenerate triangles
+    s = (a + b + c) / 2.0
+    area = np.sqrt(np.maximum(s * (s - a) * (s - b) * (s - c), 0.0))
+    abc = a * b * c
+    valid = (a >= 1e-6) & (b >= 1e-6) & (c >= 1e-6) & (abc >= 1e-10)
+    curvature = np.zeros_like(a)
+    np.divide(2.0 * area, abc, out=curvature, where=valid)
+
+    # A curved vertex marks both adjacent segments
+    curved_vertex = curvature > curvature_threshold
+    is_curved[:-1] |= curved_vertex
+    is_curved[1:] |= curved_vertex
+    return is_curved
@@ -3,20 +3,25 @@
 import logging
 import math
 from urllib.parse import quote
-from uuid import UUID
+from uuid import UUID, uuid4
 
+import numpy as np
+import orjson
+import shapely
 import sqlalchemy as sa
 from geoalchemy2 import Geography
 from geoalchemy2.elements import WKBElement
-from geoalchemy2.shape import from_shape, to_shape
-from shapely.geometry import LineString, Point
-from sqlalchemy import and_, desc, func, select, text, update
+from geoalchemy2.shape import to_shape
+from shapely.geometry import LineString
+from sqlalchemy import delete, desc, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.orm import lazyload
 
+from app.core.cache import cache_get, cache_set, make_cache_key
 from app.core.config import get_settings
 from app.core.exceptions import NotFoundError, PermissionDeniedError
-from app.models.course import Course, CourseStats
+from app.models.course import Course, CourseStats, public_courses_mv
 from app.models.course_dominion import CourseDominion
 from app.models.crew import Crew
 from app.models.like import CourseLike
@@ -24,10 +29,26 @@ from app.models.review import Review
 from app.models.run_record import RunRecord
 from app.models.run_session import RunSession
 from app.models.user import User
-from app.services.map_matching_service import MapMatchingService
+from app.services.map_matching_service import get_map_matcher
 
 logger = logging.getLogger(__name__)
 
+# Read once at import: thumbnail helpers run per row on listing paths
+_MAPBOX_TOKEN = get_settings().MAPBOX_ACCESS_TOKEN
+
+# Fields an owner may change through update_course (None values are ignored)
+_UPDATABLE_COURSE_FIELDS = ("title", "description", "is_public", "tags", "course_type", "lap_count")
+
+# Difficulty labels indexed by score bucket (<33, 33-66, >=66)
+_DIFFICULTY_LABELS = np.array(["easy", "medium", "hard"])
+
+# Sortable columns for list_courses; anything else falls back to created_at
+_LIST_ORDER_COLUMNS = {
+    "created_at": public_courses_mv.c.created_at,
+    "total_runs": public_courses_mv.c.total_runs,
+    "distance_meters": public_courses_mv.c.distance_meters,
+}
+
 
 def get_route_preview(course: "Course", max_points: int = 50) -> list[list[float]] | None:
     """Return a simplified route preview as [[lng, lat], ...] for thumbnail map rendering.
@@ -76,17 +97,16 @@ def get_thumbnail_url_for_course(course: "Course") -> str | None:
     if course.route_geometry is None:
         return None
 
-    settings = get_settings()
-    if not settings.MAPBOX_ACCESS_TOKEN:
+    if not _MAPBOX_TOKEN:
         return None
 
     shapely_geom = to_shape(course.route_geometry)
-    coords = list(shapely_geom.coords)
+    # The thumbnail path only needs lng/lat
     geojson = {
         "type": shapely_geom.geom_type,
-        "coordinates": [[c[0], c[1], c[2] if len(c) > 2 else 0.0] for c in coords],
+        "coordinates": shapely.get_coordinates(shapely_geom).tolist(),
     }
-    return generate_thumbnail_url(geojson, settings.MAPBOX_ACCESS_TOKEN)
+    return generate_thumbnail_url(geojson, _MAPBOX_TOKEN)
 
 
 def generate_thumbnail_url(route_geometry: dict, access_token: str) -> str | None:
@@ -103,36 +123,34 @@ def generate_thumbnail_url(route_geometry: dict, access_token: str) -> str | Non
     if len(coords) < 2:
         return None
 
-    # Step 1: Remove consecutive duplicate/near-duplicate points
-    deduped = [coords[0]]
-    for c in coords[1:]:
-        prev = deduped[-1]
-        # Skip if essentially the same point (< ~1m)
-        if abs(c[0] - prev[0]) < 0.00001 and abs(c[1] - prev[1]) < 0.00001:
-            continue
-        deduped.append(c)
-    if len(deduped) < 2:
+    # Step 1: Bail out if every point is essentially the same spot (< ~1m).
+    # Smaller GPS stutter is absorbed by the simplification below.
+    xy = _coords_xy(coords)
+    if not (np.abs(xy - xy[0]) >= 0.00001).any():
         return None
 
     # Step 2: Shapely Douglas-Peucker to smooth GPS noise
-    line = LineString([(c[0], c[1]) for c in deduped])
     # ~10m tolerance for clean thumbnail appearance
-    smoothed = line.simplify(0.0001, preserve_topology=True)
-    simplified_coords = list(smoothed.coords)
+    smoothed = LineString(xy).simplify(0.0001, preserve_topology=True)
+    simplified = shapely.get_coordinates(smoothed)
 
     # Step 3: Limit to 80 points for URL length
-    if len(simplified_coords) > 80:
-        step = max(1, len(simplified_coords) // 80)
-        reduced = simplified_coords[::step]
-        if reduced[-1] != simplified_coords[-1]:
-            reduced.append(simplified_coords[-1])
-        simplified_coords = reduced
-
-    if len(simplified_coords) < 2:
+    if len(simplified) > 80:
+        step = max(1, len(simplified) // 80)
+        reduced = simplified[::step]
+        if not np.array_equal(reduced[-1], simplified[-1]):
+            reduced = np.vstack([reduced, simplified[-1:]])
+        simplified = reduced
+
+    if len(simplified) < 2:
         return None
 
     # Build polyline string: lng,lat;lng,lat;...
-    polyline_str = ";".join(f"{c[0]:.6f},{c[1]:.6f}" for c in simplified_coords)
+    pairs = np.char.add(
+        np.char.add(np.char.mod("%.6f", simplified[:, 0]), ","),
+        np.char.mod("%.6f", simplified[:, 1]),
+    )
+    polyline_str = ";".join(pairs.tolist())
 
     # URL-encode the path — match world map route color (#FFC800)
     path = f"path-4+FFC800-0.9({quote(polyline_str)})"
@@ -143,6 +161,53 @@ def generate_thumbnail_url(route_geometry: dict, access_token: str) -> str | Non
     )
 
 
+def _coords_xy(coords: list) -> np.ndarray:
+    """Return [lng, lat(, alt)] coordinates as a C-contiguous (N, 2) float array.
+
+    Slicing 3D points leaves a strided view, which orjson refuses to
+    serialize, so the slice is copied into contiguous memory.
+    """
+    try:
+        return np.ascontiguousarray(np.asarray(coords, dtype=float)[:, :2])
+    except ValueError:
+        # Mixed 2D/3D points can't form a rectangular array
+        return np.array([(c[0], c[1]) for c in coords], dtype=float)
+
+
+def _line_from_coords(coords: list) -> LineString:
+    """Build a 2D LineString from [lng, lat(, alt)] coordinates.
+
+    Slicing a NumPy array hands GEOS the whole (N, 2) block at once instead
+    of building a Python tuple per point.
+    """
+    return LineString(_coords_xy(coords))
+
+
+def _geojson_line_geometry(coords: list):
+    """SQL expression that builds a 2D LINESTRING geometry inside PostGIS.
+
+    The coordinates travel as a single GeoJSON text parameter parsed by
+    ST_GeomFromGeoJSON, so no Shapely object or WKB is built in Python.
+    """
+    geojson = orjson.dumps(
+        {"type": "LineString", "coordinates": _coords_xy(coords)},
+        option=orjson.OPT_SERIALIZE_NUMPY,
+    ).decode()
+    return func.ST_SetSRID(func.ST_GeomFromGeoJSON(geojson), 4326)
+
+
+def _route_geojson(coords: list) -> dict:
+    """GeoJSON dict for a route stored via _geojson_line_geometry.
+
+    Matches _wkb_to_geojson's output for the stored 2D line: altitude is 0.
+    """
+    xy = _coords_xy(coords)
+    return {
+        "type": "LineString",
+        "coordinates": np.column_stack([xy, np.zeros(len(xy))]).tolist(),
+    }
+
+
 def _haversine(coord1: list, coord2: list) -> float:
     """Calculate distance in meters between two [lng, lat] coordinates using haversine formula."""
     R = 6371000
@@ -234,11 +299,127 @@ def _generate_checkpoints(route_coords: list, interval_meters: int = 500) -> lis
     return checkpoints
 
 
+# get_nearby_courses has a fixed shape, so it is built once with bind
+# parameters: every call sends identical SQL and reuses the connection's
+# prepared statement instead of re-planning the PostGIS expression.
+_nearby_user_geog = func.ST_SetSRID(
+    func.ST_MakePoint(
+        sa.bindparam("lng", type_=sa.Float),
+        sa.bindparam("lat", type_=sa.Float),
+    ),
+    4326,
+).cast(Geography(geometry_type="POINT", srid=4326))
+_nearby_distance = func.ST_Distance(Course.start_point, _nearby_user_geog)
+_NEARBY_COURSES_QUERY = (
+    select(
+        Course.id,
+        Course.title,
+        Course.thumbnail_url,
+        Course.route_geometry,
+        Course.distance_meters,
+        Course.estimated_duration_seconds,
+        func.coalesce(CourseStats.total_runs, 0).label("total_runs"),
+        CourseStats.avg_pace_seconds_per_km,
+        User.nickname.label("creator_nickname"),
+        _nearby_distance.label("distance_m"),
+    )
+    # Outer join: deleted accounts leave their courses with a NULL creator
+    .outerjoin(User, User.id == Course.creator_id)
+    .outerjoin(CourseStats, CourseStats.course_id == Course.id)
+    .where(
+        Course.is_public == True,
+        func.ST_DWithin(
+            Course.start_point,
+            _nearby_user_geog,
+            sa.bindparam("radius", type_=sa.Integer),
+        ),
+    )
+    .order_by(_nearby_distance)
+    .limit(sa.bindparam("limit", type_=sa.Integer))
+)
+
+
+def _bounds_markers_query(spatial: bool, as_text: bool):
+    """Viewport marker SQL for get_courses_in_bounds.
+
+    Markers are assembled as JSON in PostgreSQL and returned as a single
+    json_agg value, so no per-row Python dict building or conversion.
+    start_lat/start_lng are generated from start_point, so the viewport
+    filter is a plain btree range scan (idx_courses_public_start_lng_lat).
+    """
+    spatial_clause = """
+              AND c.start_lng BETWEEN :sw_lng AND :ne_lng
+              AND c.start_lat BETWEEN :sw_lat AND :ne_lat""" if spatial else ""
+    cast = "::text" if as_text else ""
+    return text(f"""
+        SELECT COALESCE(json_agg(m), '[]'::json){cast} AS markers
+        FROM (
+            SELECT
+                c.id::text AS id,
+                c.title,
+                COALESCE(c.start_lat, 0) AS start_lat,
+                COALESCE(c.start_lng, 0) AS start_lng,
+                c.distance_meters,
+                COALESCE(cs.total_runs, 0) AS total_runs,
+                c.difficulty,
+                ar.avg_rating,
+                COALESCE(act.active_runners, 0) AS active_runners,
+                COALESCE(c.created_at >= :new_since, false) AS is_new,
+                COALESCE(c.elevation_gain_meters, 0) AS elevation_gain_meters,
+                u.nickname AS creator_nickname,
+                CASE WHEN cd.crew_id IS NOT NULL THEN json_build_object(
+                    'crew_id', cd.crew_id::text,
+                    'crew_name', cd.crew_name,
+                    'crew_badge_color', cr.badge_color,
+                    'crew_logo_url', cr.logo_url
+                ) END AS dominion
+            FROM courses c
+            LEFT JOIN course_stats cs ON cs.course_id = c.id
+            LEFT JOIN (
+                SELECT course_id, ROUND(AVG(rating)::numeric, 1) AS avg_rating
+                FROM reviews
+                GROUP BY course_id
+            ) ar ON ar.course_id = c.id
+            LEFT JOIN (
+                SELECT course_id, COUNT(*) AS active_runners
+                FROM run_sessions
+                WHERE status = 'active'
+                GROUP BY course_id
+            ) act ON act.course_id = c.id
+            LEFT JOIN users u ON u.id = c.creator_id
+            LEFT JOIN course_dominions cd ON cd.course_id = c.id
+            LEFT JOIN crews cr ON cr.id = cd.crew_id
+            WHERE c.is_public = true
+              {spatial_clause}
+            LIMIT :limit
+        ) m
+    """)
+
+
+# Built once per (spatial filter, text output) variant so every call reuses
+# the same TextClause and its cached compilation / prepared statement
+_BOUNDS_MARKERS_QUERIES = {
+    (spatial, as_text): _bounds_markers_query(spatial, as_text)
+    for spatial in (True, False)
+    for as_text in (True, False)
+}
+
+
 class CourseService:
     """Handles course CRUD, spatial queries, and stats retrieval."""
 
     MAX_COURSES_PER_DAY = 10
 
+    # Redis namespace for list/nearby responses; invalidated whenever
+    # mv_public_courses is refreshed (see app.tasks.public_courses).
+    CACHE_NAMESPACE = "courses"
+    CACHE_TTL_SECONDS = 45
+    # Caller locations are rounded to 3 decimal places (~111 m) so nearby
+    # users share cache entries and bind values.
+    LOCATION_GRID_DECIMALS = 3
+    # Rows per UPDATE ... FROM (VALUES ...) statement (2 bind params per row)
+    BULK_UPDATE_CHUNK_SIZE = 5000
+
     async def create_course(
         self,
         db: AsyncSession,
@@ -275,118 +456,165 @@ class CourseService:
                 message=f"코스는 24시간 내 최대 {self.MAX_COURSES_PER_DAY}개까지 생성할 수 있습니다",
             )
 
+        # Ownership check that only pulls the two columns needed to seed the
+        # course stats, not the whole (wide, TOAST-heavy) run record row.
         result = await db.execute(
-            select(RunRecord).where(
+            select(
+                RunRecord.duration_seconds,
+                RunRecord.avg_pace_seconds_per_km,
+            ).where(
                 RunRecord.id == run_record_id,
                 RunRecord.user_id == user_id,
             )
         )
-        source_run = result.scalar_one_or_none()
+        source_run = result.first()
         if source_run is None:
             raise NotFoundError(
                 code="NOT_FOUND",
                 message="Run record not found or not owned by you",
             )
 
-        route_wkb = None
-        raw_route_wkb = None
-        start_wkb = None
+        route_geog = None
+        route_geojson = None
+        raw_route_geog = None
+        start_geog = None
         coordinates = route_geometry_geojson.get("coordinates", [])
 
         if len(coordinates) >= 2:
-            # Store raw GPS route
-            raw_line = LineString([(c[0], c[1]) for c in coordinates])
-            raw_route_wkb = from_shape(raw_line, srid=4326)
-
-            # Apply map matching to snap route to road/path network
-            matched_coordinates = coordinates
-            try:
-                matcher = MapMatchingService()
-                match_result = await matcher.match_route(coordinates)
-                await matcher.close()
-                matched_coordinates = match_result.coordinates
-                logger.info(
-                    f"[CourseService] Map matching: {len(coordinates)} pts → {len(matched_coordinates)} pts"
-                )
-            except Exception as e:
-                logger.warning(f"[CourseService] Map matching failed, using raw route: {e}")
-
-            matched_line = LineString([(c[0], c[1]) for c in matched_coordinates])
-            route_wkb = from_shape(matched_line, srid=4326)
-
-            first_coord = matched_coordinates[0]
-            start_point = Point(first_coord[0], first_coord[1])
-            start_wkb = from_shape(start_point, srid=4326)
+            # Store the raw GPS route.  Map matching runs in the background
+            # (apply_map_matching) and swaps in the snapped route when done.
+            raw_line = _geojson_line_geometry(coordinates)
+            raw_route_geog = raw_line.cast(Geography(geometry_type="LINESTRING", srid=4326))
+            route_geog = raw_route_geog
+            route_geojson = _route_geojson(coordinates)
+            start_geog = func.ST_StartPoint(raw_line).cast(Geography(geometry_type="POINT", srid=4326))
 
         difficulty = self._compute_difficulty(
             distance_meters=distance_meters,
             elevation_gain_meters=elevation_gain_meters,
         )
 
-        course = Course(
-            creator_id=user_id,
-            run_record_id=run_record_id,
-            title=title,
-            description=description,
-            route_geometry=route_wkb,
-            raw_route_geometry=raw_route_wkb,
-            start_point=start_wkb,
-            distance_meters=distance_meters,
-            estimated_duration_seconds=estimated_duration_seconds,
-            elevation_gain_meters=elevation_gain_meters,
-            elevation_profile=elevation_profile,
-            is_public=is_public,
-            tags=tags or [],
-            difficulty=difficulty,
-            course_type=course_type,
-            lap_count=lap_count,
-        )
-        db.add(course)
-        await db.flush()
-
-        stats = CourseStats(course_id=course.id)
-        db.add(stats)
-        await db.flush()
-
-        # Generate thumbnail URL from matched route (or raw if matching failed)
-        settings = get_settings()
+        # Thumbnail and checkpoints start from the raw route; apply_map_matching
+        # regenerates both from the matched one.
         thumbnail_geojson = {
             "type": "LineString",
-            "coordinates": matched_coordinates if len(coordinates) >= 2 else [],
+            "coordinates": coordinates,
         } if len(coordinates) >= 2 else route_geometry_geojson
         thumbnail_url = generate_thumbnail_url(
             route_geometry=thumbnail_geojson,
-            access_token=settings.MAPBOX_ACCESS_TOKEN,
+            access_token=_MAPBOX_TOKEN,
         )
-        if thumbnail_url:
-            course.thumbnail_url = thumbnail_url
-            await db.flush()
 
         # Generate checkpoints (500m interval, skip if < 1km)
+        checkpoints = None
+        checkpoint_interval_meters = None
         if len(coordinates) >= 2:
-            checkpoints = _generate_checkpoints(matched_coordinates, 500)
-            course.checkpoints = checkpoints if checkpoints else None
-            course.checkpoint_interval_meters = 500
-            await db.flush()
+            checkpoints = _generate_checkpoints(coordinates, 500) or None
+            checkpoint_interval_meters = 500
+
+        # Insert the course and its stats row in a single statement: the
+        # stats INSERT rides along as a data-modifying CTE.  Stats are seeded
+        # with the creator's run, which is by definition a full traversal.
+        course_id = uuid4()
+        stats_cte = (
+            pg_insert(CourseStats)
+            .values(
+                course_id=course_id,
+                total_runs=1,
+                unique_runners=1,
+                best_duration_seconds=source_run.duration_seconds,
+                best_pace_seconds_per_km=source_run.avg_pace_seconds_per_km,
+                avg_duration_seconds=source_run.duration_seconds,
+                avg_pace_seconds_per_km=source_run.avg_pace_seconds_per_km,
+            )
+            .returning(CourseStats.course_id)
+            .cte("new_course_stats")
+        )
+        stmt = (
+            pg_insert(Course)
+            .values(
+                id=course_id,
+                creator_id=user_id,
+                run_record_id=run_record_id,
+                title=title,
+                description=description,
+                route_geometry=route_geog,
+                route_geojson=route_geojson,
+                raw_route_geometry=raw_route_geog,
+                start_point=start_geog,
+                distance_meters=distance_meters,
+                estimated_duration_seconds=estimated_duration_seconds,
+                elevation_gain_meters=elevation_gain_meters,
+                elevation_profile=elevation_profile,
+                thumbnail_url=thumbnail_url,
+                is_public=is_public,
+                tags=tags or [],
+                difficulty=difficulty,
+                course_type=course_type,
+                lap_count=lap_count,
+                checkpoints=checkpoints,
+                checkpoint_interval_meters=checkpoint_interval_meters,
+                is_processing=route_geog is not None,
+            )
+            .returning(Course)
+            .add_cte(stats_cte)
+        )
+        result = await db.execute(stmt)
+        course = result.scalar_one()
 
         # Link the original run record to the new course so the creator's
-        # time appears on the leaderboard.  The run that "defined" the course
-        # is, by definition, a complete traversal of the route.
-        source_run.course_id = course.id
-        source_run.course_completed = True
-        await db.flush()
-
-        # Seed the course stats with the creator's run
-        stats.total_runs = 1
-        stats.unique_runners = 1
-        stats.best_duration_seconds = source_run.duration_seconds
-        stats.best_pace_seconds_per_km = source_run.avg_pace_seconds_per_km
-        stats.avg_duration_seconds = source_run.duration_seconds
-        stats.avg_pace_seconds_per_km = source_run.avg_pace_seconds_per_km
-        await db.flush()
+        # time appears on the leaderboard.
+        await db.execute(
+            update(RunRecord)
+            .where(RunRecord.id == run_record_id)
+            .values(course_id=course.id, course_completed=True)
+        )
 
         return course
 
+    async def apply_map_matching(
+        self,
+        db: AsyncSession,
+        course_id: UUID,
+        coordinates: list[list[float]],
+    ) -> None:
+        """Replace a new course's raw route with its map-matched version.
+
+        Runs after create_course, off the request path. If matching fails the
+        raw route is kept; either way is_processing is cleared. A course whose
+        route was corrected in the meantime is left alone.
+        """
+        values: dict = {"is_processing": False}
+        try:
+            matcher = get_map_matcher()
+            match_result = await matcher.match_route(coordinates)
+            matched_coordinates = match_result.coordinates
+            logger.info(
+                f"[CourseService] Map matching: {len(coordinates)} pts → {len(matched_coordinates)} pts"
+            )
+            if matched_coordinates and len(matched_coordinates) >= 2:
+                matched_line = _geojson_line_geometry(matched_coordinates)
+                values.update(
+                    route_geometry=matched_line.cast(Geography(geometry_type="LINESTRING", srid=4326)),
+                    route_geojson=_route_geojson(matched_coordinates),
+                    start_point=func.ST_StartPoint(matched_line).cast(Geography(geometry_type="POINT", srid=4326)),
+                    thumbnail_url=generate_thumbnail_url(
+                        route_geometry={"type": "LineString", "coordinates": matched_coordinates},
+                        access_token=_MAPBOX_TOKEN,
+                    ),
+                    checkpoints=_generate_checkpoints(matched_coordinates, 500) or None,
+                )
+        except Exception as e:
+            # Keep the raw route, but still clear is_processing below
+            logger.warning(f"[CourseService] Map matching failed, keeping raw route: {e}")
+            values = {"is_processing": False}
+
+        await db.execute(
+            update(Course)
+            .where(Course.id == course_id, Course.is_processing == True)  # noqa: E712
+            .values(**values)
+        )
+
     async def get_course_by_id(self, db: AsyncSession, course_id: UUID) -> Course | None:
         """Get a course by ID."""
         result = await db.execute(
@@ -401,7 +629,14 @@ class CourseService:
         The WKBElement stored in PostGIS is converted to a GeoJSON-compatible
         dict with type "LineString" and coordinates as [lng, lat, alt] arrays.
         """
-        course = await self.get_course_by_id(db, course_id)
+        # creator is joined-loaded by default; stats isn't part of the detail
+        # payload, so skip its join (lazyload: no IO unless accessed)
+        result = await db.execute(
+            select(Course)
+            .options(lazyload(Course.stats))
+            .where(Course.id == course_id)
+        )
+        course = result.scalar_one_or_none()
         if course is None:
             return None
 
@@ -411,7 +646,8 @@ class CourseService:
             "avatar_url": course.creator.avatar_url if course.creator else None,
         }
 
-        route_geojson = self._wkb_to_geojson(course.route_geometry)
+        # Rows written before route_geojson existed fall back to decoding WKB
+        route_geojson = course.route_geojson or self._wkb_to_geojson(course.route_geometry)
 
         # Lazy backfill: generate checkpoints for existing courses that don't have them
         checkpoints = course.checkpoints
@@ -422,6 +658,13 @@ class CourseService:
                 course.checkpoint_interval_meters = 500
                 await db.flush()
 
+        # Lazy backfill: persist a generated thumbnail so later reads skip the
+        # WKB decode (correct_route clears it when the route changes)
+        thumbnail_url = get_thumbnail_url_for_course(course)
+        if thumbnail_url and not course.thumbnail_url:
+            course.thumbnail_url = thumbnail_url
+            await db.flush()
+
         # Fetch dominion (which crew currently owns this course)
         dominion_result = await db.execute(
             select(CourseDominion.crew_id, CourseDominion.crew_name)
@@ -451,8 +694,9 @@ class CourseService:
             "estimated_duration_seconds": course.estimated_duration_seconds,
             "elevation_gain_meters": course.elevation_gain_meters,
             "elevation_profile": course.elevation_profile,
-            "thumbnail_url": get_thumbnail_url_for_course(course),
+            "thumbnail_url": thumbnail_url,
             "is_public": course.is_public,
+            "is_processing": course.is_processing,
             "created_at": course.created_at,
             "creator": creator_info,
             "checkpoints": checkpoints,
@@ -471,14 +715,11 @@ class CourseService:
             return None
 
         shapely_geom = to_shape(wkb_element)
-        coords = list(shapely_geom.coords)
 
-        # shapely coords may be 2D (lng, lat) or 3D (lng, lat, alt).
-        # Normalise to [lng, lat, alt] with alt=0 when absent.
-        coordinates = [
-            [c[0], c[1], c[2] if len(c) > 2 else 0.0]
-            for c in coords
-        ]
+        # Copy all coordinates out of GEOS in one call. 2D geometries come
+        # back with NaN altitude; normalise to [lng, lat, alt] with alt=0.
+        coords = shapely.get_coordinates(shapely_geom, include_z=True)
+        coordinates = np.nan_to_num(coords, nan=0.0).tolist()
 
         return {
             "type": shapely_geom.geom_type,  # "LineString"
@@ -500,155 +741,202 @@ class CourseService:
         per_page: int = 20,
         user_id: "UUID | None" = None,
     ) -> tuple[list[dict], int]:
-        """List public courses with filtering, spatial queries, and pagination."""
-        filters = [Course.is_public == True]
+        """List public courses with filtering, spatial queries, and pagination.
+
+        Reads from the mv_public_courses materialized view, which already has
+        creator and stats columns joined in; likes, active runners and the
+        caller's best time stay live via LATERAL lookups on the page rows.
+        """
+        if near_lat is not None and near_lng is not None:
+            near_lat = round(near_lat, self.LOCATION_GRID_DECIMALS)
+            near_lng = round(near_lng, self.LOCATION_GRID_DECIMALS)
+
+        # Anonymous listings are identical for every caller, so cache them;
+        # authenticated ones carry the caller's best time and skip the cache.
+        cache_key = None
+        if user_id is None:
+            cache_key = await make_cache_key(self.CACHE_NAMESPACE, {
+                "op": "list",
+                "search": search,
+                "min_distance": min_distance,
+                "max_distance": max_distance,
+                "near_lat": near_lat,
+                "near_lng": near_lng,
+                "near_radius": near_radius,
+                "order_by": order_by,
+                "order": order,
+                "page": page,
+                "per_page": per_page,
+            })
+            cached = await cache_get(cache_key)
+            if cached is not None:
+                courses_data, total_count = cached
+                return courses_data, total_count
+
+        pc = public_courses_mv.c
+        filters = []
 
-        if search:
-            filters.append(Course.title.ilike(f"%{search}%"))
+        # Search and relevance both work on lower(title), the expression the
+        # trigram index on the view covers (idx_mv_public_courses_title_trgm)
+        title_lower = func.lower(pc.title)
+        search_lower = search.lower() if search else None
+        if search_lower:
+            filters.append(title_lower.like(f"%{search_lower}%"))
 
         if min_distance is not None:
-            filters.append(Course.distance_meters >= min_distance)
+            filters.append(pc.distance_meters >= min_distance)
         if max_distance is not None:
-            filters.append(Course.distance_meters <= max_distance)
+            filters.append(pc.distance_meters <= max_distance)
 
         has_spatial = near_lat is not None and near_lng is not None
+        distance_col = None
         if has_spatial:
-            user_point = func.ST_MakePoint(near_lng, near_lat)
-            user_geog = func.cast(user_point, text("geography"))
+            user_point = func.ST_SetSRID(func.ST_MakePoint(near_lng, near_lat), 4326)
+            user_geog = user_point.cast(Geography(geometry_type="POINT", srid=4326))
             filters.append(
-                func.ST_DWithin(Course.start_point, user_geog, near_radius)
+                func.ST_DWithin(pc.start_point, user_geog, near_radius)
+            )
+            distance_col = func.ST_Distance(pc.start_point, user_geog)
+
+        # Order the filtered view rows once; the same ordering numbers each
+        # row so the outer query can restore it after the LATERAL joins.
+        if search_lower:
+            # When searching, sort by relevance first (exact > starts with > contains)
+            relevance = sa.case(
+                (title_lower == search_lower, 0),
+                (title_lower.like(f"{search_lower}%"), 1),
+                else_=2,
+            )
+            order_clauses = [relevance, desc(pc.created_at)]
+        elif order_by == "distance_from_user" and has_spatial:
+            order_clauses = [distance_col if order == "asc" else desc(distance_col)]
+        else:
+            order_expr = _LIST_ORDER_COLUMNS.get(order_by, pc.created_at)
+            order_clauses = [order_expr if order == "asc" else desc(order_expr)]
+
+        # Paginate the view first so the per-course lookups below only run
+        # for the rows actually returned, not for every filtered candidate.
+        page_rows = (
+            select(
+                pc.id,
+                pc.title,
+                pc.thumbnail_url,
+                pc.route_geometry,
+                pc.distance_meters,
+                pc.estimated_duration_seconds,
+                pc.elevation_gain_meters,
+                pc.created_at,
+                pc.creator_id,
+                pc.creator_nickname,
+                pc.creator_avatar_url,
+                pc.total_runs,
+                pc.unique_runners,
+                pc.avg_pace_seconds_per_km,
+                (distance_col if distance_col is not None else sa.null()).label("distance_from_user"),
+                # Total matches before LIMIT/OFFSET, saving a separate COUNT round-trip
+                func.count().over().label("total_count"),
+                func.row_number().over(order_by=order_clauses).label("position"),
             )
+            .where(*filters)
+            .order_by(*order_clauses)
+            .offset(page * per_page)
+            .limit(per_page)
+            .subquery("page_rows")
+        )
 
-        count_q = select(func.count(Course.id)).where(and_(*filters))
-        total_result = await db.execute(count_q)
-        total_count = total_result.scalar() or 0
-
-        # Scalar subqueries for enriched data
-        like_count_sub = (
-            select(func.count(CourseLike.id))
-            .where(CourseLike.course_id == Course.id)
-            .correlate(Course)
-            .scalar_subquery()
-            .label("like_count")
+        # Enriched data, evaluated per page row via LEFT JOIN LATERAL
+        likes = (
+            select(func.count(CourseLike.id).label("like_count"))
+            .where(CourseLike.course_id == page_rows.c.id)
+            .lateral("likes")
         )
 
-        active_runners_sub = (
-            select(func.count(RunSession.id))
+        active = (
+            select(func.count(RunSession.id).label("active_runners"))
             .where(
-                RunSession.course_id == Course.id,
+                RunSession.course_id == page_rows.c.id,
                 RunSession.status == "active",
             )
-            .correlate(Course)
-            .scalar_subquery()
-            .label("active_runners")
+            .lateral("active")
         )
 
-        extra_columns = [like_count_sub, active_runners_sub]
-
+        my_best = None
         if user_id is not None:
-            my_best_sub = (
-                select(func.min(RunRecord.duration_seconds))
+            my_best = (
+                select(func.min(RunRecord.duration_seconds).label("my_best_duration_seconds"))
                 .where(
                     RunRecord.user_id == user_id,
-                    RunRecord.course_id == Course.id,
+                    RunRecord.course_id == page_rows.c.id,
                 )
-                .correlate(Course)
-                .scalar_subquery()
-                .label("my_best_duration_seconds")
+                .lateral("my_best")
             )
-            extra_columns.append(my_best_sub)
 
-        if has_spatial:
-            user_point = func.ST_MakePoint(near_lng, near_lat)
-            user_geog = func.cast(user_point, text("geography"))
-            distance_col = func.ST_Distance(Course.start_point, user_geog).label("distance_from_user")
-            query = select(Course, distance_col, *extra_columns).where(and_(*filters))
-        else:
-            query = select(Course, *extra_columns).where(and_(*filters))
-
-        # When searching, sort by relevance first (exact > starts with > contains)
-        if search:
-            search_lower = search.lower()
-            relevance = sa.case(
-                (func.lower(Course.title) == search_lower, 0),
-                (func.lower(Course.title).like(f"{search_lower}%"), 1),
-                else_=2,
+        # Plain column projection: rows come back as natively decoded tuples,
+        # with no ORM entities and no JSON text to re-parse.
+        query = (
+            select(
+                *(c for c in page_rows.c if c.name != "position"),
+                likes.c.like_count,
+                active.c.active_runners,
+                (
+                    my_best.c.my_best_duration_seconds
+                    if my_best is not None
+                    else sa.null()
+                ).label("my_best_duration_seconds"),
             )
-            query = query.order_by(relevance, desc(Course.created_at))
-        elif order_by == "distance_from_user" and has_spatial:
-            order_expr = text("distance_from_user")
-            if order == "asc":
-                query = query.order_by(order_expr)
-            else:
-                query = query.order_by(desc(order_expr))
-        elif order_by == "total_runs":
-            query = query.outerjoin(CourseStats, CourseStats.course_id == Course.id)
-            order_expr = func.coalesce(CourseStats.total_runs, 0)
-            if order == "asc":
-                query = query.order_by(order_expr)
-            else:
-                query = query.order_by(desc(order_expr))
-        else:
-            order_expr = getattr(Course, order_by, Course.created_at)
-            if order == "asc":
-                query = query.order_by(order_expr)
-            else:
-                query = query.order_by(desc(order_expr))
-
-        query = query.offset(page * per_page).limit(per_page)
+            .select_from(page_rows)
+            .outerjoin(likes, sa.true())
+            .outerjoin(active, sa.true())
+        )
+        if my_best is not None:
+            query = query.outerjoin(my_best, sa.true())
+        query = query.order_by(page_rows.c.position)
 
         result = await db.execute(query)
         rows = result.all()
 
-        courses_data = []
-        for row in rows:
-            # Row layout: Course, [distance_from_user], like_count, active_runners, [my_best]
-            idx = 0
-            course = row[idx]; idx += 1
-
-            if has_spatial:
-                distance_from_user = row[idx]; idx += 1
-            else:
-                distance_from_user = None
-
-            like_count = row[idx] or 0; idx += 1
-            active_runners = row[idx] or 0; idx += 1
-
-            my_best = None
-            if user_id is not None:
-                my_best = row[idx]; idx += 1
+        if rows:
+            total_count = rows[0].total_count
+        elif page > 0:
+            # Past the last page: the window count is lost with the rows.
+            count_result = await db.execute(
+                select(func.count()).select_from(public_courses_mv).where(*filters)
+            )
+            total_count = count_result.scalar() or 0
+        else:
+            total_count = 0
 
-            creator_info = {
-                "id": str(course.creator.id) if course.creator else "",
-                "nickname": course.creator.nickname if course.creator else None,
-                "avatar_url": course.creator.avatar_url if course.creator else None,
+        # Rows expose thumbnail_url / route_geometry like a Course does, so the
+        # thumbnail and preview helpers accept them directly.
+        courses_data = [
+            {
+                "id": str(row.id),
+                "title": row.title,
+                "thumbnail_url": get_thumbnail_url_for_course(row),
+                "route_preview": get_route_preview(row),
+                "distance_meters": row.distance_meters,
+                "estimated_duration_seconds": row.estimated_duration_seconds,
+                "elevation_gain_meters": row.elevation_gain_meters,
+                "creator": {
+                    "id": str(row.creator_id) if row.creator_id else "",
+                    "nickname": row.creator_nickname,
+                    "avatar_url": row.creator_avatar_url,
+                },
+                "stats": {
+                    "total_runs": row.total_runs,
+                    "unique_runners": row.unique_runners,
+                    "avg_pace_seconds_per_km": row.avg_pace_seconds_per_km,
+                },
+                "created_at": row.created_at,
+                "distance_from_user_meters": row.distance_from_user,
+                "like_count": row.like_count,
+                "active_runners": row.active_runners,
+                "my_best_duration_seconds": row.my_best_duration_seconds,
             }
+            for row in rows
+        ]
 
-            stats_info = {"total_runs": 0, "unique_runners": 0, "avg_pace_seconds_per_km": None}
-            if course.stats:
-                stats_info = {
-                    "total_runs": course.stats.total_runs,
-                    "unique_runners": course.stats.unique_runners,
-                    "avg_pace_seconds_per_km": course.stats.avg_pace_seconds_per_km,
-                }
-
-            courses_data.append({
-                "id": str(course.id),
-                "title": course.title,
-                "thumbnail_url": get_thumbnail_url_for_course(course),
-                "route_preview": get_route_preview(course),
-                "distance_meters": course.distance_meters,
-                "estimated_duration_seconds": course.estimated_duration_seconds,
-                "elevation_gain_meters": course.elevation_gain_meters,
-                "creator": creator_info,
-                "stats": stats_info,
-                "created_at": course.created_at,
-                "distance_from_user_meters": distance_from_user,
-                "like_count": like_count,
-                "active_runners": active_runners,
-                "my_best_duration_seconds": my_best,
-            })
-
+        await cache_set(cache_key, [courses_data, total_count], self.CACHE_TTL_SECONDS)
         return courses_data, total_count
 
     async def get_nearby_courses(
@@ -660,43 +948,47 @@ class CourseService:
         limit: int = 5,
     ) -> list[dict]:
         """Get nearby courses using PostGIS ST_DWithin."""
-        user_point = func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326)
-        user_geog = user_point.cast(Geography())
+        lat = round(lat, self.LOCATION_GRID_DECIMALS)
+        lng = round(lng, self.LOCATION_GRID_DECIMALS)
 
-        distance_col = func.ST_Distance(Course.start_point, user_geog).label("distance_m")
+        cache_key = await make_cache_key(self.CACHE_NAMESPACE, {
+            "op": "nearby", "lat": lat, "lng": lng, "radius": radius, "limit": limit,
+        })
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            return cached
 
-        query = (
-            select(Course, distance_col)
-            .outerjoin(CourseStats, CourseStats.course_id == Course.id)
-            .where(
-                Course.is_public == True,
-                func.ST_DWithin(Course.start_point, user_geog, radius),
-            )
-            .order_by(distance_col)
-            .limit(limit)
+        result = await db.execute(
+            _NEARBY_COURSES_QUERY,
+            {"lat": lat, "lng": lng, "radius": radius, "limit": limit},
         )
-
-        result = await db.execute(query)
         rows = result.all()
+        thumbnail_urls = [get_thumbnail_url_for_course(row) for row in rows]
 
-        nearby = []
-        for row in rows:
-            course = row[0]
-            distance_m = row[1]
-
-            nearby.append({
-                "id": str(course.id),
-                "title": course.title,
-                "thumbnail_url": get_thumbnail_url_for_course(course),
-                "route_preview": get_route_preview(course),
-                "distance_meters": course.distance_meters,
-                "estimated_duration_seconds": course.estimated_duration_seconds,
-                "total_runs": course.stats.total_runs if course.stats else 0,
-                "avg_pace_seconds_per_km": course.stats.avg_pace_seconds_per_km if course.stats else None,
-                "creator_nickname": course.creator.nickname if course.creator else None,
-                "distance_from_user_meters": distance_m,
-            })
+        nearby = [
+            {
+                "id": str(row.id),
+                "title": row.title,
+                "thumbnail_url": thumbnail_url,
+                "route_preview": get_route_preview(row),
+                "distance_meters": row.distance_meters,
+                "estimated_duration_seconds": row.estimated_duration_seconds,
+                "total_runs": row.total_runs,
+                "avg_pace_seconds_per_km": row.avg_pace_seconds_per_km,
+                "creator_nickname": row.creator_nickname,
+                "distance_from_user_meters": row.distance_m,
+            }
+            for row, thumbnail_url in zip(rows, thumbnail_urls)
+        ]
+
+        # Lazy backfill of thumbnails generated from the route above
+        await self._store_thumbnail_urls(db, {
+            row.id: thumbnail_url
+            for row, thumbnail_url in zip(rows, thumbnail_urls)
+            if thumbnail_url and not row.thumbnail_url
+        })
 
+        await cache_set(cache_key, nearby, self.CACHE_TTL_SECONDS)
         return nearby
 
     async def get_courses_in_bounds(
@@ -713,6 +1005,35 @@ class CourseService:
         Returns enriched marker data including difficulty, avg_rating,
         active_runners count, is_new flag, elevation, and creator nickname.
         """
+        return await self._courses_in_bounds(
+            db, sw_lat, sw_lng, ne_lat, ne_lng, limit, as_text=False,
+        ) or []
+
+    async def get_courses_in_bounds_json(
+        self,
+        db: AsyncSession,
+        sw_lat: float,
+        sw_lng: float,
+        ne_lat: float,
+        ne_lng: float,
+        limit: int = 50,
+    ) -> str:
+        """Same markers as get_courses_in_bounds, as the JSON array text
+        PostgreSQL produced, for passing straight into a response body."""
+        return await self._courses_in_bounds(
+            db, sw_lat, sw_lng, ne_lat, ne_lng, limit, as_text=True,
+        ) or "[]"
+
+    async def _courses_in_bounds(
+        self,
+        db: AsyncSession,
+        sw_lat: float,
+        sw_lng: float,
+        ne_lat: float,
+        ne_lng: float,
+        limit: int,
+        as_text: bool,
+    ):
         from datetime import datetime, timedelta, timezone
 
         seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
@@ -720,50 +1041,7 @@ class CourseService:
         # Skip spatial filter when requesting the entire world
         is_global = sw_lat <= -89 and sw_lng <= -179 and ne_lat >= 89 and ne_lng >= 179
 
-        spatial_clause = "" if is_global else """
-              AND ST_Intersects(
-                  c.start_point,
-                  ST_MakeEnvelope(:sw_lng, :sw_lat, :ne_lng, :ne_lat, 4326)::geography
-              )"""
-
-        query = text(f"""
-            SELECT
-                c.id,
-                c.title,
-                ST_Y(c.start_point::geometry) AS start_lat,
-                ST_X(c.start_point::geometry) AS start_lng,
-                c.distance_meters,
-                COALESCE(cs.total_runs, 0) AS total_runs,
-                c.difficulty,
-                ar.avg_rating,
-                COALESCE(act.active_runners, 0) AS active_runners,
-                c.created_at,
-                c.elevation_gain_meters,
-                u.nickname AS creator_nickname,
-                cd.crew_id AS dominion_crew_id,
-                cd.crew_name AS dominion_crew_name,
-                cr.badge_color AS dominion_crew_badge_color,
-                cr.logo_url AS dominion_crew_logo_url
-            FROM courses c
-            LEFT JOIN course_stats cs ON cs.course_id = c.id
-            LEFT JOIN (
-                SELECT course_id, ROUND(AVG(rating)::numeric, 1) AS avg_rating
-                FROM reviews
-                GROUP BY course_id
-            ) ar ON ar.course_id = c.id
-            LEFT JOIN (
-                SELECT course_id, COUNT(*) AS active_runners
-                FROM run_sessions
-                WHERE status = 'active'
-                GROUP BY course_id
-            ) act ON act.course_id = c.id
-            LEFT JOIN users u ON u.id = c.creator_id
-            LEFT JOIN course_dominions cd ON cd.course_id = c.id
-            LEFT JOIN crews cr ON cr.id = cd.crew_id
-            WHERE c.is_public = true
-              {spatial_clause}
-            LIMIT :limit
-        """)
+        query = _BOUNDS_MARKERS_QUERIES[(not is_global, as_text)]
 
         result = await db.execute(
             query,
@@ -772,34 +1050,11 @@ class CourseService:
                 "sw_lng": sw_lng,
                 "ne_lat": ne_lat,
                 "ne_lng": ne_lng,
+                "new_since": seven_days_ago,
                 "limit": limit,
             },
         )
-        rows = result.all()
-
-        return [
-            {
-                "id": str(row.id),
-                "title": row.title,
-                "start_lat": float(row.start_lat) if row.start_lat else 0,
-                "start_lng": float(row.start_lng) if row.start_lng else 0,
-                "distance_meters": row.distance_meters,
-                "total_runs": row.total_runs,
-                "difficulty": row.difficulty,
-                "avg_rating": float(row.avg_rating) if row.avg_rating is not None else None,
-                "active_runners": row.active_runners,
-                "is_new": row.created_at >= seven_days_ago if row.created_at else False,
-                "elevation_gain_meters": row.elevation_gain_meters or 0,
-                "creator_nickname": row.creator_nickname,
-                "dominion": {
-                    "crew_id": str(row.dominion_crew_id),
-                    "crew_name": row.dominion_crew_name,
-                    "crew_badge_color": row.dominion_crew_badge_color,
-                    "crew_logo_url": row.dominion_crew_logo_url,
-                } if row.dominion_crew_id else None,
-            }
-            for row in rows
-        ]
+        return result.scalar()
 
     async def update_course(
         self,
@@ -807,25 +1062,33 @@ class CourseService:
         course_id: UUID,
         user_id: UUID,
         update_data: dict,
-    ) -> Course:
-        """Update a course (owner only)."""
-        course = await self._get_owned_course(db, course_id, user_id)
+    ) -> sa.Row:
+        """Update a course (owner only) and return its id and title.
 
-        if "title" in update_data and update_data["title"] is not None:
-            course.title = update_data["title"]
-        if "description" in update_data and update_data["description"] is not None:
-            course.description = update_data["description"]
-        if "is_public" in update_data and update_data["is_public"] is not None:
-            course.is_public = update_data["is_public"]
-        if "tags" in update_data and update_data["tags"] is not None:
-            course.tags = update_data["tags"]
-        if "course_type" in update_data and update_data["course_type"] is not None:
-            course.course_type = update_data["course_type"]
-        if "lap_count" in update_data and update_data["lap_count"] is not None:
-            course.lap_count = update_data["lap_count"]
+        The ownership check is folded into the UPDATE's WHERE clause; only
+        when no row matches is a follow-up SELECT issued to pick the error.
+        Only id and title come back, never the route geometry.
+        """
+        values = {
+            field: update_data[field]
+            for field in _UPDATABLE_COURSE_FIELDS
+            if update_data.get(field) is not None
+        }
+        owned = (Course.id == course_id, Course.creator_id == user_id)
+        if values:
+            stmt = (
+                update(Course)
+                .where(*owned)
+                .values(**values)
+                .returning(Course.id, Course.title)
+            )
+        else:
+            stmt = select(Course.id, Course.title).where(*owned)
 
-        await db.flush()
-        return course
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            await self._raise_course_access_error(db, course_id)
+        return row
 
     async def correct_route(
         self,
@@ -852,28 +1115,27 @@ class CourseService:
         # Build the original route as a Shapely LineString
         original_line = to_shape(course.route_geometry)
 
-        # Validate every new point is within the allowed deviation
-        for i, coord in enumerate(new_coordinates):
-            lng, lat = coord[0], coord[1]
-            pt = Point(lng, lat)
-            # project + distance gives the minimum distance from the point to the line
-            # Note: this is in degrees — convert approximately to metres.
-            nearest_dist_deg = original_line.distance(pt)
-            # Rough degree→meter conversion at typical latitudes (~35-37°N Korea)
-            nearest_dist_m = nearest_dist_deg * 111_320 * math.cos(math.radians(lat))
-            if nearest_dist_m > max_deviation_m:
-                raise ValueError(
-                    f"Point {i} deviates {nearest_dist_m:.0f}m from original route "
-                    f"(max allowed: {max_deviation_m:.0f}m)"
-                )
-
-        # Build new geometry
-        new_line = LineString([(c[0], c[1]) for c in new_coordinates])
-        course.route_geometry = from_shape(new_line, srid=4326)
+        # Validate every new point is within the allowed deviation: minimum
+        # distance from each point to the line, for all points in one call.
+        # Note: this is in degrees — convert approximately to metres.
+        new_xy = _coords_xy(new_coordinates)
+        nearest_dist_deg = shapely.distance(original_line, shapely.points(new_xy))
+        # Rough degree→meter conversion at typical latitudes (~35-37°N Korea)
+        nearest_dist_m = nearest_dist_deg * 111_320 * np.cos(np.radians(new_xy[:, 1]))
+        deviating = np.flatnonzero(nearest_dist_m > max_deviation_m)
+        if deviating.size:
+            i = int(deviating[0])
+            raise ValueError(
+                f"Point {i} deviates {nearest_dist_m[i]:.0f}m from original route "
+                f"(max allowed: {max_deviation_m:.0f}m)"
+            )
 
-        # Update start_point
-        first = new_coordinates[0]
-        course.start_point = from_shape(Point(first[0], first[1]), srid=4326)
+        # Build the new route and start point inside PostGIS from the
+        # coordinates, without a Shapely object or WKB round-trip
+        new_line = _geojson_line_geometry(new_coordinates)
+        course.route_geometry = new_line.cast(Geography(geometry_type="LINESTRING", srid=4326))
+        course.route_geojson = _route_geojson(new_coordinates)
+        course.start_point = func.ST_StartPoint(new_line).cast(Geography(geometry_type="POINT", srid=4326))
 
         # Recalculate distance from the new geometry
         total_distance = 0.0
@@ -889,10 +1151,8 @@ class CourseService:
 
         # Clear thumbnail so it gets regenerated
         course.thumbnail_url = None
-
-        # Ensure SQLAlchemy detects WKBElement changes for geography columns
-        flag_modified(course, "route_geometry")
-        flag_modified(course, "start_point")
+        # The corrected route supersedes any pending background map matching
+        course.is_processing = False
 
         await db.flush()
         return course
@@ -903,24 +1163,43 @@ class CourseService:
         course_id: UUID,
         user_id: UUID,
     ) -> None:
-        """Delete a course (owner only)."""
-        course = await self._get_owned_course(db, course_id, user_id)
+        """Delete a course (owner only).
 
-        await db.execute(
+        Detaching run records/sessions and deleting the course run as one
+        statement, all gated on the ownership CTE so a non-owner touches
+        nothing.  course_stats and other dependents go via ON DELETE CASCADE.
+        """
+        owned = (
+            select(Course.id)
+            .where(Course.id == course_id, Course.creator_id == user_id)
+            .cte("owned_course")
+        )
+        detach_runs = (
             update(RunRecord)
-            .where(RunRecord.course_id == course_id)
+            .where(RunRecord.course_id.in_(select(owned.c.id)))
             .values(course_id=None)
+            .cte("detached_runs")
         )
-
         # Clear course_id from run_sessions (SET NULL equivalent at app level)
-        await db.execute(
+        detach_sessions = (
             update(RunSession)
-            .where(RunSession.course_id == course_id)
+            .where(RunSession.course_id.in_(select(owned.c.id)))
             .values(course_id=None)
+            .cte("detached_sessions")
+        )
+        result = await db.execute(
+            delete(Course)
+            .where(Course.id.in_(select(owned.c.id)))
+            .returning(Course.id)
+            .add_cte(detach_runs)
+            .add_cte(detach_sessions)
         )
+        if result.scalar_one_or_none() is None:
+            await self._raise_course_access_error(db, course_id)
 
-        await db.delete(course)
-        await db.flush()
+    async def refresh_public_courses_view(self, db: AsyncSession) -> None:
+        """Refresh mv_public_courses without blocking concurrent list_courses reads."""
+        await db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_public_courses"))
 
     async def get_course_stats(
         self,
@@ -989,6 +1268,91 @@ class CourseService:
         else:
             return "hard"
 
+    @staticmethod
+    def _compute_difficulty_batch(
+        distance_meters: list[int],
+        elevation_gain_meters: list[int],
+        completion_rates: list[float],
+    ) -> list[str]:
+        """Vectorized _compute_difficulty over many courses at once.
+
+        Same formula and thresholds; a NaN completion rate means no data yet.
+        """
+        dist = np.asarray(distance_meters, dtype=float)
+        elev = np.asarray(elevation_gain_meters, dtype=float)
+        comp = np.asarray(completion_rates, dtype=float)
+
+        dist_score = np.minimum(dist / 10000 * 100, 100)
+        elev_score = np.minimum(elev / 300 * 100, 100)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gradient_per_km = np.where(dist > 0, (elev / dist) * 1000, 0.0)
+        grad_score = np.minimum(gradient_per_km / 60 * 100, 100)
+        comp_score = np.where(np.isnan(comp), 50.0, (1.0 - comp) * 100)
+
+        total = (
+            dist_score * 0.3
+            + elev_score * 0.3
+            + grad_score * 0.2
+            + comp_score * 0.2
+        )
+        return _DIFFICULTY_LABELS[np.searchsorted([33, 66], total, side="right")].tolist()
+
+    async def recalculate_difficulty_all(self, db: AsyncSession) -> int:
+        """Recalculate difficulty for every course in one pass.
+
+        One SELECT of the scoring inputs, one vectorized scoring pass and a
+        bulk UPDATE for the courses whose difficulty changed.
+        Returns the number of courses updated.
+        """
+        result = await db.execute(
+            select(
+                Course.id,
+                Course.distance_meters,
+                Course.elevation_gain_meters,
+                Course.difficulty,
+                CourseStats.completion_rate,
+            ).outerjoin(CourseStats, CourseStats.course_id == Course.id)
+        )
+        rows = result.all()
+        if not rows:
+            return 0
+
+        difficulties = self._compute_difficulty_batch(
+            [row.distance_meters for row in rows],
+            [row.elevation_gain_meters or 0 for row in rows],
+            [np.nan if row.completion_rate is None else row.completion_rate for row in rows],
+        )
+        changed = [
+            (row.id, difficulty)
+            for row, difficulty in zip(rows, difficulties)
+            if row.difficulty != difficulty
+        ]
+        await self.recalculate_difficulty_bulk(db, changed)
+        return len(changed)
+
+    async def recalculate_difficulty_bulk(
+        self,
+        db: AsyncSession,
+        pairs: list[tuple[UUID, str]],
+    ) -> None:
+        """Write many (course_id, difficulty) pairs with UPDATE ... FROM (VALUES ...).
+
+        One statement per chunk instead of one per course; chunks keep the
+        bind parameter count under asyncpg's 32767 limit.
+        """
+        courses = Course.__table__
+        for start in range(0, len(pairs), self.BULK_UPDATE_CHUNK_SIZE):
+            new_values = sa.values(
+                sa.column("id", sa.Uuid),
+                sa.column("difficulty", sa.String),
+                name="new_values",
+            ).data(pairs[start:start + self.BULK_UPDATE_CHUNK_SIZE])
+            await db.execute(
+                sa.update(courses)
+                .where(courses.c.id == new_values.c.id)
+                .values(difficulty=new_values.c.difficulty)
+            )
+
     async def recalculate_difficulty(
         self,
         db: AsyncSession,
@@ -1041,3 +1405,34 @@ class CourseService:
             )
 
         return course
+
+    async def _store_thumbnail_urls(self, db: AsyncSession, urls: dict) -> None:
+        """Persist generated thumbnail URLs for courses that had none.
+
+        Issued as one executemany; rows that gained a thumbnail in the
+        meantime are left untouched.
+        """
+        if not urls:
+            return
+        courses = Course.__table__
+        await db.execute(
+            sa.update(courses)
+            .where(
+                courses.c.id == sa.bindparam("course_id"),
+                courses.c.thumbnail_url.is_(None),
+            )
+            .values(thumbnail_url=sa.bindparam("url")),
+            [{"course_id": course_id, "url": url} for course_id, url in urls.items()],
+        )
+
+    async def _raise_course_access_error(self, db: AsyncSession, course_id: UUID) -> None:
+        """Raise the right error after an owner-scoped write matched no row."""
+        result = await db.execute(
+            select(sa.exists().where(Course.id == course_id))
+        )
+        if not result.scalar():
+            raise NotFoundError(code="NOT_FOUND", message="Course not found")
+        raise PermissionDeniedError(
+            code="PERMISSION_DENIED",
+            message="You are not the owner of this course",
+        )
@@ -1,12 +1,17 @@
 """Event service: manage events, participation, and map markers."""
 
+import math
 from datetime import datetime, timezone
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import and_, func, select
+import sqlalchemy as sa
+from sqlalchemy import and_, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased, joinedload, raiseload
 
+from app.core.cache import cache_get, cache_set, make_cache_key
 from app.core.exceptions import ConflictError, NotFoundError, ValidationError
 from app.models.event import Event, EventParticipant
 from app.models.user import User
@@ -15,6 +20,13 @@ from app.models.user import User
 class EventService:
     """Handles event CRUD, participation, and map marker queries."""
 
+    CACHE_NAMESPACE = "events"
+    CACHE_TTL_SECONDS = 45
+    # Map viewports are widened outward to this grid (degrees) so nearby
+    # pans share a cache entry.
+    MARKER_GRID_DEGREES = 0.01
+    BULK_UPDATE_CHUNK_SIZE = 5000
+
     async def get_active_events(
         self,
         db: AsyncSession,
@@ -22,12 +34,34 @@ class EventService:
         per_page: int = 20,
         current_user_id: UUID | None = None,
         event_type: str | None = None,
-    ) -> tuple[list[dict], int]:
+        include_total: bool = True,
+    ) -> tuple[list[dict], int | None, bool]:
         """Get paginated list of active events.
 
+        With include_total=False the count(*) OVER () column is dropped, so
+        Postgres can stop once the page is filled (infinite-scroll clients).
+
+        The page itself is shared by all users and cached for
+        CACHE_TTL_SECONDS; on a hit the caller's participation is overlaid
+        with one lookup against the cached event IDs.
+
         Returns:
-            Tuple of (event dicts with participant_count and is_participating, total count).
+            Tuple of (event dicts with participant_count and is_participating,
+            total count or None when not requested, has_more).
         """
+        cache_key = await make_cache_key(self.CACHE_NAMESPACE, {
+            "op": "active",
+            "page": page,
+            "per_page": per_page,
+            "event_type": event_type,
+            "include_total": include_total,
+        })
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            events, total_count, has_more = cached
+            await self._overlay_viewer(db, events, current_user_id)
+            return events, total_count, has_more
+
         now = datetime.now(timezone.utc)
 
         # Base filters
@@ -35,27 +69,34 @@ class EventService:
         if event_type:
             base_filters.append(Event.event_type == event_type)
 
-        # Count active events
-        count_result = await db.execute(
-            select(func.count(Event.id)).where(*base_filters)
-        )
-        total_count = count_result.scalar_one()
+        # The caller's participation row and the total come back with the
+        # page itself (one round trip).
+        stmt = self._select_events_for_viewer(current_user_id)
+        if include_total:
+            stmt = stmt.add_columns(func.count().over().label("total_count"))
 
-        # Fetch events
+        # Fetch one extra to determine has_more
         result = await db.execute(
-            select(Event)
+            stmt
             .where(*base_filters)
             .order_by(Event.starts_at.asc())
             .offset(page * per_page)
-            .limit(per_page)
+            .limit(per_page + 1)
         )
-        events = result.scalars().all()
-
-        # Batch-load participant counts and participation status
-        event_ids = [e.id for e in events]
-        enriched = await self._enrich_events(db, events, event_ids, current_user_id)
-
-        return enriched, total_count
+        rows = result.all()
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        total_count = None
+        if include_total:
+            total_count = rows[0].total_count if rows else 0
+
+        enriched = [self._viewer_row_to_dict(row) for row in rows]
+
+        shared = [self._without_viewer(e) for e in enriched]
+        await cache_set(
+            cache_key, [shared, total_count, has_more], self.CACHE_TTL_SECONDS
+        )
+        return enriched, total_count, has_more
 
     async def get_event_by_id(
         self,
@@ -65,23 +106,38 @@ class EventService:
     ) -> dict:
         """Get a single event by ID with participant info.
 
+        Cached like the listing pages, with the caller's participation
+        overlaid on a hit.
+
         Raises:
             NotFoundError: Event does not exist.
         """
+        cache_key = await make_cache_key(self.CACHE_NAMESPACE, {
+            "op": "detail",
+            "event_id": str(event_id),
+        })
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            await self._overlay_viewer(db, [cached], current_user_id)
+            return cached
+
         result = await db.execute(
-            select(Event).where(Event.id == event_id)
+            self._select_events_for_viewer(current_user_id).where(
+                Event.id == event_id
+            )
         )
-        event = result.scalar_one_or_none()
+        row = result.one_or_none()
 
-        if event is None:
+        if row is None:
             raise NotFoundError(
                 code="NOT_FOUND", message="이벤트를 찾을 수 없습니다"
             )
 
-        enriched = await self._enrich_events(
-            db, [event], [event.id], current_user_id
+        event = self._viewer_row_to_dict(row)
+        await cache_set(
+            cache_key, self._without_viewer(event), self.CACHE_TTL_SECONDS
         )
-        return enriched[0]
+        return event
 
     async def join_event(
         self,
@@ -91,66 +147,101 @@ class EventService:
     ) -> EventParticipant:
         """Join an event.
 
+        Claiming a seat, recording the participant, and (for crews) setting
+        the user's crew_name happen in one statement: a data-modifying CTE
+        bumps events.participant_count only while the event is open, has
+        room, and the user has not joined, and the participant row is
+        inserted from that CTE's result. The UPDATE's row lock serializes
+        concurrent joins, so the capacity check cannot be raced. When no
+        row comes back, one diagnostic query picks the error to raise.
+
         Raises:
             NotFoundError: Event does not exist.
             ValidationError: Event is not active or has ended.
             ConflictError: Already participating or max participants reached.
         """
-        result = await db.execute(
-            select(Event).where(Event.id == event_id)
-        )
-        event = result.scalar_one_or_none()
-
-        if event is None:
-            raise NotFoundError(
-                code="NOT_FOUND", message="이벤트를 찾을 수 없습니다"
-            )
-
         now = datetime.now(timezone.utc)
-        if not event.is_active or event.ends_at <= now:
-            raise ValidationError(
-                code="EVENT_ENDED", message="종료되었거나 비활성화된 이벤트입니다"
+        already_joined = (
+            select(EventParticipant.id)
+            .where(
+                EventParticipant.event_id == Event.id,
+                EventParticipant.user_id == user_id,
             )
+            .exists()
+        )
 
-        # Check for duplicate participation
-        existing = await db.execute(
-            select(EventParticipant.id).where(
-                EventParticipant.event_id == event_id,
-                EventParticipant.user_id == user_id,
+        seat = (
+            update(Event)
+            .where(
+                Event.id == event_id,
+                Event.is_active,
+                Event.ends_at > now,
+                or_(
+                    Event.max_participants.is_(None),
+                    Event.participant_count < Event.max_participants,
+                ),
+                ~already_joined,
+            )
+            .values(participant_count=Event.participant_count + 1)
+            .returning(Event.id, Event.title, Event.event_type)
+            .cte("seat")
+        )
+        # Update user's crew_name when joining a crew
+        crew_name = (
+            update(User)
+            .where(User.id == user_id, seat.c.event_type == "crew")
+            .values(crew_name=seat.c.title)
+            .cte("crew_name")
+        )
+        stmt = (
+            pg_insert(EventParticipant)
+            .from_select(
+                ["id", "event_id", "user_id"],
+                select(
+                    literal(uuid4(), EventParticipant.id.type),
+                    seat.c.id,
+                    literal(user_id, EventParticipant.user_id.type),
+                ),
             )
+            .returning(EventParticipant)
+            .add_cte(seat)
+            .add_cte(crew_name)
         )
-        if existing.scalar_one_or_none() is not None:
+        try:
+            result = await db.execute(stmt)
+        except IntegrityError:
+            # A concurrent join by the same user committed first; the whole
+            # statement (including the counter bump) was rolled back.
+            await db.rollback()
             raise ConflictError(
                 code="ALREADY_JOINED", message="이미 참여중인 이벤트입니다"
             )
+        participant = result.scalar_one_or_none()
 
-        # Check max participants
-        if event.max_participants is not None:
-            count_result = await db.execute(
-                select(func.count(EventParticipant.id)).where(
-                    EventParticipant.event_id == event_id
-                )
+        if participant is None:
+            result = await db.execute(
+                select(
+                    Event.is_active,
+                    Event.ends_at,
+                    already_joined.label("already_joined"),
+                ).where(Event.id == event_id)
             )
-            current_count = count_result.scalar_one()
-            if current_count >= event.max_participants:
+            row = result.one_or_none()
+            if row is None:
+                raise NotFoundError(
+                    code="NOT_FOUND", message="이벤트를 찾을 수 없습니다"
+                )
+            if not row.is_active or row.ends_at <= now:
+                raise ValidationError(
+                    code="EVENT_ENDED", message="종료되었거나 비활성화된 이벤트입니다"
+                )
+            if row.already_joined:
                 raise ConflictError(
-                    code="EVENT_FULL", message="참여 인원이 가득 찼습니다"
+                    code="ALREADY_JOINED", message="이미 참여중인 이벤트입니다"
                 )
-
-        participant = EventParticipant(event_id=event_id, user_id=user_id)
-        db.add(participant)
-
-        # Update user's crew_name when joining a crew
-        if event.event_type == "crew":
-            user_result = await db.execute(
-                select(User).where(User.id == user_id)
+            raise ConflictError(
+                code="EVENT_FULL", message="참여 인원이 가득 찼습니다"
             )
-            user = user_result.scalar_one_or_none()
-            if user is not None:
-                user.crew_name = event.title
-
-        await db.flush()
-        await db.refresh(participant)
 
         return participant
 
@@ -183,6 +274,8 @@ class EventService:
             select(Event).where(Event.id == event_id)
         )
         event = event_result.scalar_one_or_none()
+        if event is not None:
+            event.participant_count = func.greatest(Event.participant_count - 1, 0)
         if event is not None and event.event_type == "crew":
             user_result = await db.execute(
                 select(User).where(User.id == user_id)
@@ -194,6 +287,29 @@ class EventService:
         await db.delete(participant)
         await db.flush()
 
+    async def release_user_seats(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+    ) -> None:
+        """Give back the seats a user holds in every event they joined.
+
+        Account deletion removes event_participants rows through the
+        ON DELETE CASCADE on user_id, which bypasses leave_event; call this
+        before deleting the user so participant_count stays in step.
+        """
+        await db.execute(
+            update(Event)
+            .where(
+                Event.id.in_(
+                    select(EventParticipant.event_id).where(
+                        EventParticipant.user_id == user_id
+                    )
+                )
+            )
+            .values(participant_count=func.greatest(Event.participant_count - 1, 0))
+        )
+
     async def create_event(
         self,
         db: AsyncSession,
@@ -229,8 +345,8 @@ class EventService:
             badge_icon=data.get("badge_icon", "trophy"),
         )
         db.add(event)
+        # Server defaults (timestamps, counters) come back via INSERT ... RETURNING
         await db.flush()
-        await db.refresh(event)
         return event
 
     async def get_event_map_markers(
@@ -244,44 +360,64 @@ class EventService:
         """Get active event markers within a map viewport bounding box.
 
         Only returns events that have center_lat/center_lng set and
-        are currently active (not ended).
+        are currently active (not ended). The box is widened outward to
+        MARKER_GRID_DEGREES and the result cached for CACHE_TTL_SECONDS.
         """
+        grid = self.MARKER_GRID_DEGREES
+        sw_lat = round(math.floor(sw_lat / grid) * grid, 6)
+        sw_lng = round(math.floor(sw_lng / grid) * grid, 6)
+        ne_lat = round(math.ceil(ne_lat / grid) * grid, 6)
+        ne_lng = round(math.ceil(ne_lng / grid) * grid, 6)
+
+        cache_key = await make_cache_key(self.CACHE_NAMESPACE, {
+            "op": "markers",
+            "bounds": [sw_lat, sw_lng, ne_lat, ne_lng],
+        })
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         now = datetime.now(timezone.utc)
 
+        # Bounding-box overlap (&&) on the generated center_point uses the
+        # partial GiST index; the bare is_active test matches its predicate.
+        envelope = func.ST_MakeEnvelope(sw_lng, sw_lat, ne_lng, ne_lat, 4326)
         result = await db.execute(
-            select(Event)
+            select(
+                Event.id,
+                Event.title,
+                Event.event_type,
+                Event.badge_color,
+                Event.badge_icon,
+                Event.center_lat,
+                Event.center_lng,
+                Event.ends_at,
+                Event.participant_count,
+            )
             .where(
-                Event.is_active.is_(True),
+                Event.is_active,
                 Event.ends_at > now,
-                Event.center_lat.isnot(None),
-                Event.center_lng.isnot(None),
-                Event.center_lat >= sw_lat,
-                Event.center_lat <= ne_lat,
-                Event.center_lng >= sw_lng,
-                Event.center_lng <= ne_lng,
+                Event.center_point.intersects(envelope),
             )
             .order_by(Event.ends_at.asc())
         )
-        events = result.scalars().all()
-
-        # Batch-load participant counts
-        event_ids = [e.id for e in events]
-        counts = await self._get_participant_counts(db, event_ids)
 
-        return [
+        markers = [
             {
-                "id": str(e.id),
-                "title": e.title,
-                "event_type": e.event_type,
-                "badge_color": e.badge_color,
-                "badge_icon": e.badge_icon,
-                "center_lat": e.center_lat,
-                "center_lng": e.center_lng,
-                "participant_count": counts.get(e.id, 0),
-                "ends_at": e.ends_at,
+                "id": str(row.id),
+                "title": row.title,
+                "event_type": row.event_type,
+                "badge_color": row.badge_color,
+                "badge_icon": row.badge_icon,
+                "center_lat": row.center_lat,
+                "center_lng": row.center_lng,
+                "participant_count": row.participant_count,
+                "ends_at": row.ends_at,
             }
-            for e in events
+            for row in result.all()
         ]
+        await cache_set(cache_key, markers, self.CACHE_TTL_SECONDS)
+        return markers
 
     async def update_participant_progress(
         self,
@@ -297,38 +433,82 @@ class EventService:
             NotFoundError: Participation record does not exist.
         """
         result = await db.execute(
-            select(EventParticipant).where(
+            select(
+                EventParticipant,
+                Event.target_distance_meters,
+                Event.target_runs,
+            )
+            .join(Event, Event.id == EventParticipant.event_id)
+            .where(
                 EventParticipant.event_id == event_id,
                 EventParticipant.user_id == user_id,
             )
+            .options(raiseload("*"))
         )
-        participant = result.scalar_one_or_none()
+        row = result.one_or_none()
 
-        if participant is None:
+        if row is None:
             raise NotFoundError(
                 code="NOT_FOUND", message="참여 기록을 찾을 수 없습니다"
             )
+        participant, target_distance, target_runs = row
 
         participant.progress_distance_meters = distance
         participant.progress_runs = runs
 
-        # Check event to see if target goals are met
-        event_result = await db.execute(
-            select(Event).where(Event.id == event_id)
-        )
-        event = event_result.scalar_one_or_none()
-        if event is not None:
-            distance_met = (
-                event.target_distance_meters is None
-                or distance >= event.target_distance_meters
-            )
-            runs_met = (
-                event.target_runs is None or runs >= event.target_runs
-            )
-            participant.completed = distance_met and runs_met
+        # Check the event's target goals
+        distance_met = target_distance is None or distance >= target_distance
+        runs_met = target_runs is None or runs >= target_runs
+        participant.completed = distance_met and runs_met
 
         await db.flush()
 
+    async def bulk_update_participant_progress(
+        self,
+        db: AsyncSession,
+        updates: list[tuple[UUID, UUID, int, int]],
+    ) -> None:
+        """Apply many (event_id, user_id, distance, runs) progress updates.
+
+        Batch form of update_participant_progress: one
+        UPDATE ... FROM (VALUES ...) per chunk, with ``completed`` derived
+        from the event's targets in SQL. Pairs with no participation row are
+        skipped; each (event_id, user_id) should appear once. Chunks keep the
+        bind parameter count under asyncpg's limit.
+        """
+        participants = EventParticipant.__table__
+        events = Event.__table__
+        for start in range(0, len(updates), self.BULK_UPDATE_CHUNK_SIZE):
+            new_values = sa.values(
+                sa.column("event_id", sa.Uuid),
+                sa.column("user_id", sa.Uuid),
+                sa.column("distance", sa.Integer),
+                sa.column("runs", sa.Integer),
+                name="new_values",
+            ).data(updates[start:start + self.BULK_UPDATE_CHUNK_SIZE])
+            await db.execute(
+                sa.update(participants)
+                .where(
+                    participants.c.event_id == new_values.c.event_id,
+                    participants.c.user_id == new_values.c.user_id,
+                    events.c.id == participants.c.event_id,
+                )
+                .values(
+                    progress_distance_meters=new_values.c.distance,
+                    progress_runs=new_values.c.runs,
+                    completed=and_(
+                        or_(
+                            events.c.target_distance_meters.is_(None),
+                            new_values.c.distance >= events.c.target_distance_meters,
+                        ),
+                        or_(
+                            events.c.target_runs.is_(None),
+                            new_values.c.runs >= events.c.target_runs,
+                        ),
+                    ),
+                )
+            )
+
     async def get_event_participants(
         self,
         db: AsyncSession,
@@ -362,6 +542,7 @@ class EventService:
         # Fetch participants with joined user
         result = await db.execute(
             select(EventParticipant)
+            .options(joinedload(EventParticipant.user).raiseload("*"))
             .where(EventParticipant.event_id == event_id)
             .order_by(EventParticipant.joined_at.asc())
         )
@@ -384,43 +565,6 @@ class EventService:
     # Private helpers
     # ------------------------------------------------------------------
 
-    async def _get_participant_counts(
-        self,
-        db: AsyncSession,
-        event_ids: list[UUID],
-    ) -> dict[UUID, int]:
-        """Get participant counts for a list of event IDs."""
-        if not event_ids:
-            return {}
-
-        result = await db.execute(
-            select(
-                EventParticipant.event_id,
-                func.count(EventParticipant.id),
-            )
-            .where(EventParticipant.event_id.in_(event_ids))
-            .group_by(EventParticipant.event_id)
-        )
-        return {row[0]: row[1] for row in result.all()}
-
-    async def _get_user_participations(
-        self,
-        db: AsyncSession,
-        event_ids: list[UUID],
-        user_id: UUID | None,
-    ) -> set[UUID]:
-        """Get the set of event IDs that a user is participating in."""
-        if not event_ids or user_id is None:
-            return set()
-
-        result = await db.execute(
-            select(EventParticipant.event_id).where(
-                EventParticipant.event_id.in_(event_ids),
-                EventParticipant.user_id == user_id,
-            )
-        )
-        return {row[0] for row in result.all()}
-
     async def _get_user_progress(
         self,
         db: AsyncSession,
@@ -450,56 +594,110 @@ class EventService:
             for row in result.all()
         }
 
-    async def _enrich_events(
+    async def _overlay_viewer(
         self,
         db: AsyncSession,
-        events: list,
-        event_ids: list[UUID],
-        current_user_id: UUID | None,
-    ) -> list[dict]:
-        """Enrich Event ORM objects with participant_count, is_participating, and progress."""
-        counts = await self._get_participant_counts(db, event_ids)
-        participating = await self._get_user_participations(
-            db, event_ids, current_user_id
-        )
+        events: list[dict],
+        user_id: UUID | None,
+    ) -> None:
+        """Fill the caller's participation fields into cached event dicts."""
         progress = await self._get_user_progress(
-            db, event_ids, current_user_id
+            db, [UUID(e["id"]) for e in events], user_id
         )
-
-        enriched = []
         for e in events:
-            user_progress = progress.get(e.id)
-            enriched.append(
-                {
-                    "id": str(e.id),
-                    "title": e.title,
-                    "description": e.description,
-                    "event_type": e.event_type,
-                    "course_id": str(e.course_id) if e.course_id else None,
-                    "starts_at": e.starts_at,
-                    "ends_at": e.ends_at,
-                    "target_distance_meters": e.target_distance_meters,
-                    "target_runs": e.target_runs,
-                    "badge_color": e.badge_color,
-                    "badge_icon": e.badge_icon,
-                    "participant_count": counts.get(e.id, 0),
-                    "is_participating": e.id in participating,
-                    "is_active": e.is_active,
-                    "center_lat": e.center_lat,
-                    "center_lng": e.center_lng,
-                    "recurring_schedule": e.recurring_schedule,
-                    "meeting_point": e.meeting_point,
-                    "creator_nickname": (
-                        e.creator.nickname if e.creator else None
-                    ),
-                    "my_progress_distance_meters": (
-                        user_progress["distance_meters"]
-                        if user_progress
-                        else None
-                    ),
-                    "my_progress_runs": (
-                        user_progress["runs"] if user_progress else None
-                    ),
-                }
+            user_progress = progress.get(UUID(e["id"]))
+            e["is_participating"] = user_progress is not None
+            e["my_progress_distance_meters"] = (
+                user_progress["distance_meters"] if user_progress else None
+            )
+            e["my_progress_runs"] = (
+                user_progress["runs"] if user_progress else None
             )
-        return enriched
+
+    @staticmethod
+    def _without_viewer(event: dict) -> dict:
+        """Copy of an event dict with the caller-specific fields reset, for caching."""
+        return {
+            **event,
+            "is_participating": False,
+            "my_progress_distance_meters": None,
+            "my_progress_runs": None,
+        }
+
+    def _select_events_for_viewer(self, current_user_id: UUID | None):
+        """SELECT of Event with the viewer's own participant row
+        (LEFT JOIN on the event_id/user_id unique pair).
+
+        Only the creator is serialized, so it is the only relationship
+        loaded; anything else raises instead of lazy-loading per row.
+        """
+        mine = aliased(EventParticipant)
+        return (
+            select(
+                Event,
+                mine.id.label("my_participant_id"),
+                mine.progress_distance_meters.label("my_distance_meters"),
+                mine.progress_runs.label("my_runs"),
+            )
+            .outerjoin(
+                mine,
+                and_(
+                    mine.event_id == Event.id,
+                    mine.user_id == current_user_id,
+                ),
+            )
+            .options(
+                joinedload(Event.creator).raiseload("*"),
+                raiseload("*"),
+            )
+        )
+
+    def _viewer_row_to_dict(self, row) -> dict:
+        """Serialize a row from _select_events_for_viewer."""
+        joined = row.my_participant_id is not None
+        return self._event_to_dict(
+            row.Event,
+            is_participating=joined,
+            my_progress=(
+                {"distance_meters": row.my_distance_meters, "runs": row.my_runs}
+                if joined
+                else None
+            ),
+        )
+
+    @staticmethod
+    def _event_to_dict(
+        e: Event,
+        is_participating: bool,
+        my_progress: dict | None,
+    ) -> dict:
+        """Serialize an Event with its participant info for the API."""
+        return {
+            "id": str(e.id),
+            "title": e.title,
+            "description": e.description,
+            "event_type": e.event_type,
+            "course_id": str(e.course_id) if e.course_id else None,
+            "starts_at": e.starts_at,
+            "ends_at": e.ends_at,
+            "target_distance_meters": e.target_distance_meters,
+            "target_runs": e.target_runs,
+            "badge_color": e.badge_color,
+            "badge_icon": e.badge_icon,
+            "participant_count": e.participant_count,
+            "is_participating": is_participating,
+            "is_active": e.is_active,
+            "center_lat": e.center_lat,
+            "center_lng": e.center_lng,
+            "recurring_schedule": e.recurring_schedule,
+            "meeting_point": e.meeting_point,
+            "creator_nickname": (
+                e.creator.nickname if e.creator else None
+            ),
+            "my_progress_distance_meters": (
+                my_progress["distance_meters"] if my_progress else None
+            ),
+            "my_progress_runs": (
+                my_progress["runs"] if my_progress else None
+            ),
+        }
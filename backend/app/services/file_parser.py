@@ -1,16 +1,25 @@
 """File parser service: GPX and FIT file parsing into normalized run data."""
 
+import io
 import math
+import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
 from datetime import datetime
+from os import PathLike
+from pathlib import Path
 from typing import Sequence
 
 import gpxpy
 import gpxpy.gpx
+import numpy as np
 from fitparse import FitFile
+from gpxpy.gpxfield import parse_time
 
+# Raw upload bytes, or a path so large files are read incrementally
+FileSource = bytes | str | PathLike
 
-@dataclass
+
+@dataclass(slots=True)
 class TrackPoint:
     """A single GPS track point."""
     lat: float
@@ -21,7 +30,7 @@ class TrackPoint:
     heart_rate: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedSplit:
     """Per-km split data."""
     split_number: int
@@ -31,10 +40,17 @@ class ParsedSplit:
     elevation_change_meters: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedActivity:
-    """Normalized activity data from any file format."""
+    """Normalized activity data from any file format.
+
+    lats/lngs/alts hold the same track as ``points`` in column form, for
+    vectorized math over the whole activity.
+    """
     points: list[TrackPoint] = field(default_factory=list)
+    lats: np.ndarray = field(default_factory=lambda: np.empty(0), repr=False, compare=False)
+    lngs: np.ndarray = field(default_factory=lambda: np.empty(0), repr=False, compare=False)
+    alts: np.ndarray = field(default_factory=lambda: np.empty(0), repr=False, compare=False)
     distance_meters: int = 0
     duration_seconds: int = 0
     total_elapsed_seconds: int = 0
@@ -56,6 +72,9 @@ class ParsedActivity:
 # Earth radius in meters
 EARTH_RADIUS = 6371000.0
 
+# Decimal places kept in the stored elevation profile (0.1 m)
+ELEVATION_PROFILE_DECIMALS = 1
+
 # Elevation noise threshold (meters) - ignore changes smaller than this
 ELEVATION_THRESHOLD = 2.0
 
@@ -69,78 +88,113 @@ def _haversine(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     return EARTH_RADIUS * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
 
-def _calculate_elevation(points: Sequence[TrackPoint]) -> tuple[int, int]:
+def _track_arrays(points: Sequence[TrackPoint]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split trackpoints into contiguous (lats, lngs, alts) float64 arrays."""
+    n = len(points)
+    lats = np.fromiter((p.lat for p in points), dtype=np.float64, count=n)
+    lngs = np.fromiter((p.lng for p in points), dtype=np.float64, count=n)
+    alts = np.fromiter((p.alt or 0.0 for p in points), dtype=np.float64, count=n)
+    return lats, lngs, alts
+
+
+def _cumulative_haversine(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Cumulative haversine distance in meters along lat/lng arrays (0 at the first)."""
+    lat = np.radians(lats)
+    lng = np.radians(lngs)
+    dlat = np.diff(lat)
+    dlng = np.diff(lng)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlng / 2) ** 2
+    segments = EARTH_RADIUS * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return np.concatenate(([0.0], np.cumsum(segments)))
+
+
+def _cumulative_distances(points: Sequence[TrackPoint]) -> np.ndarray:
+    """Cumulative haversine distance in meters at each trackpoint (0 at the first).
+
+    Vectorized form of summing _haversine over consecutive points.
+    """
+    lats, lngs, _ = _track_arrays(points)
+    return _cumulative_haversine(lats, lngs)
+
+
+def _calculate_elevation(alts: np.ndarray) -> tuple[int, int]:
     """Calculate total elevation gain and loss with noise filtering.
 
     Uses a threshold to ignore small altitude fluctuations caused by GPS noise.
     Only updates the reference altitude when the change exceeds the threshold,
-    preventing accumulation of sensor jitter.
+    preventing accumulation of sensor jitter. Zero altitudes mark missing
+    data and are dropped up front; the hysteresis itself is sequential.
     """
     gain = 0.0
     loss = 0.0
     prev_alt = None
 
-    for pt in points:
-        if pt.alt is None or pt.alt == 0.0:
-            continue
+    for alt in alts[alts != 0.0].tolist():
         if prev_alt is not None:
-            diff = pt.alt - prev_alt
+            diff = alt - prev_alt
             if abs(diff) >= ELEVATION_THRESHOLD:
                 if diff > 0:
                     gain += diff
                 else:
                     loss += abs(diff)
-                prev_alt = pt.alt
+                prev_alt = alt
         else:
-            prev_alt = pt.alt
+            prev_alt = alt
 
     return int(gain), int(loss)
 
 
-def _build_splits(points: list[TrackPoint]) -> list[ParsedSplit]:
+def _build_splits(
+    points: list[TrackPoint],
+    cumulative: np.ndarray | None = None,
+) -> list[ParsedSplit]:
     """Calculate per-km splits from ordered trackpoints.
 
-    Walks through consecutive points, accumulating haversine distance.
-    Each time cumulative distance crosses a 1 km boundary a split is emitted
-    with the elapsed time and elevation delta for that segment.
+    Walks the cumulative haversine distance; each time it advances 1 km past
+    the previous split's end point a split is emitted with the elapsed time
+    and elevation delta for that segment. Split ends are located with a
+    binary search, so the Python loop runs once per split, not per point.
     """
     if len(points) < 2:
         return []
 
+    if cumulative is None:
+        cumulative = _cumulative_distances(points)
+
     splits: list[ParsedSplit] = []
     split_number = 1
     split_start_idx = 0
-    cumulative_distance = 0.0
-    split_start_distance = 0.0
-
-    for i in range(1, len(points)):
-        d = _haversine(
-            points[i - 1].lat, points[i - 1].lng,
-            points[i].lat, points[i].lng,
-        )
-        cumulative_distance += d
-
-        if cumulative_distance - split_start_distance >= 1000.0:
-            split_start_time = points[split_start_idx].timestamp
-            split_end_time = points[i].timestamp
-
-            if split_start_time and split_end_time:
-                duration = int((split_end_time - split_start_time).total_seconds())
-                pace = duration  # seconds per km (since split is ~1km)
-
-                elev_change = (points[i].alt or 0.0) - (points[split_start_idx].alt or 0.0)
-
-                splits.append(ParsedSplit(
-                    split_number=split_number,
-                    distance_meters=cumulative_distance - split_start_distance,
-                    duration_seconds=duration,
-                    pace_seconds_per_km=pace,
-                    elevation_change_meters=round(elev_change, 1),
-                ))
-
-            split_number += 1
-            split_start_idx = i
-            split_start_distance = cumulative_distance
+
+    while True:
+        split_start_distance = cumulative[split_start_idx]
+        i = int(np.searchsorted(cumulative, split_start_distance + 1000.0))
+        # Settle float ties against the exact per-point comparison
+        while i < len(points) and cumulative[i] - split_start_distance < 1000.0:
+            i += 1
+        while i - 1 > split_start_idx and cumulative[i - 1] - split_start_distance >= 1000.0:
+            i -= 1
+        if i >= len(points):
+            break
+
+        split_start_time = points[split_start_idx].timestamp
+        split_end_time = points[i].timestamp
+
+        if split_start_time and split_end_time:
+            duration = int((split_end_time - split_start_time).total_seconds())
+            pace = duration  # seconds per km (since split is ~1km)
+
+            elev_change = (points[i].alt or 0.0) - (points[split_start_idx].alt or 0.0)
+
+            splits.append(ParsedSplit(
+                split_number=split_number,
+                distance_meters=float(cumulative[i] - split_start_distance),
+                duration_seconds=duration,
+                pace_seconds_per_km=pace,
+                elevation_change_meters=round(elev_change, 1),
+            ))
+
+        split_number += 1
+        split_start_idx = i
 
     return splits
 
@@ -157,19 +211,14 @@ def build_activity(
     This is a module-level function so it can be reused by other services
     (e.g. StravaService) without instantiating FileParserService.
     """
-    # Calculate total distance
-    total_distance = 0.0
-    max_speed = 0.0
+    # Column arrays are built once and shared by all the math below
+    lats, lngs, alts = _track_arrays(points)
 
-    for i in range(1, len(points)):
-        d = _haversine(
-            points[i - 1].lat, points[i - 1].lng,
-            points[i].lat, points[i].lng,
-        )
-        total_distance += d
+    # Calculate total distance
+    cumulative = _cumulative_haversine(lats, lngs)
+    total_distance = float(cumulative[-1])
 
-        if points[i].speed and points[i].speed > max_speed:
-            max_speed = points[i].speed
+    max_speed = max((pt.speed for pt in points[1:] if pt.speed), default=0.0)
 
     # Calculate duration
     started_at = points[0].timestamp
@@ -188,10 +237,10 @@ def build_activity(
         avg_speed = total_distance / duration_seconds
 
     # Calculate elevation
-    elevation_gain, elevation_loss = _calculate_elevation(points)
+    elevation_gain, elevation_loss = _calculate_elevation(alts)
 
     # Build splits
-    splits = _build_splits(points)
+    splits = _build_splits(points, cumulative)
 
     # Best pace from splits
     best_pace = None
@@ -199,16 +248,18 @@ def build_activity(
         best_pace = min(s.pace_seconds_per_km for s in splits)
 
     # Build route coordinates (GeoJSON format: [lng, lat, alt])
-    route_coordinates = [
-        [pt.lng, pt.lat, pt.alt]
-        for pt in points
-    ]
+    route_coordinates = np.column_stack((lngs, lats, alts)).tolist()
 
-    # Elevation profile (exclude zero-altitude points that indicate missing data)
-    elevation_profile = [pt.alt for pt in points if pt.alt != 0.0]
+    # Elevation profile (exclude zero-altitude points that indicate missing data).
+    # Decimeter precision is below GPS/barometer noise and keeps the stored
+    # JSONB to short literals instead of 17-digit floats.
+    elevation_profile = np.round(alts[alts != 0.0], ELEVATION_PROFILE_DECIMALS).tolist()
 
     return ParsedActivity(
         points=points,
+        lats=lats,
+        lngs=lngs,
+        alts=alts,
         distance_meters=int(total_distance),
         duration_seconds=duration_seconds,
         total_elapsed_seconds=duration_seconds,
@@ -231,15 +282,65 @@ class FileParserService:
     """Parses GPX and FIT files into normalized ParsedActivity.
 
     Stateless service -- instantiate once and reuse across requests.
-    All public methods accept raw file bytes and return a ParsedActivity
-    with computed distance, pace, splits, and elevation data.
+    All public methods accept raw file bytes or a file path and return a
+    ParsedActivity with computed distance, pace, splits, and elevation data.
     """
 
-    def parse_gpx(self, file_content: bytes) -> ParsedActivity:
+    @staticmethod
+    def _stream(source: FileSource):
+        """Wrap bytes in a buffer; paths are handed to the readers as-is."""
+        if isinstance(source, (bytes, bytearray)):
+            return io.BytesIO(source)
+        return source
+
+    def parse_gpx(self, file_content: FileSource) -> ParsedActivity:
         """Parse a GPX file into a ParsedActivity.
 
         GPX files contain track segments with lat, lon, elevation, and time.
+        Track points are streamed with iterparse and discarded as soon as they
+        are read, so no document tree is held for large uploads; given a path,
+        the file itself is read in chunks rather than loaded up front. Falls
+        back to gpxpy when streaming finds no track points or the XML is
+        malformed.
         """
+        points: list[TrackPoint] = []
+        creator: str | None = None
+
+        try:
+            for event, elem in ET.iterparse(
+                self._stream(file_content), events=("start", "end")
+            ):
+                tag = elem.tag.rpartition("}")[2]
+                if event == "start":
+                    if tag == "gpx":
+                        creator = elem.get("creator")
+                    continue
+                if tag == "trkpt":
+                    ele = elem.findtext("{*}ele")
+                    time = elem.findtext("{*}time")
+                    speed = elem.findtext("{*}speed")
+                    points.append(TrackPoint(
+                        lat=float(elem.get("lat")),
+                        lng=float(elem.get("lon")),
+                        alt=float(ele) if ele else 0.0,
+                        timestamp=parse_time(time) if time else None,
+                        speed=float(speed) if speed else None,
+                    ))
+                    elem.clear()
+                elif tag == "trkseg":
+                    elem.clear()
+        except (ET.ParseError, TypeError, ValueError):
+            points = []
+
+        if not points:
+            return self._parse_gpx_dom(file_content)
+
+        return build_activity(points, source_device=creator or None)
+
+    def _parse_gpx_dom(self, file_content: FileSource) -> ParsedActivity:
+        """Parse a GPX file through gpxpy's full document model."""
+        if not isinstance(file_content, (bytes, bytearray)):
+            file_content = Path(file_content).read_bytes()
         gpx = gpxpy.parse(file_content.decode("utf-8"))
 
         points: list[TrackPoint] = []
@@ -260,36 +361,45 @@ class FileParserService:
 
         return build_activity(points, source_device=gpx.creator or None)
 
-    def parse_fit(self, file_content: bytes) -> ParsedActivity:
+    def parse_fit(self, file_content: FileSource) -> ParsedActivity:
         """Parse a Garmin FIT binary file into a ParsedActivity.
 
         FIT files contain record messages with position, altitude, speed, heart_rate.
         Coordinates in FIT are stored as semicircles (multiply by 180 / 2^31).
         """
-        import io
-        fit = FitFile(io.BytesIO(file_content))
+        fit = FitFile(self._stream(file_content))
+
+        manufacturer: str | None = None
+        product_name: str | None = None
+        lat_semis: list[int] = []
+        lng_semis: list[int] = []
+        extras: list[tuple] = []  # (alt, timestamp, speed, heart_rate) per record
 
-        points: list[TrackPoint] = []
-        source_device: str | None = None
-
-        # Extract device info from file_id message
-        for msg in fit.get_messages("file_id"):
-            for field_data in msg.fields:
-                if field_data.name == "manufacturer":
-                    source_device = str(field_data.value)
-                    break
-
-        # Try to get device name from device_info (more specific than manufacturer)
-        for msg in fit.get_messages("device_info"):
-            for field_data in msg.fields:
-                if field_data.name == "product_name" and field_data.value:
-                    source_device = str(field_data.value)
-                    break
-
-        # Extract GPS records
         SEMICIRCLE_TO_DEGREES = 180.0 / (2 ** 31)
 
-        for msg in fit.get_messages("record"):
+        # One pass over the messages: device info and GPS records together
+        for msg in fit.get_messages(("file_id", "device_info", "record")):
+            if msg.name == "file_id":
+                # Device info from file_id message
+                for field_data in msg.fields:
+                    if field_data.name == "manufacturer":
+                        manufacturer = str(field_data.value)
+                        break
+                continue
+
+            if msg.name == "device_info":
+                # Device name from device_info (more specific than manufacturer).
+                # The recording device is listed first; later entries are
+                # paired sensors, so stop looking after the first name.
+                if product_name is None:
+                    for field_data in msg.fields:
+                        if field_data.name == "product_name" and field_data.value:
+                            product_name = str(field_data.value)
+                            break
+                continue
+
+            # A single dict build per record is cheaper than repeated
+            # msg.get_value() calls, which each scan the field list
             fields = {f.name: f.value for f in msg.fields}
 
             lat_semi = fields.get("position_lat")
@@ -298,21 +408,37 @@ class FileParserService:
             if lat_semi is None or lng_semi is None:
                 continue
 
-            lat = lat_semi * SEMICIRCLE_TO_DEGREES
-            lng = lng_semi * SEMICIRCLE_TO_DEGREES
+            lat_semis.append(lat_semi)
+            lng_semis.append(lng_semi)
+            extras.append((
+                fields.get("enhanced_altitude") or fields.get("altitude") or 0.0,
+                fields.get("timestamp"),
+                fields.get("enhanced_speed") or fields.get("speed"),
+                fields.get("heart_rate"),
+            ))
 
-            # Skip obviously invalid coordinates
-            if abs(lat) > 90 or abs(lng) > 180:
-                continue
+        # Convert semicircles to degrees for all records at once and skip
+        # obviously invalid coordinates
+        lats = np.asarray(lat_semis, dtype=np.float64) * SEMICIRCLE_TO_DEGREES
+        lngs = np.asarray(lng_semis, dtype=np.float64) * SEMICIRCLE_TO_DEGREES
+        valid = (np.abs(lats) <= 90) & (np.abs(lngs) <= 180)
 
-            points.append(TrackPoint(
+        points = [
+            TrackPoint(
                 lat=lat,
                 lng=lng,
-                alt=fields.get("enhanced_altitude") or fields.get("altitude") or 0.0,
-                timestamp=fields.get("timestamp"),
-                speed=fields.get("enhanced_speed") or fields.get("speed"),
-                heart_rate=fields.get("heart_rate"),
-            ))
+                alt=alt,
+                timestamp=timestamp,
+                speed=speed,
+                heart_rate=heart_rate,
+            )
+            for lat, lng, ok, (alt, timestamp, speed, heart_rate) in zip(
+                lats.tolist(), lngs.tolist(), valid.tolist(), extras
+            )
+            if ok
+        ]
+
+        source_device = product_name or manufacturer
 
         if not points:
             return ParsedActivity()
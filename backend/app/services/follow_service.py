@@ -1,11 +1,18 @@
 """Follow service: manage user follow relationships and friend activity."""
 
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+import sqlalchemy as sa
+from sqlalchemy import and_, func, literal, or_, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased, joinedload, raiseload, selectinload
 
+from app.core.cache import cache_get, cache_set, make_cache_key
 from app.core.exceptions import ConflictError, NotFoundError, ValidationError
 from app.models.course import Course
 from app.models.follow import Follow
@@ -17,6 +24,12 @@ from app.models.user import User
 class FollowService:
     """Handles follow/unfollow operations, follower lists, and friend activity."""
 
+    # PostgreSQL SQLSTATE raised when the follow target is not in users.
+    FOREIGN_KEY_VIOLATION = "23503"
+    COUNTS_CACHE_TTL_SECONDS = 300
+    FEED_CACHE_NAMESPACE = "activity_feed"
+    FEED_CACHE_TTL_SECONDS = 60
+
     async def search_by_code(
         self,
         db: AsyncSession,
@@ -85,33 +98,42 @@ class FollowService:
                 code="SELF_FOLLOW", message="자기 자신을 팔로우할 수 없습니다"
             )
 
-        # Verify target user exists
-        target = await db.execute(
-            select(User.id).where(User.id == following_id)
+        # Existence, duplicate, and insert checks share one statement: the
+        # users FK rejects a missing target and the pair constraint turns a
+        # duplicate into an empty RETURNING. The target user is joined onto
+        # the inserted row for the response. The PostgreSQL insert construct
+        # has no compiled-cache key, but it keeps a double tap from raising
+        # server-side and aborting the transaction.
+        inserted = (
+            pg_insert(Follow)
+            .values(follower_id=follower_id, following_id=following_id)
+            .on_conflict_do_nothing(
+                index_elements=[Follow.follower_id, Follow.following_id]
+            )
+            .returning(*Follow.__table__.c)
+            .cte("inserted")
         )
-        if target.scalar_one_or_none() is None:
-            raise NotFoundError(
-                code="NOT_FOUND", message="사용자를 찾을 수 없습니다"
+        new_follow = aliased(Follow, inserted)
+        try:
+            result = await db.execute(
+                select(new_follow).options(
+                    joinedload(new_follow.following).raiseload("*"),
+                    raiseload(new_follow.follower),
+                )
             )
+        except IntegrityError as exc:
+            await db.rollback()
+            if getattr(exc.orig, "sqlstate", None) == self.FOREIGN_KEY_VIOLATION:
+                raise NotFoundError(
+                    code="NOT_FOUND", message="사용자를 찾을 수 없습니다"
+                )
+            raise
+        follow = result.scalar_one_or_none()
 
-        # Check for existing follow
-        existing = await db.execute(
-            select(Follow.id).where(
-                Follow.follower_id == follower_id,
-                Follow.following_id == following_id,
-            )
-        )
-        if existing.scalar_one_or_none() is not None:
+        if follow is None:
             raise ConflictError(
                 code="ALREADY_FOLLOWING", message="이미 팔로우하고 있습니다"
             )
-
-        follow = Follow(follower_id=follower_id, following_id=following_id)
-        db.add(follow)
-        await db.flush()
-
-        # Eager-load user relationships for the response
-        await db.refresh(follow, attribute_names=["follower", "following"])
         return follow
 
     async def unfollow_user(
@@ -147,30 +169,29 @@ class FollowService:
         user_id: UUID,
         page: int = 0,
         per_page: int = 20,
-    ) -> tuple[list[Follow], int]:
-        """Get paginated list of a user's followers.
+        before: datetime | None = None,
+        before_id: UUID | None = None,
+        include_total: bool = True,
+    ) -> tuple[list[Follow], int | None, bool]:
+        """Get a page of a user's followers, newest first.
+
+        Pass ``before`` and ``before_id`` (the created_at and id of the last
+        item seen) for keyset paging; ``page`` is only used without a cursor.
 
         Returns:
-            Tuple of (follow list, total count).
+            Tuple of (follow list, total count or None when not requested,
+            has_more).
         """
-        # Total count
-        count_result = await db.execute(
-            select(func.count(Follow.id)).where(Follow.following_id == user_id)
+        return await self._list_follows(
+            db,
+            Follow.following_id == user_id,
+            Follow.follower,
+            page,
+            per_page,
+            before,
+            before_id,
+            include_total,
         )
-        total_count = count_result.scalar_one()
-
-        # Paginated list with eager-loaded follower user
-        result = await db.execute(
-            select(Follow)
-            .where(Follow.following_id == user_id)
-            .options(joinedload(Follow.follower))
-            .order_by(Follow.created_at.desc())
-            .offset(page * per_page)
-            .limit(per_page)
-        )
-        follows = result.scalars().unique().all()
-
-        return list(follows), total_count
 
     async def get_following(
         self,
@@ -178,28 +199,67 @@ class FollowService:
         user_id: UUID,
         page: int = 0,
         per_page: int = 20,
-    ) -> tuple[list[Follow], int]:
-        """Get paginated list of users that a user is following.
+        before: datetime | None = None,
+        before_id: UUID | None = None,
+        include_total: bool = True,
+    ) -> tuple[list[Follow], int | None, bool]:
+        """Get a page of the users a user is following, newest first.
 
         Returns:
-            Tuple of (follow list, total count).
+            Tuple of (follow list, total count or None when not requested,
+            has_more).
         """
-        count_result = await db.execute(
-            select(func.count(Follow.id)).where(Follow.follower_id == user_id)
+        return await self._list_follows(
+            db,
+            Follow.follower_id == user_id,
+            Follow.following,
+            page,
+            per_page,
+            before,
+            before_id,
+            include_total,
         )
-        total_count = count_result.scalar_one()
 
-        result = await db.execute(
+    async def _list_follows(
+        self,
+        db: AsyncSession,
+        owner_filter,
+        user_relationship,
+        page: int,
+        per_page: int,
+        before: datetime | None,
+        before_id: UUID | None,
+        include_total: bool,
+    ) -> tuple[list[Follow], int | None, bool]:
+        """Shared follower/following pagination over (user, created_at, id)."""
+        total_count = None
+        if include_total:
+            count_result = await db.execute(
+                select(func.count(Follow.id)).where(owner_filter)
+            )
+            total_count = count_result.scalar_one()
+
+        stmt = (
             select(Follow)
-            .where(Follow.follower_id == user_id)
-            .options(joinedload(Follow.following))
-            .order_by(Follow.created_at.desc())
-            .offset(page * per_page)
-            .limit(per_page)
+            .where(owner_filter)
+            .options(joinedload(user_relationship))
+            .order_by(Follow.created_at.desc(), Follow.id.desc())
         )
-        follows = result.scalars().unique().all()
-
-        return list(follows), total_count
+        if before is not None and before_id is not None:
+            # id breaks created_at ties, so rows sharing the last timestamp
+            # seen are not skipped at a page boundary
+            stmt = stmt.where(tuple_(Follow.created_at, Follow.id) < (before, before_id))
+        elif before is not None:
+            stmt = stmt.where(Follow.created_at < before)
+        else:
+            stmt = stmt.offset(page * per_page)
+
+        # Fetch one extra to determine has_more
+        result = await db.execute(stmt.limit(per_page + 1))
+        follows = list(result.scalars().unique().all())
+
+        has_more = len(follows) > per_page
+        return follows[:per_page], total_count, has_more
 
     async def get_follow_status(
         self,
@@ -212,30 +272,49 @@ class FollowService:
         Returns:
             dict with is_following, followers_count, following_count.
         """
-        # Check if current user follows the target
-        is_following_result = await db.execute(
-            select(Follow.id).where(
+        is_following = (
+            select(Follow.id)
+            .where(
                 Follow.follower_id == current_user_id,
                 Follow.following_id == target_user_id,
             )
+            .exists()
         )
-        is_following = is_following_result.scalar_one_or_none() is not None
 
-        # Target user's follower count
-        followers_result = await db.execute(
-            select(func.count(Follow.id)).where(
-                Follow.following_id == target_user_id
+        counts_key = self.counts_cache_key(target_user_id)
+        cached = await cache_get(counts_key)
+        if cached is not None:
+            # Counts are warm; only the viewer-specific probe hits the DB.
+            followers_count, following_count = cached
+            result = await db.execute(select(is_following))
+            is_following = result.scalar_one()
+        else:
+            # One round trip: the EXISTS probe rides along with both counts,
+            # and the WHERE keeps the aggregate on the two follow indexes.
+            result = await db.execute(
+                select(
+                    is_following.label("is_following"),
+                    func.count()
+                    .filter(Follow.following_id == target_user_id)
+                    .label("followers_count"),
+                    func.count()
+                    .filter(Follow.follower_id == target_user_id)
+                    .label("following_count"),
+                )
+                .select_from(Follow)
+                .where(
+                    or_(
+                        Follow.following_id == target_user_id,
+                        Follow.follower_id == target_user_id,
+                    )
+                )
             )
-        )
-        followers_count = followers_result.scalar_one()
-
-        # Target user's following count
-        following_result = await db.execute(
-            select(func.count(Follow.id)).where(
-                Follow.follower_id == target_user_id
+            is_following, followers_count, following_count = result.one()
+            await cache_set(
+                counts_key,
+                [followers_count, following_count],
+                self.COUNTS_CACHE_TTL_SECONDS,
             )
-        )
-        following_count = following_result.scalar_one()
 
         return {
             "is_following": is_following,
@@ -243,6 +322,11 @@ class FollowService:
             "following_count": following_count,
         }
 
+    @staticmethod
+    def counts_cache_key(user_id: UUID) -> str:
+        """Redis key holding a user's [followers_count, following_count]."""
+        return f"follow_counts:{user_id}"
+
     async def get_following_active_sessions(
         self,
         db: AsyncSession,
@@ -287,12 +371,12 @@ class FollowService:
                 )
             )
             .options(
-                joinedload(RunSession.user),
-                joinedload(RunSession.course),
+                selectinload(RunSession.user),
+                selectinload(RunSession.course),
             )
             .order_by(RunSession.started_at.desc())
         )
-        sessions = result.scalars().unique().all()
+        sessions = result.scalars().all()
 
         # Deduplicate: keep only the latest session per user
         seen_users: set[str] = set()
@@ -326,72 +410,105 @@ class FollowService:
         """
         from datetime import datetime, timedelta, timezone
 
-        # Subquery: IDs of users the current user follows
-        following_ids_q = (
-            select(Follow.following_id)
-            .where(Follow.follower_id == user_id)
+        cache_key = await make_cache_key(
+            self.FEED_CACHE_NAMESPACE, {"user_id": str(user_id), "limit": limit}
+        )
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Resolve the follow list once; it is bounded by the user's friend
+        # count and both feed branches filter on it as a single array bind.
+        ids_result = await db.execute(
+            select(Follow.following_id).where(Follow.follower_id == user_id)
+        )
+        following_ids = list(ids_result.scalars().all())
+        if not following_ids:
+            return []
+        following_any = sa.any_(
+            sa.bindparam(
+                "following_ids",
+                following_ids,
+                type_=ARRAY(PG_UUID(as_uuid=True)),
+            )
         )
 
         cutoff = datetime.now(timezone.utc) - timedelta(days=7)
 
+        def _none(type_):
+            return sa.cast(sa.null(), type_)
+
         # Recent runs from followed users (last 7 days)
-        runs_result = await db.execute(
-            select(RunRecord)
+        run_course = aliased(Course)
+        runs = (
+            select(
+                literal("run_completed").label("type"),
+                RunRecord.user_id.label("user_id"),
+                User.nickname.label("nickname"),
+                User.avatar_url.label("avatar_url"),
+                RunRecord.id.label("run_id"),
+                RunRecord.distance_meters.label("distance_meters"),
+                RunRecord.duration_seconds.label("duration_seconds"),
+                RunRecord.avg_pace_seconds_per_km.label("avg_pace_seconds_per_km"),
+                run_course.title.label("course_title"),
+                _none(Course.id.type).label("course_id"),
+                _none(Course.title.type).label("course_title_created"),
+                _none(Course.distance_meters.type).label("course_distance_meters"),
+                RunRecord.finished_at.label("created_at"),
+            )
+            .join(User, User.id == RunRecord.user_id)
+            .outerjoin(run_course, run_course.id == RunRecord.course_id)
             .where(
-                RunRecord.user_id.in_(following_ids_q),
+                RunRecord.user_id == following_any,
                 RunRecord.finished_at >= cutoff,
             )
-            .options(
-                joinedload(RunRecord.user),
-                joinedload(RunRecord.course),
-            )
             .order_by(RunRecord.finished_at.desc())
             .limit(limit)
         )
-        runs = runs_result.scalars().unique().all()
 
         # Recent courses from followed users (last 7 days, public only)
-        courses_result = await db.execute(
-            select(Course)
+        courses = (
+            select(
+                literal("course_created").label("type"),
+                Course.creator_id.label("user_id"),
+                User.nickname.label("nickname"),
+                User.avatar_url.label("avatar_url"),
+                _none(RunRecord.id.type).label("run_id"),
+                _none(RunRecord.distance_meters.type).label("distance_meters"),
+                _none(RunRecord.duration_seconds.type).label("duration_seconds"),
+                _none(RunRecord.avg_pace_seconds_per_km.type).label(
+                    "avg_pace_seconds_per_km"
+                ),
+                _none(Course.title.type).label("course_title"),
+                Course.id.label("course_id"),
+                Course.title.label("course_title_created"),
+                Course.distance_meters.label("course_distance_meters"),
+                Course.created_at.label("created_at"),
+            )
+            .join(User, User.id == Course.creator_id)
             .where(
-                Course.creator_id.in_(following_ids_q),
+                Course.creator_id == following_any,
                 Course.created_at >= cutoff,
                 Course.is_public == True,  # noqa: E712
             )
-            .options(joinedload(Course.creator))
             .order_by(Course.created_at.desc())
             .limit(limit)
         )
-        courses = courses_result.scalars().unique().all()
 
-        # Merge into a unified list
-        items: list[dict] = []
-        for run in runs:
-            items.append({
-                "type": "run_completed",
-                "user_id": str(run.user_id),
-                "nickname": run.user.nickname if run.user else None,
-                "avatar_url": run.user.avatar_url if run.user else None,
-                "run_id": str(run.id),
-                "distance_meters": run.distance_meters,
-                "duration_seconds": run.duration_seconds,
-                "avg_pace_seconds_per_km": run.avg_pace_seconds_per_km,
-                "course_title": run.course.title if run.course else None,
-                "created_at": run.finished_at,
-            })
-
-        for course in courses:
-            items.append({
-                "type": "course_created",
-                "user_id": str(course.creator_id),
-                "nickname": course.creator.nickname if course.creator else None,
-                "avatar_url": course.creator.avatar_url if course.creator else None,
-                "course_id": str(course.id),
-                "course_title_created": course.title,
-                "course_distance_meters": course.distance_meters,
-                "created_at": course.created_at,
-            })
+        # Merge, sort, and limit in SQL; each branch is already capped
+        feed = union_all(runs, courses).subquery("feed")
+        result = await db.execute(
+            select(feed).order_by(feed.c.created_at.desc()).limit(limit)
+        )
 
-        # Sort by created_at descending and apply limit
-        items.sort(key=lambda x: x["created_at"], reverse=True)
-        return items[:limit]
+        items: list[dict] = []
+        for row in result.mappings():
+            item = dict(row)
+            item["user_id"] = str(item["user_id"])
+            for key in ("run_id", "course_id"):
+                if item[key] is not None:
+                    item[key] = str(item[key])
+            items.append(item)
+
+        await cache_set(cache_key, items, self.FEED_CACHE_TTL_SECONDS)
+        return items
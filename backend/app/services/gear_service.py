@@ -2,7 +2,7 @@
 
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError, PermissionDeniedError
@@ -36,29 +36,26 @@ class GearService:
     ) -> UserGear:
         """Create a new gear entry.
 
-        If is_primary is True, any existing primary gear for the user
-        is demoted first to maintain the single-primary invariant.
+        If is_primary is True, the new row takes the primary flag from the
+        user's current primary gear in the same UPDATE.
         """
-        if is_primary:
-            await self._clear_primary(db, user_id)
-
-        gear = UserGear(
-            user_id=user_id,
-            brand=brand,
-            model_name=model_name,
-            image_url=image_url,
-            is_primary=is_primary,
-        )
-        db.add(gear)
-        await db.flush()
-
-        # Re-query to populate server-generated columns (id, created_at)
+        # RETURNING hydrates server-generated columns (id, created_at)
         result = await db.execute(
-            select(UserGear)
-            .where(UserGear.id == gear.id)
-            .execution_options(populate_existing=True)
+            insert(UserGear)
+            .values(
+                user_id=user_id,
+                brand=brand,
+                model_name=model_name,
+                image_url=image_url,
+                is_primary=False,
+            )
+            .returning(UserGear)
         )
-        return result.scalar_one()
+        gear = result.scalar_one()
+
+        if is_primary:
+            gear = await self._set_primary(db, user_id, gear.id)
+        return gear
 
     async def update_gear(
         self,
@@ -76,28 +73,39 @@ class GearService:
             NotFoundError: Gear does not exist.
             PermissionDeniedError: User does not own this gear.
         """
-        gear = await self._get_owned_gear(db, user_id, gear_id)
-
-        if brand is not None:
-            gear.brand = brand
-        if model_name is not None:
-            gear.model_name = model_name
-        if image_url is not None:
-            gear.image_url = image_url
-        if is_primary is not None and is_primary and not gear.is_primary:
-            await self._clear_primary(db, user_id)
-            gear.is_primary = True
-        elif is_primary is not None and not is_primary:
-            gear.is_primary = False
-
-        await db.flush()
-
-        result = await db.execute(
-            select(UserGear)
-            .where(UserGear.id == gear.id)
-            .execution_options(populate_existing=True)
-        )
-        return result.scalar_one()
+        values = {
+            name: value
+            for name, value in (
+                ("brand", brand),
+                ("model_name", model_name),
+                ("image_url", image_url),
+            )
+            if value is not None
+        }
+        if is_primary is False:
+            values["is_primary"] = False
+
+        if values:
+            # Ownership is part of the WHERE; an empty RETURNING falls back to
+            # the lookup below to tell a missing gear from someone else's.
+            result = await db.execute(
+                update(UserGear)
+                .where(UserGear.id == gear_id, UserGear.user_id == user_id)
+                .values(**values)
+                .returning(UserGear)
+                .execution_options(
+                    synchronize_session=False, populate_existing=True
+                )
+            )
+            gear = result.scalar_one_or_none()
+            if gear is None:
+                gear = await self._get_owned_gear(db, user_id, gear_id)
+        else:
+            gear = await self._get_owned_gear(db, user_id, gear_id)
+
+        if is_primary and not gear.is_primary:
+            gear = await self._set_primary(db, user_id, gear.id)
+        return gear
 
     async def delete_gear(
         self,
@@ -160,17 +168,36 @@ class GearService:
 
         return gear
 
-    async def _clear_primary(
+    async def _set_primary(
         self,
         db: AsyncSession,
         user_id: UUID,
-    ) -> None:
-        """Demote the current primary gear for a user (if any)."""
-        await db.execute(
+        gear_id: UUID,
+    ) -> UserGear:
+        """Make *gear_id* the user's primary gear in a single statement.
+
+        Only the outgoing and incoming rows are touched; the deferred
+        single-primary constraint is checked once the swap completes.
+        Both returned rows are fetched, which is what refreshes loaded
+        instances with the new flags; the promoted gear is returned.
+
+        Raises:
+            NotFoundError: *gear_id* is gone (e.g. deleted concurrently) or
+                does not belong to *user_id*.
+        """
+        result = await db.execute(
             update(UserGear)
             .where(
                 UserGear.user_id == user_id,
-                UserGear.is_primary == True,  # noqa: E712
+                or_(UserGear.is_primary == True, UserGear.id == gear_id),  # noqa: E712
             )
-            .values(is_primary=False)
+            .values(is_primary=UserGear.id == gear_id)
+            .returning(UserGear)
+            .execution_options(synchronize_session=False, populate_existing=True)
         )
+        gear = next(
+            (gear for gear in result.scalars().all() if gear.id == gear_id), None
+        )
+        if gear is None:
+            raise NotFoundError(code="NOT_FOUND", message="기어를 찾을 수 없습니다")
+        return gear
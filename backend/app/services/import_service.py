@@ -1,31 +1,69 @@
 """Import service: orchestrates file upload, parsing, and run record creation."""
 
+import asyncio
 import logging
+import struct
 import uuid
+from collections.abc import AsyncIterator
 from datetime import datetime
 from pathlib import Path
 from uuid import UUID
 
 import aiofiles
-from geoalchemy2.shape import from_shape
+import aiofiles.os
+import numpy as np
+import sqlalchemy as sa
+from geoalchemy2 import Geometry, WKBElement
 from shapely.geometry import LineString
-from sqlalchemy import select, func as sa_func
+from sqlalchemy import select, update, func as sa_func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
+from app.core.exceptions import PayloadTooLargeError
 from app.models.course import Course
 from app.models.external_import import ExternalImport
 from app.models.run_record import RunRecord
 from app.models.run_session import RunSession
-from app.services.course_matcher import Point2D, calculate_route_match
+from app.services.course_matcher import calculate_route_match_arrays
 from app.services.file_parser import FileParserService, ParsedActivity
 
 logger = logging.getLogger(__name__)
 
+# EWKB header for a little-endian 2D LINESTRING carrying SRID 4326:
+# byte order, type code with the SRID flag (0x20000000), SRID, point count
+_EWKB_HEADER = struct.Struct("<BIII")
+_EWKB_SRID_FLAG = 0x20000000
+_WKB_LINESTRING = 2
+
+
+def _linestring_ewkb(coords: list) -> WKBElement:
+    """Encode [lng, lat(, alt)] coordinates as a 2D SRID 4326 EWKB LineString.
+
+    The points are written straight from a float64 array; no Shapely object
+    is built, and extended WKB binds as hex without the WKT round trip that
+    GeoAlchemy applies to plain WKB.
+    """
+    try:
+        xy = np.asarray(coords, dtype="<f8")[:, :2]
+    except ValueError:
+        # Mixed 2D/3D points can't form a rectangular array
+        xy = np.array([(c[0], c[1]) for c in coords], dtype="<f8")
+    header = _EWKB_HEADER.pack(
+        1, _WKB_LINESTRING | _EWKB_SRID_FLAG, 4326, len(xy)
+    )
+    return WKBElement(
+        header + np.ascontiguousarray(xy).tobytes(), srid=4326, extended=True
+    )
+
 
 class ImportService:
     """Orchestrates file upload, parsing, RunRecord creation, and course matching."""
 
+    # Candidates kept after the PostGIS shape ranking for exact matching
+    MATCH_CANDIDATE_LIMIT = 3
+    # ~5 m; only used to cheapen the Hausdorff ranking, not the match itself
+    MATCH_SIMPLIFY_DEGREES = 0.00005
+
     def __init__(self) -> None:
         self._parser = FileParserService()
 
@@ -50,22 +88,22 @@ class ImportService:
             return
 
         try:
-            # Update status to processing
-            ext_import.status = "processing"
-            await db.flush()
-
-            # Read file and parse based on source type
+            # Parse straight from disk based on source type; the parsers read
+            # the file incrementally instead of holding a full copy in memory
             if ext_import.source in ("gpx_upload", "fit_upload"):
                 file_path = ext_import.file_path
                 if not file_path:
                     raise ValueError("No file path")
-                async with aiofiles.open(file_path, "rb") as f:
-                    file_content = await f.read()
 
-                if ext_import.source == "gpx_upload":
-                    activity = self._parser.parse_gpx(file_content)
-                else:
-                    activity = self._parser.parse_fit(file_content)
+                parse = (
+                    self._parser.parse_gpx
+                    if ext_import.source == "gpx_upload"
+                    else self._parser.parse_fit
+                )
+                # Parsing is CPU-bound; keep it off the event loop
+                activity = await asyncio.get_running_loop().run_in_executor(
+                    None, parse, file_path
+                )
             elif ext_import.source == "strava":
                 activity = self._deserialize_strava_activity(ext_import.raw_metadata)
             else:
@@ -79,8 +117,13 @@ class ImportService:
             if not activity.route_coordinates:
                 raise ValueError("No GPS data in file")
 
+            # Build the rows in memory with client-side primary keys, so no
+            # flush is needed just to learn an id; they are written together
+            # by the autoflush of the stats UPDATE below.
+
             # Create a RunSession (status='imported' for FK consistency)
             session = RunSession(
+                id=uuid.uuid4(),
                 user_id=user_id,
                 course_id=None,
                 status="imported",
@@ -90,21 +133,17 @@ class ImportService:
                     "device": activity.source_device,
                 },
             )
-            db.add(session)
-            await db.flush()
 
             # Build route geometry (PostGIS LineString)
-            coords_2d = [
-                (c[0], c[1]) for c in activity.route_coordinates
-            ]  # (lng, lat)
             route_geom = (
-                from_shape(LineString(coords_2d), srid=4326)
-                if len(coords_2d) >= 2
+                _linestring_ewkb(activity.route_coordinates)
+                if len(activity.route_coordinates) >= 2
                 else None
             )
 
             # Create RunRecord
             run_record = RunRecord(
+                id=uuid.uuid4(),
                 user_id=user_id,
                 session_id=session.id,
                 course_id=None,
@@ -148,10 +187,33 @@ class ImportService:
                 started_at=activity.started_at or ext_import.created_at,
                 finished_at=activity.finished_at or ext_import.created_at,
             )
-            db.add(run_record)
-            await db.flush()
 
-            # Update import summary
+            # Try course matching (read-only; fills the match columns on
+            # run_record before it is added)
+            course_match = await self._match_to_courses(db, run_record, activity)
+
+            db.add_all([session, run_record])
+
+            # Update user stats in place; this statement's autoflush inserts
+            # the session and run record ahead of it
+            from app.models.user import User
+
+            await db.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(
+                    total_distance_meters=(
+                        sa_func.coalesce(User.total_distance_meters, 0)
+                        + activity.distance_meters
+                    ),
+                    total_runs=sa_func.coalesce(User.total_runs, 0) + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+            # Update import summary. Set after the inserts above: external_imports
+            # references run_records, and the unit of work would otherwise order
+            # this UPDATE before the INSERT it points at.
             ext_import.import_summary = {
                 "distance_meters": activity.distance_meters,
                 "duration_seconds": activity.duration_seconds,
@@ -162,27 +224,11 @@ class ImportService:
                 "source_device": activity.source_device,
             }
             ext_import.run_record_id = run_record.id
-
-            # Try course matching
-            course_match = await self._match_to_courses(db, run_record, activity)
             if course_match:
                 ext_import.course_match = course_match
 
             ext_import.status = "completed"
 
-            # Update user stats
-            from app.models.user import User
-
-            user_result = await db.execute(
-                select(User).where(User.id == user_id)
-            )
-            user = user_result.scalar_one_or_none()
-            if user:
-                user.total_distance_meters = (
-                    user.total_distance_meters or 0
-                ) + activity.distance_meters
-                user.total_runs = (user.total_runs or 0) + 1
-
             await db.commit()
 
             logger.info(
@@ -228,8 +274,18 @@ class ImportService:
 
         start_point_wkt = f"SRID=4326;POINT({start_lng} {start_lat})"
 
+        # Rank nearby courses by Hausdorff distance to a simplified runner
+        # line so only the closest few are decoded and matched in Python
+        runner_line = LineString(
+            [(c[0], c[1]) for c in activity.route_coordinates]
+        ).simplify(self.MATCH_SIMPLIFY_DEGREES)
+        shape_distance = sa_func.ST_HausdorffDistance(
+            sa.cast(Course.route_geometry, Geometry(srid=4326)),
+            sa_func.ST_GeomFromWKB(runner_line.wkb, 4326),
+        )
+
         candidates = await db.execute(
-            select(Course)
+            select(Course.id, Course.title, Course.route_geometry)
             .where(
                 geo_func.ST_DWithin(
                     Course.start_point,
@@ -238,45 +294,21 @@ class ImportService:
                 )
             )
             .where(Course.is_public == True)  # noqa: E712
-            .limit(10)
+            .where(Course.route_geometry.isnot(None))
+            .order_by(shape_distance)
+            .limit(self.MATCH_CANDIDATE_LIMIT)
         )
-        courses = candidates.scalars().all()
+        courses = candidates.all()
 
         if not courses:
             return None
 
-        # Convert runner points to Point2D
-        runner_points = [
-            Point2D(lat=pt.lat, lng=pt.lng) for pt in activity.points
-        ]
-
-        best_match = None
-        best_match_percent = 0.0
-
-        for course in courses:
-            # Extract course geometry coordinates
-            if not course.route_geometry:
-                continue
-
-            # Use Shapely to load course geometry
-            from geoalchemy2.shape import to_shape
-
-            course_shape = to_shape(course.route_geometry)
-            course_points = [
-                Point2D(lat=c[1], lng=c[0]) for c in course_shape.coords
-            ]
-
-            if len(course_points) < 2:
-                continue
-
-            match_result = calculate_route_match(runner_points, course_points)
-
-            if match_result.route_match_percent > best_match_percent:
-                best_match_percent = match_result.route_match_percent
-                best_match = {
-                    "course": course,
-                    "result": match_result,
-                }
+        # Geometry decoding and scoring are CPU-bound; run them in the
+        # thread pool so imports don't stall the event loop serving requests
+        loop = asyncio.get_running_loop()
+        best_match = await loop.run_in_executor(
+            None, self._best_course_match, courses, activity
+        )
 
         if best_match and best_match["result"].is_completed:
             course = best_match["course"]
@@ -287,7 +319,6 @@ class ImportService:
             run_record.course_completed = True
             run_record.route_match_percent = result.route_match_percent
             run_record.max_deviation_meters = result.max_deviation_meters
-            await db.flush()
 
             return {
                 "course_id": str(course.id),
@@ -298,13 +329,57 @@ class ImportService:
 
         return None
 
+    @staticmethod
+    def _best_course_match(courses, activity: ParsedActivity) -> dict | None:
+        """Score candidate course rows against the activity; best match or None."""
+        from geoalchemy2.shape import to_shape
+
+        # Runner trace as one (N, 2) [lat, lng] array, reused for every course
+        if len(activity.lats) == len(activity.points):
+            runner_xy = np.column_stack((activity.lats, activity.lngs))
+        else:
+            runner_xy = np.array([(pt.lat, pt.lng) for pt in activity.points])
+
+        best_match = None
+        best_match_percent = 0.0
+
+        for course in courses:
+            # Extract course geometry coordinates
+            if not course.route_geometry:
+                continue
+
+            course_coords = np.asarray(to_shape(course.route_geometry).coords)
+            if len(course_coords) < 2:
+                continue
+
+            # Shapely coords are (lng, lat); flip to the matcher's [lat, lng]
+            course_xy = course_coords[:, 1::-1]
+            match_result = calculate_route_match_arrays(runner_xy, course_xy)
+
+            if match_result.route_match_percent > best_match_percent:
+                best_match_percent = match_result.route_match_percent
+                best_match = {
+                    "course": course,
+                    "result": match_result,
+                }
+
+        return best_match
+
     async def save_upload_file(
         self,
-        file_content: bytes,
+        stream: AsyncIterator[bytes],
         filename: str,
         source: str,
+        max_size: int | None = None,
     ) -> str:
-        """Save uploaded file to disk and return the file path."""
+        """Stream an uploaded file to disk and return the file path.
+
+        Chunks are written as they arrive, so peak memory does not grow with
+        the upload size. A partial file is removed if ``max_size`` is exceeded.
+
+        Raises:
+            PayloadTooLargeError: If more than ``max_size`` bytes are received.
+        """
         settings = get_settings()
         upload_dir = Path(settings.UPLOAD_DIR) / "imports"
         upload_dir.mkdir(parents=True, exist_ok=True)
@@ -314,8 +389,20 @@ class ImportService:
         saved_filename = f"{file_id}{ext}"
         file_path = upload_dir / saved_filename
 
-        async with aiofiles.open(file_path, "wb") as f:
-            await f.write(file_content)
+        written = 0
+        try:
+            async with aiofiles.open(file_path, "wb") as f:
+                async for chunk in stream:
+                    written += len(chunk)
+                    if max_size is not None and written > max_size:
+                        raise PayloadTooLargeError(
+                            code="UPLOAD_TOO_LARGE",
+                            message=f"File exceeds {max_size} bytes",
+                        )
+                    await f.write(chunk)
+        except BaseException:
+            await aiofiles.os.remove(file_path)
+            raise
 
         return str(file_path)
 
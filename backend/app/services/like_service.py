@@ -1,18 +1,52 @@
 """Like service: toggle and query course likes."""
 
+import uuid
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache_get, cache_set
 from app.core.exceptions import NotFoundError
 from app.models.course import Course
 from app.models.like import CourseLike
 
+# Toggle in one round trip. Data-modifying CTEs are not visible to the outer
+# SELECT (it reads the pre-statement snapshot), so like_count adjusts the
+# snapshot count by what this statement inserted or deleted.
+_TOGGLE_LIKE_SQL = text("""
+    WITH existing AS (
+        SELECT id FROM course_likes
+        WHERE course_id = :course_id AND user_id = :user_id
+    ),
+    deleted AS (
+        DELETE FROM course_likes
+        WHERE id IN (SELECT id FROM existing)
+        RETURNING 1
+    ),
+    inserted AS (
+        INSERT INTO course_likes (id, course_id, user_id, created_at)
+        SELECT :like_id, :course_id, :user_id, :created_at
+        WHERE NOT EXISTS (SELECT 1 FROM existing)
+        ON CONFLICT ON CONSTRAINT uq_course_likes_user_course DO NOTHING
+        RETURNING 1
+    )
+    SELECT
+        NOT EXISTS (SELECT 1 FROM existing) AS is_liked,
+        (SELECT count(*) FROM course_likes WHERE course_id = :course_id)
+            + (SELECT count(*) FROM inserted)
+            - (SELECT count(*) FROM deleted) AS like_count
+""")
+
 
 class LikeService:
     """Handles course like toggle and status queries."""
 
+    FOREIGN_KEY_VIOLATION = "23503"
+    COUNT_CACHE_TTL_SECONDS = 3600
+
     async def toggle_like(
         self,
         db: AsyncSession,
@@ -30,36 +64,26 @@ class LikeService:
         Raises:
             NotFoundError: Course does not exist.
         """
-        # Verify course exists
-        course_result = await db.execute(
-            select(Course.id).where(Course.id == course_id)
-        )
-        if course_result.scalar_one_or_none() is None:
+        # A missing course surfaces as a course_id foreign key violation
+        # on the insert branch, so no separate existence query is needed.
+        try:
+            result = await db.execute(
+                _TOGGLE_LIKE_SQL,
+                {
+                    "like_id": uuid.uuid4(),
+                    "course_id": course_id,
+                    "user_id": user_id,
+                    "created_at": datetime.utcnow(),
+                },
+            )
+        except IntegrityError as exc:
+            if getattr(exc.orig, "sqlstate", None) != self.FOREIGN_KEY_VIOLATION:
+                raise
+            await db.rollback()
             raise NotFoundError(code="NOT_FOUND", message="코스를 찾을 수 없습니다")
 
-        # Check if already liked
-        existing_result = await db.execute(
-            select(CourseLike).where(
-                CourseLike.course_id == course_id,
-                CourseLike.user_id == user_id,
-            )
-        )
-        existing_like = existing_result.scalar_one_or_none()
-
-        if existing_like is not None:
-            # Unlike: remove the existing like
-            await db.delete(existing_like)
-            await db.flush()
-            is_liked = False
-        else:
-            # Like: create a new like
-            like = CourseLike(course_id=course_id, user_id=user_id)
-            db.add(like)
-            await db.flush()
-            is_liked = True
-
-        like_count = await self._get_like_count(db, course_id)
-        return {"is_liked": is_liked, "like_count": like_count}
+        row = result.one()
+        return {"is_liked": row.is_liked, "like_count": row.like_count}
 
     async def get_like_status(
         self,
@@ -75,24 +99,37 @@ class LikeService:
         Raises:
             NotFoundError: Course does not exist.
         """
-        # Verify course exists
-        course_result = await db.execute(
-            select(Course.id).where(Course.id == course_id)
-        )
-        if course_result.scalar_one_or_none() is None:
-            raise NotFoundError(code="NOT_FOUND", message="코스를 찾을 수 없습니다")
-
-        # Check if user liked
-        existing_result = await db.execute(
-            select(CourseLike.id).where(
+        course_exists = select(Course.id).where(Course.id == course_id).exists()
+        is_liked = (
+            select(CourseLike.id)
+            .where(
                 CourseLike.course_id == course_id,
                 CourseLike.user_id == user_id,
             )
+            .exists()
         )
-        is_liked = existing_result.scalar_one_or_none() is not None
+        columns = [course_exists.label("course_exists"), is_liked.label("is_liked")]
+
+        # Fold the count into the same round trip unless it is cached.
+        cache_key = self.count_cache_key(course_id)
+        like_count = await cache_get(cache_key)
+        if like_count is None:
+            columns.append(
+                select(func.count(CourseLike.id))
+                .where(CourseLike.course_id == course_id)
+                .scalar_subquery()
+                .label("like_count")
+            )
+
+        row = (await db.execute(select(*columns))).one()
+        if not row.course_exists:
+            raise NotFoundError(code="NOT_FOUND", message="코스를 찾을 수 없습니다")
 
-        like_count = await self._get_like_count(db, course_id)
-        return {"is_liked": is_liked, "like_count": like_count}
+        if like_count is None:
+            like_count = row.like_count
+            await cache_set(cache_key, like_count, self.COUNT_CACHE_TTL_SECONDS)
+
+        return {"is_liked": row.is_liked, "like_count": like_count}
 
     async def get_course_like_count(
         self,
@@ -107,10 +144,26 @@ class LikeService:
         db: AsyncSession,
         course_id: UUID,
     ) -> int:
-        """Internal helper to count likes for a course."""
+        """Internal helper to count likes for a course.
+
+        Cache-aside: the count is read from Redis and filled from the DB on
+        a miss. Writers evict it after commit via count_cache_key().
+        """
+        cache_key = self.count_cache_key(course_id)
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         result = await db.execute(
             select(func.count(CourseLike.id)).where(
                 CourseLike.course_id == course_id
             )
         )
-        return result.scalar_one() or 0
+        like_count = result.scalar_one() or 0
+        await cache_set(cache_key, like_count, self.COUNT_CACHE_TTL_SECONDS)
+        return like_count
+
+    @staticmethod
+    def count_cache_key(course_id: UUID) -> str:
+        """Redis key holding a course's like count."""
+        return f"like_count:{course_id}"
@@ -8,11 +8,15 @@ looking for large inter-point distances and skips map matching for
 those segments to avoid Mapbox routing them onto wrong roads.
 """
 
+import asyncio
 import logging
 import math
+from functools import lru_cache
 from typing import NamedTuple, Optional
 
 import httpx
+import numpy as np
+import shapely
 
 from app.core.config import get_settings
 
@@ -22,6 +26,7 @@ logger = logging.getLogger(__name__)
 MAX_COORDS_PER_REQUEST = 100
 CHUNK_SIZE = 90  # Leave room for overlap
 OVERLAP = 10  # Overlap between chunks for smooth stitching (reduced boundary discontinuity)
+MAX_CONCURRENT_CHUNKS = 4  # In-flight chunk requests per route (Mapbox rate limits)
 
 # Signal gap detection: if two consecutive points are > this distance apart
 # (meters), treat the gap as a tunnel/underpass and skip map matching.
@@ -43,7 +48,17 @@ class MapMatchingService:
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=5.0)
+            # HTTP/2 lets concurrent chunk requests multiplex over one
+            # TLS connection, which stays warm between match_route calls.
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=5.0,
+                limits=httpx.Limits(
+                    max_connections=50,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=60.0,
+                ),
+            )
         return self._client
 
     async def match_route(
@@ -168,9 +183,7 @@ class MapMatchingService:
         access_token: str,
     ) -> tuple[list[list[float]] | None, float | None]:
         """Match a single chunk and return (coords, confidence)."""
-        coord_str = ";".join(
-            f"{c[0]:.6f},{c[1]:.6f}" for c in coordinates
-        )
+        coord_str = ";".join([f"{c[0]:.6f},{c[1]:.6f}" for c in coordinates])
 
         url = f"https://api.mapbox.com/matching/v5/mapbox/walking/{coord_str}"
         params = {
@@ -181,13 +194,11 @@ class MapMatchingService:
             "tidy": "true",
         }
 
-        radiuses = []
-        for i in range(len(coordinates)):
-            if i == 0 or i == len(coordinates) - 1:
-                radiuses.append("35")
-            else:
-                radiuses.append("20")
-        params["radiuses"] = ";".join(radiuses)
+        # Looser 35m radius at the endpoints, 20m in between
+        if len(coordinates) == 1:
+            params["radiuses"] = "35"
+        else:
+            params["radiuses"] = "35;" + "20;" * (len(coordinates) - 2) + "35"
 
         client = await self._get_client()
         try:
@@ -225,15 +236,35 @@ class MapMatchingService:
         coordinates: list[list[float]],
         access_token: str,
     ) -> list[list[float]]:
-        """Match a long route by splitting into overlapping chunks."""
-        all_matched: list[list[float]] = []
-        i = 0
+        """Match a long route by splitting into overlapping chunks.
 
+        Chunks are independent, so they are requested concurrently (at most
+        MAX_CONCURRENT_CHUNKS in flight) and stitched back in route order.
+        """
+        windows: list[tuple[int, int]] = []
+        i = 0
         while i < len(coordinates):
             end = min(i + CHUNK_SIZE, len(coordinates))
-            chunk = coordinates[i:end]
+            windows.append((i, end))
+            # Move forward, leaving overlap for next chunk
+            i = end - OVERLAP if end < len(coordinates) else end
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+
+        async def match(chunk: list[list[float]]) -> list[list[float]] | None:
+            async with semaphore:
+                return await self._match_chunk(chunk, access_token)
 
-            matched = await self._match_chunk(chunk, access_token)
+        chunks = [coordinates[start:end] for start, end in windows]
+        results = await asyncio.gather(
+            *(match(chunk) for chunk in chunks), return_exceptions=True
+        )
+
+        all_matched: list[list[float]] = []
+        for chunk, matched in zip(chunks, results):
+            if isinstance(matched, Exception):
+                logger.error(f"[MapMatching] Chunk match failed: {matched}")
+                matched = None
             if matched is None:
                 # Fall back to raw coordinates for this chunk
                 matched = chunk
@@ -244,9 +275,6 @@ class MapMatchingService:
             else:
                 all_matched.extend(matched)
 
-            # Move forward, leaving overlap for next chunk
-            i = end - OVERLAP if end < len(coordinates) else end
-
         return all_matched
 
     @staticmethod
@@ -368,8 +396,9 @@ class MapMatchingService:
     ) -> list[list[float]]:
         """Restore altitude from original coordinates to matched ones.
 
-        Mapbox returns 2D coordinates. We interpolate altitude from the
-        nearest original point for each matched point.
+        Mapbox returns 2D coordinates. Each matched point takes the altitude
+        of its nearest original point, found with one vectorized STRtree
+        nearest-neighbour query (planar lng/lat distance).
         """
         if not original or not matched:
             return matched
@@ -380,26 +409,26 @@ class MapMatchingService:
         if not has_alt:
             return [[c[0], c[1], 0.0] for c in matched]
 
-        result = []
-        orig_idx = 0
-        for mc in matched:
-            # Find nearest original point (simple linear scan)
-            best_dist = float("inf")
-            best_alt = 0.0
-            for j in range(max(0, orig_idx - 2), min(len(original), orig_idx + 10)):
-                dlng = mc[0] - original[j][0]
-                dlat = mc[1] - original[j][1]
-                dist = dlng * dlng + dlat * dlat
-                if dist < best_dist:
-                    best_dist = dist
-                    best_alt = original[j][2] if len(original[j]) > 2 else 0.0
-                    orig_idx = j
-
-            result.append([mc[0], mc[1], best_alt])
+        orig_xy = np.array([c[:2] for c in original], dtype=float)
+        orig_alt = np.array([c[2] if len(c) > 2 else 0.0 for c in original])
+        matched_xy = np.array([c[:2] for c in matched], dtype=float)
 
-        return result
+        tree = shapely.STRtree(shapely.points(orig_xy))
+        # all_matches=False yields exactly one (matched, original) pair per point
+        _, nearest = tree.query_nearest(shapely.points(matched_xy), all_matches=False)
+
+        return np.column_stack([matched_xy, orig_alt[nearest]]).tolist()
 
     async def close(self):
         """Close the HTTP client."""
         if self._client and not self._client.is_closed:
             await self._client.aclose()
+
+
+@lru_cache
+def get_map_matcher() -> MapMatchingService:
+    """Shared MapMatchingService whose HTTP client keeps Mapbox connections alive.
+
+    Callers must not close() it; the app lifespan does on shutdown.
+    """
+    return MapMatchingService()
@@ -1,5 +1,6 @@
 """Push notification service using Firebase Cloud Messaging + in-app inbox."""
 
+import asyncio
 import logging
 from uuid import UUID
 
@@ -18,6 +19,9 @@ logger = logging.getLogger(__name__)
 class NotificationService:
     """Handles device token management and push notification sending."""
 
+    FCM_MULTICAST_LIMIT = 500  # Max tokens per FCM multicast request
+    FCM_INVALID_TOKEN_CODES = ("NOT_FOUND", "INVALID_ARGUMENT", "UNREGISTERED")
+
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
         self._firebase_initialised = False
@@ -93,13 +97,13 @@ class NotificationService:
         if not tokens:
             return 0
 
-        sent = 0
-        for token in tokens:
-            success = await self._send_fcm(token, title, body, data)
-            if success:
-                sent += 1
-            else:
-                await self.unregister_token(db, token)
+        sent, invalid_tokens = await self._send_fcm_multicast(tokens, title, body, data)
+
+        if invalid_tokens:
+            await db.execute(
+                delete(DeviceToken).where(DeviceToken.device_token.in_(invalid_tokens))
+            )
+            await db.flush()
 
         return sent
 
@@ -258,35 +262,61 @@ class NotificationService:
 
         self._firebase_initialised = True
 
-    async def _send_fcm(
+    async def _send_fcm_multicast(
         self,
-        device_token: str,
+        device_tokens: list[str],
         title: str,
         body: str,
         data: dict | None = None,
-    ) -> bool:
-        """Send a single FCM message. Returns True on success."""
+    ) -> tuple[int, list[str]]:
+        """Send one FCM message to many devices in batched requests.
+
+        Returns (sent_count, invalid_tokens). Only tokens FCM reports as
+        invalid are returned for removal; transient failures are just logged.
+        """
         if not self._settings.FCM_SERVICE_ACCOUNT_PATH:
-            logger.debug("FCM not configured, skipping push to %s...", device_token[:20])
-            return True  # Pretend success when not configured
+            logger.debug("FCM not configured, skipping push to %d devices", len(device_tokens))
+            return len(device_tokens), []  # Pretend success when not configured
 
         try:
             from firebase_admin import messaging
 
             self._ensure_firebase_app()
+        except Exception:
+            logger.exception("FCM initialisation failed")
+            return 0, []
 
-            message = messaging.Message(
+        loop = asyncio.get_running_loop()
+        sent = 0
+        invalid_tokens: list[str] = []
+
+        for start in range(0, len(device_tokens), self.FCM_MULTICAST_LIMIT):
+            batch = device_tokens[start:start + self.FCM_MULTICAST_LIMIT]
+            message = messaging.MulticastMessage(
                 notification=messaging.Notification(title=title, body=body),
                 data=data or {},
-                token=device_token,
+                tokens=batch,
             )
-
-            messaging.send(message)
-            return True
-        except Exception as e:
-            error_str = str(e)
-            if any(code in error_str for code in ("NOT_FOUND", "INVALID_ARGUMENT", "UNREGISTERED")):
-                logger.info("FCM token invalid, removing: %s...", device_token[:20])
-                return False
-            logger.exception("FCM send failed for token %s...", device_token[:20])
-            return False
+            try:
+                # The SDK call blocks on HTTP; keep it off the event loop.
+                response = await loop.run_in_executor(
+                    None, messaging.send_each_for_multicast, message
+                )
+            except Exception:
+                logger.exception("FCM multicast failed for %d devices", len(batch))
+                continue
+
+            for token, result in zip(batch, response.responses):
+                if result.success:
+                    sent += 1
+                    continue
+                error_str = f"{getattr(result.exception, 'code', '')} {result.exception}"
+                if any(code in error_str for code in self.FCM_INVALID_TOKEN_CODES):
+                    logger.info("FCM token invalid, removing: %s...", token[:20])
+                    invalid_tokens.append(token)
+                else:
+                    logger.warning(
+                        "FCM send failed for token %s...: %s", token[:20], result.exception
+                    )
+
+        return sent, invalid_tokens
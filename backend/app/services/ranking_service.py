@@ -3,11 +3,12 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import case, func, select, text
+from sqlalchemy import case, func, or_, select, text
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased
 
+from app.core.cache import cache_get, cache_set, make_cache_key
 from app.models.ranking import Ranking
 from app.models.run_record import RunRecord
 from app.models.user import User
@@ -16,6 +17,8 @@ from app.models.user import User
 class RankingService:
     """Handles course leaderboards, personal rankings, and rank recalculation."""
 
+    LEADERBOARD_CACHE_TTL_SECONDS = 600
+
     async def get_course_rankings(
         self,
         db: AsyncSession,
@@ -25,106 +28,152 @@ class RankingService:
         requesting_user_id: UUID | None = None,
         country: str | None = None,
     ) -> dict:
-        """Get paginated course leaderboard, optionally filtered by country."""
-        # Base conditions
-        base_conditions = [Ranking.course_id == course_id]
-        if country:
-            base_conditions.append(Ranking.user.has(User.country == country))
+        """Get paginated course leaderboard, optionally filtered by country.
 
-        total_result = await db.execute(
-            select(func.count(Ranking.id)).where(*base_conditions)
+        One statement: window functions over the (filtered) course rankings
+        give each row its position, its tie-aware rank, and the total count;
+        the outer select keeps the page slice plus the requester's own row.
+
+        The page and total are shared by all users and cached per course
+        until the next ranking recalculation; on a hit only the requester's
+        own ranking is queried.
+        """
+        cache_key = await make_cache_key(
+            self.leaderboard_cache_namespace(course_id),
+            {"page": page, "per_page": per_page, "country": country},
         )
-        total_runners = total_result.scalar() or 0
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            data, total_runners = cached
+            my_ranking = None
+            if requesting_user_id:
+                my_ranking = await self._get_my_ranking_entry(
+                    db, course_id, requesting_user_id, country
+                )
+            return {
+                "data": data,
+                "my_ranking": my_ranking,
+                "total_runners": total_runners,
+            }
 
-        query = (
-            select(Ranking)
-            .join(Ranking.user)
+        order = (Ranking.best_duration_seconds, Ranking.id)
+        ranked_query = (
+            select(
+                Ranking.user_id,
+                Ranking.best_duration_seconds,
+                Ranking.best_pace_seconds_per_km,
+                Ranking.run_count,
+                Ranking.achieved_at,
+                User.nickname,
+                User.avatar_url,
+                User.crew_name,
+                User.runner_level,
+                func.row_number().over(order_by=order).label("position"),
+                func.rank().over(order_by=Ranking.best_duration_seconds).label("tie_rank"),
+                func.count().over().label("total"),
+            )
+            .join(User, User.id == Ranking.user_id)
             .where(Ranking.course_id == course_id)
-            .options(joinedload(Ranking.user))
-            .order_by(Ranking.best_duration_seconds)
-            .offset(page * per_page)
-            .limit(per_page)
         )
         if country:
-            query = query.where(User.country == country)
+            ranked_query = ranked_query.where(User.country == country)
+        ranked = ranked_query.cte("ranked")
 
-        result = await db.execute(query)
-        rankings = result.scalars().unique().all()
+        offset = page * per_page
+        in_page = ranked.c.position.between(offset + 1, offset + per_page)
+        wanted = or_(in_page, ranked.c.user_id == requesting_user_id) if requesting_user_id else in_page
 
-        data = []
-        for i, ranking in enumerate(rankings):
-            rank = page * per_page + i + 1
-            data.append({
-                "rank": rank,
-                "user": {
-                    "id": str(ranking.user.id),
-                    "nickname": ranking.user.nickname,
-                    "avatar_url": ranking.user.avatar_url,
-                    "crew_name": ranking.user.crew_name,
-                    "runner_level": ranking.user.runner_level,
-                },
-                "best_duration_seconds": ranking.best_duration_seconds,
-                "best_pace_seconds_per_km": ranking.best_pace_seconds_per_km,
-                "run_count": ranking.run_count,
-                "achieved_at": ranking.achieved_at,
-            })
+        result = await db.execute(
+            select(ranked, in_page.label("in_page"))
+            .where(wanted)
+            .order_by(ranked.c.position)
+        )
+        rows = result.all()
 
-        my_ranking = None
-        if requesting_user_id:
-            my_conditions = [
-                Ranking.course_id == course_id,
-                Ranking.user_id == requesting_user_id,
-            ]
-            my_result = await db.execute(
-                select(Ranking).where(*my_conditions)
-            )
-            my_entry = my_result.scalar_one_or_none()
-            if my_entry:
-                # Compute rank within the filtered set
-                rank_conditions = [
-                    Ranking.course_id == course_id,
-                    Ranking.best_duration_seconds < my_entry.best_duration_seconds,
-                ]
-                if country:
-                    rank_conditions.append(Ranking.user.has(User.country == country))
-                rank_result = await db.execute(
-                    select(func.count(Ranking.id)).where(*rank_conditions)
-                )
-                filtered_rank = (rank_result.scalar() or 0) + 1
+        if rows:
+            total_runners = rows[0].total
+        elif page > 0:
+            # Past the last page with no own row: the window count is lost.
+            total_runners = await self._count_runners(db, course_id, country)
+        else:
+            total_runners = 0
 
+        data = []
+        my_ranking = None
+        for row in rows:
+            if row.in_page:
+                data.append({
+                    "rank": row.position,
+                    "user": {
+                        "id": str(row.user_id),
+                        "nickname": row.nickname,
+                        "avatar_url": row.avatar_url,
+                        "crew_name": row.crew_name,
+                        "runner_level": row.runner_level,
+                    },
+                    "best_duration_seconds": row.best_duration_seconds,
+                    "best_pace_seconds_per_km": row.best_pace_seconds_per_km,
+                    "run_count": row.run_count,
+                    "achieved_at": row.achieved_at,
+                })
+            if requesting_user_id and row.user_id == requesting_user_id:
                 my_ranking = {
-                    "rank": filtered_rank,
-                    "best_duration_seconds": my_entry.best_duration_seconds,
-                    "best_pace_seconds_per_km": my_entry.best_pace_seconds_per_km,
+                    "rank": row.tie_rank,
+                    "best_duration_seconds": row.best_duration_seconds,
+                    "best_pace_seconds_per_km": row.best_pace_seconds_per_km,
                 }
 
+        await cache_set(
+            cache_key, [data, total_runners], self.LEADERBOARD_CACHE_TTL_SECONDS
+        )
         return {
             "data": data,
             "my_ranking": my_ranking,
             "total_runners": total_runners,
         }
 
+    @staticmethod
+    def leaderboard_cache_namespace(course_id: UUID) -> str:
+        """Cache namespace for a course's leaderboard pages."""
+        return f"leaderboard:{course_id}"
+
     async def get_my_ranking(
         self,
         db: AsyncSession,
         course_id: UUID,
         user_id: UUID,
     ) -> dict:
-        """Get the current user's ranking on a specific course."""
-        total_result = await db.execute(
-            select(func.count(Ranking.id)).where(Ranking.course_id == course_id)
-        )
-        total_runners = total_result.scalar() or 0
+        """Get the current user's ranking on a specific course.
 
-        result = await db.execute(
-            select(Ranking).where(
+        Total, personal best and rank come back from one row of scalar
+        subqueries, so a user without an entry still gets the total.
+        """
+        best = (
+            select(Ranking.best_duration_seconds)
+            .where(Ranking.course_id == course_id, Ranking.user_id == user_id)
+            .scalar_subquery()
+        )
+        faster = (
+            select(func.count(Ranking.id))
+            .where(
                 Ranking.course_id == course_id,
-                Ranking.user_id == user_id,
+                Ranking.best_duration_seconds < best,
             )
+            .scalar_subquery()
         )
-        my_entry = result.scalar_one_or_none()
+        total = (
+            select(func.count(Ranking.id))
+            .where(Ranking.course_id == course_id)
+            .scalar_subquery()
+        )
+        row = (await db.execute(select(
+            total.label("total_runners"),
+            best.label("best_duration_seconds"),
+            (faster + 1).label("rank"),
+        ))).one()
+        total_runners = row.total_runners or 0
 
-        if my_entry is None:
+        if row.best_duration_seconds is None:
             return {
                 "rank": None,
                 "best_duration_seconds": None,
@@ -132,12 +181,12 @@ class RankingService:
                 "percentile": None,
             }
 
-        rank = my_entry.rank or await self._compute_rank(db, course_id, my_entry.best_duration_seconds)
+        rank = row.rank
         percentile = (rank / total_runners * 100) if total_runners > 0 else None
 
         return {
             "rank": rank,
-            "best_duration_seconds": my_entry.best_duration_seconds,
+            "best_duration_seconds": row.best_duration_seconds,
             "total_runners": total_runners,
             "percentile": round(percentile, 1) if percentile is not None else None,
         }
@@ -224,13 +273,19 @@ class RankingService:
         return ranking
 
     async def recalculate_ranks(self, db: AsyncSession, course_id: UUID) -> None:
-        """Recalculate cached rank values for all entries on a course."""
+        """Recalculate cached rank values for all entries on a course.
+
+        One set-based UPDATE. Ties are broken by id, matching the leaderboard
+        order, and rows whose rank is unchanged are not rewritten, so a
+        recalculation after one upsert touches only the shifted rows.
+        """
         await db.execute(
             text(
                 "UPDATE rankings SET rank = sub.new_rank "
-                "FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY best_duration_seconds ASC) as new_rank "
+                "FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY best_duration_seconds ASC, id) as new_rank "
                 "FROM rankings WHERE course_id = :course_id) sub "
-                "WHERE rankings.id = sub.id"
+                "WHERE rankings.id = sub.id "
+                "AND rankings.rank IS DISTINCT FROM sub.new_rank"
             ),
             {"course_id": str(course_id)},
         )
@@ -240,18 +295,54 @@ class RankingService:
     # Private helpers
     # -----------------------------------------------------------------------
 
-    async def _compute_rank(
+    async def _get_my_ranking_entry(
         self,
         db: AsyncSession,
         course_id: UUID,
-        duration: int,
-    ) -> int:
-        """Compute a user's rank based on duration."""
-        result = await db.execute(
-            select(func.count(Ranking.id)).where(
-                Ranking.course_id == course_id,
-                Ranking.best_duration_seconds < duration,
-            )
+        user_id: UUID,
+        country: str | None = None,
+    ) -> dict | None:
+        """The user's leaderboard entry with its tie-aware rank, in one query."""
+        mine = aliased(Ranking)
+        faster_conditions = [
+            Ranking.course_id == course_id,
+            Ranking.best_duration_seconds < mine.best_duration_seconds,
+        ]
+        mine_conditions = [mine.course_id == course_id, mine.user_id == user_id]
+        if country:
+            faster_conditions.append(Ranking.user.has(User.country == country))
+            mine_conditions.append(mine.user.has(User.country == country))
+
+        faster = (
+            select(func.count(Ranking.id))
+            .where(*faster_conditions)
+            .correlate(mine)
+            .scalar_subquery()
         )
-        count = result.scalar() or 0
-        return count + 1
+        stmt = select(
+            mine.best_duration_seconds,
+            mine.best_pace_seconds_per_km,
+            (faster + 1).label("rank"),
+        ).where(*mine_conditions)
+
+        row = (await db.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+        return {
+            "rank": row.rank,
+            "best_duration_seconds": row.best_duration_seconds,
+            "best_pace_seconds_per_km": row.best_pace_seconds_per_km,
+        }
+
+    async def _count_runners(
+        self,
+        db: AsyncSession,
+        course_id: UUID,
+        country: str | None = None,
+    ) -> int:
+        """Count ranked runners on a course, optionally within one country."""
+        conditions = [Ranking.course_id == course_id]
+        if country:
+            conditions.append(Ranking.user.has(User.country == country))
+        result = await db.execute(select(func.count(Ranking.id)).where(*conditions))
+        return result.scalar() or 0
@@ -30,21 +30,26 @@ class ReviewService:
             NotFoundError: Course does not exist.
             ConflictError: User already reviewed this course.
         """
-        # Verify course exists
-        course_result = await db.execute(
-            select(Course.id).where(Course.id == course_id)
-        )
-        if course_result.scalar_one_or_none() is None:
-            raise NotFoundError(code="NOT_FOUND", message="코스를 찾을 수 없습니다")
-
-        # Check for duplicate review
-        duplicate_result = await db.execute(
-            select(Review.id).where(
+        # Course existence and duplicate check in one round trip
+        course_exists = select(Course.id).where(Course.id == course_id).exists()
+        already_reviewed = (
+            select(Review.id)
+            .where(
                 Review.course_id == course_id,
                 Review.user_id == user_id,
             )
+            .exists()
         )
-        if duplicate_result.scalar_one_or_none() is not None:
+        check_result = await db.execute(
+            select(
+                course_exists.label("course_exists"),
+                already_reviewed.label("already_reviewed"),
+            )
+        )
+        check = check_result.one()
+        if not check.course_exists:
+            raise NotFoundError(code="NOT_FOUND", message="코스를 찾을 수 없습니다")
+        if check.already_reviewed:
             raise ConflictError(
                 code="DUPLICATE_REVIEW",
                 message="이미 이 코스에 리뷰를 작성하셨습니다",
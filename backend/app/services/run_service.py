@@ -16,7 +16,7 @@ from app.models.run_chunk import RunChunk
 from app.models.run_record import RunRecord
 from app.models.run_session import RunSession
 from app.models.user import User
-from app.services.map_matching_service import MapMatchingService
+from app.services.map_matching_service import get_map_matcher
 from app.services.speed_anomaly_service import analyze_run
 
 import logging
@@ -278,9 +278,8 @@ class RunService:
             coords = route_geo_data.get("coordinates", [])
             if len(coords) >= 2:
                 try:
-                    matcher = MapMatchingService()
+                    matcher = get_map_matcher()
                     match_result = await matcher.match_route(coords)
-                    await matcher.close()
                     matched_coords = match_result.coordinates
                     confidence = match_result.confidence or 0
                     # Only use matched route if quality is acceptable:
@@ -101,6 +101,21 @@ def recalculate_rankings_task(
         raise self.retry(exc=exc)
 
 
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def recalculate_course_difficulties_task(self) -> None:
+    """Recalculate difficulty for all courses in one batch.
+
+    Wraps CourseService.recalculate_difficulty_all.
+    """
+    logger.info("[celery] recalculate_course_difficulties")
+    try:
+        updated = _run_async(_recalculate_course_difficulties())
+        logger.info("[celery] recalculate_course_difficulties: %d updated", updated)
+    except Exception as exc:
+        logger.exception("[celery] recalculate_course_difficulties failed")
+        raise self.retry(exc=exc)
+
+
 # ---------------------------------------------------------------------------
 # Async implementations (delegate to existing services)
 # ---------------------------------------------------------------------------
@@ -144,3 +159,13 @@ async def _recalculate_rankings(
         user_id=user_id,
         run_record_id=run_record_id,
     )
+
+
+async def _recalculate_course_difficulties() -> int:
+    from app.db.session import async_session_factory
+    from app.services.course_service import CourseService
+
+    async with async_session_factory() as db:
+        updated = await CourseService().recalculate_difficulty_all(db)
+        await db.commit()
+    return updated
@@ -0,0 +1,24 @@
+"""Background task: snap a newly created course's route to the road network."""
+
+import logging
+from uuid import UUID
+
+from app.db.session import async_session_factory
+from app.services.course_service import CourseService
+
+logger = logging.getLogger(__name__)
+
+
+async def match_course_route(course_id: UUID, coordinates: list[list[float]]) -> None:
+    """Map match a course's raw route and store the result.
+
+    create_course saves the raw GPS route with is_processing=true so the
+    request does not wait on the Mapbox Map Matching API; this replaces it
+    with the matched route and clears the flag.
+    """
+    try:
+        async with async_session_factory() as db:
+            await CourseService().apply_map_matching(db, course_id, coordinates)
+            await db.commit()
+    except Exception:
+        logger.exception("Failed to map match route for course %s", course_id)
@@ -0,0 +1,51 @@
+"""Background task: refresh the mv_public_courses materialized view."""
+
+import asyncio
+import logging
+
+from app.core.cache import invalidate_namespace
+from app.db.session import async_session_factory
+from app.services.course_service import CourseService
+
+logger = logging.getLogger(__name__)
+
+# How often the app-level loop refreshes the view, on top of the
+# refreshes requested after course create/update/delete.
+REFRESH_INTERVAL_SECONDS = 5 * 60
+
+_refresh_lock = asyncio.Lock()
+_refresh_requested = False
+
+
+async def refresh_public_courses_view() -> None:
+    """Re-materialize the public course list used by CourseService.list_courses.
+
+    Cached list/nearby responses are invalidated once the refresh commits.
+    """
+    try:
+        async with async_session_factory() as db:
+            await CourseService().refresh_public_courses_view(db)
+            await db.commit()
+    except Exception:
+        logger.exception("Failed to refresh mv_public_courses")
+        return
+
+    await invalidate_namespace(CourseService.CACHE_NAMESPACE)
+
+
+async def request_public_courses_refresh() -> None:
+    """Refresh the view after a committed course write, coalescing bursts.
+
+    Each refresh re-materializes every public course, so requests that
+    arrive while one is running are folded into a single follow-up refresh
+    instead of queueing one each behind the view lock.
+    """
+    global _refresh_requested
+    _refresh_requested = True
+    if _refresh_lock.locked():
+        return  # The running refresh loop picks this request up
+
+    async with _refresh_lock:
+        while _refresh_requested:
+            _refresh_requested = False
+            await refresh_public_courses_view()
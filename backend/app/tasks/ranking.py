@@ -6,6 +6,7 @@ from uuid import UUID
 
 from sqlalchemy import select
 
+from app.core.cache import invalidate_namespace
 from app.db.session import async_session_factory
 from app.models.crew import CrewMember
 from app.models.crew_challenge import CrewChallenge, CrewChallengeRecord
@@ -171,6 +172,9 @@ async def recalculate_course_ranking(
                     streak.last_run_date = today
 
             await db.commit()
+            await invalidate_namespace(
+                RankingService.leaderboard_cache_namespace(course_id)
+            )
             logger.info("Ranking recalculated for course %s", course_id)
 
     except Exception:
@@ -1,7 +1,7 @@
 """API tests for user profile endpoints."""
 
 import uuid
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.models.user import User
 
@@ -169,3 +169,23 @@ class TestUpdateProfile:
             json={"nickname": "Hacker"},
         )
         assert response.status_code == 401
+
+
+# ── DELETE /users/me/account ────────────────────────────────────────
+
+
+class TestDeleteAccount:
+    async def test_releases_event_seats_before_cascade(self, client, mock_db, test_user):
+        """Participant rows go by cascade, so their event seats are freed first."""
+        calls = []
+        mock_db.execute.side_effect = lambda stmt, *a, **kw: calls.append(str(stmt))
+        mock_db.delete.side_effect = lambda obj: calls.append("DELETE user")
+
+        with patch("app.api.v1.users.invalidate_namespace", AsyncMock()) as invalidate:
+            response = await client.delete("/api/v1/users/me/account")
+
+        assert response.status_code == 200
+        seats = next(i for i, sql in enumerate(calls) if sql.startswith("UPDATE events"))
+        assert seats < calls.index("DELETE user")
+        mock_db.delete.assert_awaited_once_with(test_user)
+        invalidate.assert_awaited_once_with("events")
@@ -0,0 +1,64 @@
+"""Unit tests for the Redis response cache helpers (Redis mocked)."""
+
+from unittest.mock import AsyncMock, patch
+
+from app.core import cache
+
+
+def _redis(**overrides):
+    client = AsyncMock()
+    client.get.return_value = None
+    for name, value in overrides.items():
+        setattr(client, name, value)
+    return client
+
+
+# ── Key construction ────────────────────────────────────────────────
+
+
+class TestMakeCacheKey:
+    async def test_key_is_versioned_and_order_independent(self):
+        client = _redis(get=AsyncMock(return_value=b"7"))
+        with patch.object(cache, "get_redis", return_value=client):
+            a = await cache.make_cache_key("courses", {"page": 0, "search": "han"})
+            b = await cache.make_cache_key("courses", {"search": "han", "page": 0})
+        assert a == b
+        assert a.startswith("courses:v7:")
+
+    async def test_returns_none_when_redis_down(self):
+        client = _redis(get=AsyncMock(side_effect=ConnectionError))
+        with patch.object(cache, "get_redis", return_value=client):
+            assert await cache.make_cache_key("courses", {"page": 0}) is None
+
+
+# ── Get / set ───────────────────────────────────────────────────────
+
+
+class TestCacheGetSet:
+    async def test_round_trip(self):
+        client = _redis()
+        with patch.object(cache, "get_redis", return_value=client):
+            await cache.cache_set("k", [[{"id": "a"}], 1], 45)
+            stored = client.setex.call_args.args[2]
+            client.get.return_value = stored
+            assert await cache.cache_get("k") == [[{"id": "a"}], 1]
+        assert client.setex.call_args.args[1] == 45
+
+    async def test_none_key_skips_redis(self):
+        client = _redis()
+        with patch.object(cache, "get_redis", return_value=client):
+            assert await cache.cache_get(None) is None
+            await cache.cache_set(None, {"a": 1}, 45)
+        client.get.assert_not_called()
+        client.setex.assert_not_called()
+
+    async def test_get_error_is_a_miss(self):
+        client = _redis(get=AsyncMock(side_effect=ConnectionError))
+        with patch.object(cache, "get_redis", return_value=client):
+            assert await cache.cache_get("k") is None
+
+    async def test_delete_error_is_swallowed(self):
+        client = _redis(delete=AsyncMock(side_effect=ConnectionError))
+        with patch.object(cache, "get_redis", return_value=client):
+            await cache.cache_delete("follow_counts:a", "follow_counts:b")
+        client.delete.assert_awaited_once_with("follow_counts:a", "follow_counts:b")
@@ -1,8 +1,14 @@
 """Unit tests for course business logic (no DB required)."""
 
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
 import pytest
 
+from app.services import course_service as course_module
 from app.services.course_service import CourseService, generate_thumbnail_url
+from app.tasks import public_courses as public_courses_module
 
 
 # ── Difficulty algorithm ────────────────────────────────────────────
@@ -123,3 +129,179 @@ class TestGenerateThumbnailUrl:
         url = generate_thumbnail_url(geometry, "pk.test")
         assert "outdoors-v12" in url
         assert "600x300@2x" in url
+
+
+# ── Thumbnail write-back ────────────────────────────────────────────
+
+
+class TestStoreThumbnailUrls:
+    async def test_no_urls_skips_query(self, mock_db):
+        await CourseService()._store_thumbnail_urls(mock_db, {})
+        mock_db.execute.assert_not_called()
+
+    async def test_writes_all_urls_in_one_execute(self, mock_db):
+        urls = {"a": "https://example.com/a.png", "b": "https://example.com/b.png"}
+        await CourseService()._store_thumbnail_urls(mock_db, urls)
+
+        mock_db.execute.assert_awaited_once()
+        params = mock_db.execute.call_args[0][1]
+        assert params == [
+            {"course_id": "a", "url": "https://example.com/a.png"},
+            {"course_id": "b", "url": "https://example.com/b.png"},
+        ]
+
+
+# ── Course list ─────────────────────────────────────────────────────
+
+
+class TestListCourses:
+    async def test_course_without_creator_has_empty_creator_id(self, mock_db):
+        row = MagicMock(
+            id=uuid4(),
+            thumbnail_url="https://example.com/t.png",
+            route_geometry=None,
+            creator_id=None,
+            creator_nickname=None,
+            creator_avatar_url=None,
+            total_count=1,
+        )
+        mock_db.execute.return_value.all.return_value = [row]
+
+        with patch.object(course_module, "make_cache_key", AsyncMock(return_value=None)):
+            courses, total = await CourseService().list_courses(mock_db)
+
+        assert total == 1
+        assert courses[0]["creator"] == {"id": "", "nickname": None, "avatar_url": None}
+
+
+    async def test_page_past_end_counts_separately(self, mock_db):
+        mock_db.execute.return_value.scalar.return_value = 42
+
+        with patch.object(course_module, "make_cache_key", AsyncMock(return_value=None)):
+            courses, total = await CourseService().list_courses(mock_db, page=5)
+
+        assert (courses, total) == ([], 42)
+        assert mock_db.execute.await_count == 2
+
+    async def test_empty_first_page_skips_count(self, mock_db):
+        with patch.object(course_module, "make_cache_key", AsyncMock(return_value=None)):
+            courses, total = await CourseService().list_courses(mock_db)
+
+        assert (courses, total) == ([], 0)
+        mock_db.execute.assert_awaited_once()
+
+
+# ── Nearby courses ──────────────────────────────────────────────────
+
+
+class TestGetNearbyCourses:
+    async def test_course_without_creator_is_kept(self, mock_db):
+        row = MagicMock(
+            id=uuid4(),
+            thumbnail_url="https://example.com/t.png",
+            route_geometry=None,
+            creator_nickname=None,
+        )
+        mock_db.execute.return_value.all.return_value = [row]
+
+        with patch.object(course_module, "make_cache_key", AsyncMock(return_value=None)):
+            nearby = await CourseService().get_nearby_courses(mock_db, 37.5, 127.0)
+
+        assert len(nearby) == 1
+        assert nearby[0]["creator_nickname"] is None
+        sql = str(mock_db.execute.await_args_list[0].args[0])
+        assert "LEFT OUTER JOIN users" in sql
+
+
+# ── Map matching write-back ─────────────────────────────────────────
+
+
+class TestApplyMapMatching:
+    """is_processing must be cleared whatever happens to the matched route."""
+
+    @staticmethod
+    async def _apply(mock_db, match_route):
+        matcher = MagicMock(match_route=match_route)
+        with patch.object(course_module, "get_map_matcher", return_value=matcher):
+            await CourseService().apply_map_matching(
+                mock_db, uuid4(), [[127.0, 37.5, 1.0], [127.01, 37.51, 2.0]]
+            )
+        return mock_db.execute.await_args.args[0].compile().params
+
+    async def test_matched_route_is_stored(self, mock_db):
+        matched = MagicMock(coordinates=[[127.0, 37.5, 1.0], [127.01, 37.51, 2.0]])
+        params = await self._apply(mock_db, AsyncMock(return_value=matched))
+        assert params["is_processing"] is False
+        assert "route_geojson" in params
+
+    async def test_matcher_failure_still_clears_flag(self, mock_db):
+        params = await self._apply(mock_db, AsyncMock(side_effect=RuntimeError("mapbox")))
+        assert params["is_processing"] is False
+        assert "route_geojson" not in params
+
+    async def test_geometry_failure_still_clears_flag(self, mock_db):
+        matched = MagicMock(coordinates=[[127.0, 37.5, 1.0], ["bad"]])
+        params = await self._apply(mock_db, AsyncMock(return_value=matched))
+        assert params["is_processing"] is False
+        assert "route_geojson" not in params
+
+
+# ── Public course view refresh ──────────────────────────────────────
+
+
+class TestPublicCoursesRefresh:
+    async def test_burst_of_writes_coalesces_into_two_refreshes(self):
+        calls = 0
+
+        async def slow_refresh():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+
+        with patch.object(public_courses_module, "refresh_public_courses_view", slow_refresh):
+            await asyncio.gather(
+                *(public_courses_module.request_public_courses_refresh() for _ in range(5))
+            )
+
+        # The first request refreshes; the rest share one follow-up refresh
+        assert calls == 2
+
+
+class TestComputeDifficultyBatch:
+    def test_matches_scalar_formula(self):
+        cases = [
+            (1000, 0, None),
+            (5000, 100, None),
+            (15000, 500, None),
+            (0, 0, None),
+            (3000, 50, 1.0),
+            (3000, 50, 0.0),
+            (10000, 90, 0.5),
+        ]
+        batch = CourseService._compute_difficulty_batch(
+            [c[0] for c in cases],
+            [c[1] for c in cases],
+            [float("nan") if c[2] is None else c[2] for c in cases],
+        )
+        expected = [
+            CourseService._compute_difficulty(
+                distance_meters=d, elevation_gain_meters=e, completion_rate=r
+            )
+            for d, e, r in cases
+        ]
+        assert batch == expected
+
+
+class TestRecalculateDifficultyBulk:
+    async def test_empty_pairs_skips_query(self, mock_db):
+        await CourseService().recalculate_difficulty_bulk(mock_db, [])
+        mock_db.execute.assert_not_called()
+
+    async def test_one_statement_per_chunk(self, mock_db):
+        service = CourseService()
+        service.BULK_UPDATE_CHUNK_SIZE = 2
+        pairs = [(uuid4(), "easy") for _ in range(5)]
+
+        await service.recalculate_difficulty_bulk(mock_db, pairs)
+
+        assert mock_db.execute.await_count == 3
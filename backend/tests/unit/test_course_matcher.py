@@ -0,0 +1,56 @@
+"""Unit tests for the vectorized route matcher (no DB required)."""
+
+import math
+
+import numpy as np
+
+from app.services.course_matcher import (
+    Point2D,
+    calculate_route_match,
+    calculate_route_match_arrays,
+    classify_segments,
+    point_to_linestring_distance,
+)
+
+
+def _course() -> list[Point2D]:
+    # A gentle S-bend with a repeated vertex (zero-length segment)
+    pts = [
+        Point2D(lat=37.5 + 0.004 * math.sin(i / 6), lng=127.0 + 0.0005 * i)
+        for i in range(40)
+    ]
+    pts.insert(10, pts[10])
+    return pts
+
+
+def _runner(offset: float) -> list[Point2D]:
+    return [
+        Point2D(lat=37.5 + 0.004 * math.sin(i / 24) + offset, lng=127.0 + 0.000125 * i)
+        for i in range(157)
+    ]
+
+
+class TestCalculateRouteMatch:
+    def test_matches_scalar_distances(self):
+        course, runner = _course(), _runner(0.0003)
+        result = calculate_route_match(runner, course)
+
+        dists = [point_to_linestring_distance(p, course) for p in runner]
+        assert result.max_deviation_meters == round(max(dists), 1)
+        assert result.curve_section_count == sum(classify_segments(course))
+        assert result.total_points == len(runner)
+
+    def test_on_route_completes(self):
+        result = calculate_route_match(_runner(0.0), _course())
+        assert result.is_completed
+        assert result.deviation_points == 0
+
+    def test_off_route_fails(self):
+        result = calculate_route_match(_runner(0.01), _course())
+        assert not result.is_completed
+        assert result.route_match_percent == 0.0
+
+    def test_empty_inputs(self):
+        result = calculate_route_match_arrays(np.empty((0, 2)), np.empty((0, 2)))
+        assert result.total_points == 0
+        assert not result.is_completed
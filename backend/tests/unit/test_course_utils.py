@@ -1,11 +1,17 @@
 """Unit tests for course utility functions (no DB required)."""
 
 import pytest
+from geoalchemy2.shape import from_shape
+from shapely.geometry import LineString
 
 from app.services.course_service import (
+    CourseService,
     _haversine,
     _interpolate_along_line,
     _generate_checkpoints,
+    _geojson_line_geometry,
+    _line_from_coords,
+    _route_geojson,
     generate_thumbnail_url,
     get_route_preview,
 )
@@ -87,6 +93,44 @@ class TestInterpolateAlongLine:
         assert result[1] > 37.51
 
 
+# ── LineString construction ──────────────────────────────────────
+
+
+class TestLineFromCoords:
+    """Test _line_from_coords: 2D LineString from [lng, lat(, alt)] coordinates."""
+
+    def test_drops_altitude(self):
+        line = _line_from_coords([[127.0, 37.5, 10.0], [127.01, 37.51, 12.0]])
+        assert not line.has_z
+        assert list(line.coords) == [(127.0, 37.5), (127.01, 37.51)]
+
+    def test_mixed_2d_and_3d_points(self):
+        line = _line_from_coords([[127.0, 37.5], [127.01, 37.51, 12.0]])
+        assert list(line.coords) == [(127.0, 37.5), (127.01, 37.51)]
+
+
+class TestGeojsonLineGeometry:
+    """_geojson_line_geometry serializes the 2D line as one GeoJSON parameter."""
+
+    @staticmethod
+    def _geojson_param(expr) -> str:
+        return next(
+            v for v in expr.compile().params.values()
+            if isinstance(v, str) and v.startswith("{")
+        )
+
+    def test_uniform_3d_points(self):
+        # Map-matched and client routes are all [lng, lat, alt]
+        expr = _geojson_line_geometry([[127.0, 37.5, 1.0], [127.1, 37.6, 2.0]])
+        assert self._geojson_param(expr) == (
+            '{"type":"LineString","coordinates":[[127.0,37.5],[127.1,37.6]]}'
+        )
+
+    def test_2d_points(self):
+        expr = _geojson_line_geometry([[127.0, 37.5], [127.1, 37.6]])
+        assert '"coordinates":[[127.0,37.5],[127.1,37.6]]' in self._geojson_param(expr)
+
+
 # ── Generate checkpoints ─────────────────────────────────────────
 
 
@@ -192,3 +236,34 @@ class TestGenerateThumbnailUrl:
 
     def test_empty_geometry_returns_none(self):
         assert generate_thumbnail_url({}, "pk.test") is None
+
+
+# ── WKB to GeoJSON ───────────────────────────────────────────────
+
+
+class TestWkbToGeojson:
+    """Test CourseService._wkb_to_geojson: WKBElement -> {"type", "coordinates"}."""
+
+    def test_none_returns_none(self):
+        assert CourseService._wkb_to_geojson(None) is None
+
+    def test_2d_line_gets_zero_altitude(self):
+        wkb = from_shape(LineString([(127.0, 37.5), (127.01, 37.51)]), srid=4326)
+        assert CourseService._wkb_to_geojson(wkb) == {
+            "type": "LineString",
+            "coordinates": [[127.0, 37.5, 0.0], [127.01, 37.51, 0.0]],
+        }
+
+    def test_3d_line_keeps_altitude(self):
+        wkb = from_shape(LineString([(127.0, 37.5, 12.0), (127.01, 37.51, 15.5)]), srid=4326)
+        result = CourseService._wkb_to_geojson(wkb)
+        assert result["coordinates"] == [[127.0, 37.5, 12.0], [127.01, 37.51, 15.5]]
+
+
+class TestRouteGeojson:
+    """_route_geojson must match what _wkb_to_geojson returns for the stored line."""
+
+    def test_matches_wkb_decode(self):
+        coords = [[127.0, 37.5, 12.0], [127.01, 37.51], [127.02, 37.52, 3.0]]
+        wkb = from_shape(_line_from_coords(coords), srid=4326)
+        assert _route_geojson(coords) == CourseService._wkb_to_geojson(wkb)
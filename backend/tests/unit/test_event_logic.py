@@ -0,0 +1,192 @@
+"""Unit tests for event listing and participation logic (no DB required)."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import ConflictError, ValidationError
+from app.services import event_service as event_module
+from app.services.event_service import EventService
+
+
+def _cached_event(event_id) -> dict:
+    return {
+        "id": str(event_id),
+        "title": "한강 10K",
+        "participant_count": 3,
+        "is_participating": False,
+        "my_progress_distance_meters": None,
+        "my_progress_runs": None,
+    }
+
+
+# ── Loader options ──────────────────────────────────────────────────
+
+
+class TestViewerSelect:
+    def test_only_creator_is_joined(self):
+        sql = str(EventService()._select_events_for_viewer(uuid4()))
+        assert "JOIN users" in sql
+        assert "courses" not in sql
+        assert "course_stats" not in sql
+
+
+# ── Active events cache ─────────────────────────────────────────────
+
+
+class TestActiveEventsCache:
+    async def test_hit_overlays_caller_participation(self, mock_db):
+        joined, other = uuid4(), uuid4()
+        cached = [[_cached_event(joined), _cached_event(other)], 2, False]
+        mock_db.execute.return_value.all.return_value = [(joined, 1500, 2)]
+
+        with (
+            patch.object(event_module, "make_cache_key", AsyncMock(return_value="events:v0:x")),
+            patch.object(event_module, "cache_get", AsyncMock(return_value=cached)),
+        ):
+            events, total, has_more = await EventService().get_active_events(
+                mock_db, current_user_id=uuid4()
+            )
+
+        assert (total, has_more) == (2, False)
+        assert mock_db.execute.await_count == 1
+        assert events[0]["is_participating"] is True
+        assert events[0]["my_progress_distance_meters"] == 1500
+        assert events[0]["my_progress_runs"] == 2
+        assert events[1]["is_participating"] is False
+        assert events[1]["my_progress_runs"] is None
+
+
+    async def test_detail_hit_overlays_caller_participation(self, mock_db):
+        event_id = uuid4()
+        mock_db.execute.return_value.all.return_value = [(event_id, 800, 1)]
+
+        with (
+            patch.object(event_module, "make_cache_key", AsyncMock(return_value="events:v0:y")),
+            patch.object(event_module, "cache_get", AsyncMock(return_value=_cached_event(event_id))),
+        ):
+            event = await EventService().get_event_by_id(
+                mock_db, event_id, current_user_id=uuid4()
+            )
+
+        assert event["is_participating"] is True
+        assert event["my_progress_distance_meters"] == 800
+        assert mock_db.execute.await_count == 1
+
+
+class TestMapMarkerBounds:
+    async def test_bounds_widen_to_grid(self, mock_db):
+        make_key = AsyncMock(return_value=None)
+        with (
+            patch.object(event_module, "make_cache_key", make_key),
+            patch.object(event_module, "cache_get", AsyncMock(return_value=[])),
+        ):
+            await EventService().get_event_map_markers(
+                mock_db, sw_lat=37.5123, sw_lng=126.9871, ne_lat=37.5391, ne_lng=127.0012
+            )
+
+        params = make_key.await_args.args[1]
+        assert params["bounds"] == [37.51, 126.98, 37.54, 127.01]
+
+
+# ── Joining ─────────────────────────────────────────────────────────
+
+
+class TestJoinEvent:
+    """An empty RETURNING from the claim-and-insert statement is diagnosed
+    with one follow-up query."""
+
+    @staticmethod
+    def _diagnosis(mock_db, **overrides):
+        row = MagicMock(
+            is_active=True,
+            ends_at=datetime.now(UTC) + timedelta(days=1),
+            already_joined=False,
+        )
+        for name, value in overrides.items():
+            setattr(row, name, value)
+        mock_db.execute.return_value.one_or_none.return_value = row
+
+    async def test_no_seat_is_full(self, mock_db):
+        self._diagnosis(mock_db)
+        with pytest.raises(ConflictError) as exc:
+            await EventService().join_event(mock_db, uuid4(), uuid4())
+        assert exc.value.code == "EVENT_FULL"
+        assert mock_db.execute.await_count == 2
+
+    async def test_already_joined_wins_over_full(self, mock_db):
+        self._diagnosis(mock_db, already_joined=True)
+        with pytest.raises(ConflictError) as exc:
+            await EventService().join_event(mock_db, uuid4(), uuid4())
+        assert exc.value.code == "ALREADY_JOINED"
+
+    async def test_ended_event(self, mock_db):
+        self._diagnosis(mock_db, ends_at=datetime.now(UTC) - timedelta(hours=1))
+        with pytest.raises(ValidationError) as exc:
+            await EventService().join_event(mock_db, uuid4(), uuid4())
+        assert exc.value.code == "EVENT_ENDED"
+
+
+class TestReleaseUserSeats:
+    async def test_decrements_every_joined_event_in_one_update(self, mock_db):
+        await EventService().release_user_seats(mock_db, uuid4())
+
+        mock_db.execute.assert_awaited_once()
+        sql = str(mock_db.execute.await_args.args[0])
+        assert sql.startswith("UPDATE events")
+        assert "greatest(events.participant_count - " in sql
+        assert "event_participants.user_id = " in sql
+
+
+# ── Progress ────────────────────────────────────────────────────────
+
+
+class TestBulkUpdateProgress:
+    async def test_empty_updates_skips_query(self, mock_db):
+        await EventService().bulk_update_participant_progress(mock_db, [])
+        mock_db.execute.assert_not_called()
+
+    async def test_one_statement_per_chunk(self, mock_db):
+        service = EventService()
+        service.BULK_UPDATE_CHUNK_SIZE = 2
+        updates = [(uuid4(), uuid4(), 5000, 3) for _ in range(5)]
+
+        await service.bulk_update_participant_progress(mock_db, updates)
+
+        assert mock_db.execute.await_count == 3
+
+
+# ── Query budgets ───────────────────────────────────────────────────
+
+
+@pytest.fixture
+def no_cache():
+    """Force the cache-miss path regardless of Redis availability."""
+    with patch.object(event_module, "make_cache_key", AsyncMock(return_value=None)):
+        yield
+
+
+class TestQueryBudgets:
+    """Round trips per call, so N+1 lookups cannot creep back in."""
+
+    async def test_active_events(self, mock_db, no_cache):
+        await EventService().get_active_events(mock_db, current_user_id=uuid4())
+        assert mock_db.execute.await_count == 1
+
+    async def test_event_detail(self, mock_db, no_cache):
+        mock_db.execute.return_value.one_or_none.return_value = MagicMock()
+        await EventService().get_event_by_id(mock_db, uuid4(), current_user_id=uuid4())
+        assert mock_db.execute.await_count == 1
+
+    async def test_map_markers(self, mock_db, no_cache):
+        await EventService().get_event_map_markers(
+            mock_db, sw_lat=37.4, sw_lng=126.8, ne_lat=37.7, ne_lng=127.2
+        )
+        assert mock_db.execute.await_count == 1
+
+    async def test_join(self, mock_db):
+        mock_db.execute.return_value.scalar_one_or_none.return_value = MagicMock()
+        await EventService().join_event(mock_db, uuid4(), uuid4())
+        assert mock_db.execute.await_count == 1
@@ -0,0 +1,163 @@
+"""Unit tests for file parser distance and split helpers (no DB required)."""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.services import file_parser
+from app.services.file_parser import (
+    FileParserService,
+    TrackPoint,
+    _build_splits,
+    _cumulative_distances,
+    _haversine,
+    build_activity,
+)
+
+
+def _straight_track(n: int, step_deg: float = 0.0001) -> list[TrackPoint]:
+    """Points heading north, ~11 m apart, one second apart."""
+    start = datetime(2024, 1, 1)
+    return [
+        TrackPoint(lat=37.5 + i * step_deg, lng=127.0, alt=10.0 + i * 0.1,
+                   timestamp=start + timedelta(seconds=i))
+        for i in range(n)
+    ]
+
+
+class TestCumulativeDistances:
+    def test_matches_pointwise_haversine(self):
+        points = _straight_track(50)
+        expected = 0.0
+        cumulative = _cumulative_distances(points)
+        for i in range(1, len(points)):
+            expected += _haversine(points[i - 1].lat, points[i - 1].lng, points[i].lat, points[i].lng)
+            assert cumulative[i] == pytest.approx(expected)
+
+    def test_single_point_is_zero(self):
+        assert _cumulative_distances(_straight_track(1)).tolist() == [0.0]
+
+
+class TestElevationProfile:
+    def test_rounded_to_decimeters_without_missing_points(self):
+        points = _straight_track(4)
+        points[0].alt = 12.345678
+        points[2].alt = 0.0  # missing altitude
+        profile = build_activity(points).elevation_profile
+        assert profile == [12.3, 10.1, 10.3]
+
+
+class TestBuildSplits:
+    def test_one_split_per_km(self):
+        # ~3.5 km straight line
+        points = _straight_track(320)
+        splits = _build_splits(points)
+        assert [s.split_number for s in splits] == [1, 2, 3]
+        assert all(1000.0 <= s.distance_meters < 1012.0 for s in splits)
+
+    def test_short_track_has_no_splits(self):
+        assert _build_splits(_straight_track(50)) == []
+
+    def test_build_activity_distance_and_max_speed(self):
+        points = _straight_track(100)
+        points[0].speed = 9.0  # the first point's speed is never counted
+        points[10].speed = 4.0
+        activity = build_activity(points)
+        assert activity.distance_meters == int(_cumulative_distances(points)[-1])
+        assert activity.max_speed_ms == 4.0
+
+    def test_build_activity_column_arrays(self):
+        points = _straight_track(20)
+        points[5].alt = 0.0
+        activity = build_activity(points)
+        assert activity.lats.tolist() == [p.lat for p in points]
+        assert activity.lngs.tolist() == [p.lng for p in points]
+        assert activity.route_coordinates == [[p.lng, p.lat, p.alt] for p in points]
+        assert len(activity.elevation_profile) == 19
+
+
+def _gpx(n: int, namespace: str = "http://www.topografix.com/GPX/1/1") -> bytes:
+    """A two-segment GPX track with a waypoint that must be ignored."""
+    start = datetime(2024, 1, 1)
+    trkpts = [
+        f'<trkpt lat="{37.5 + i * 0.0001:.7f}" lon="127.0">'
+        + ("" if i % 7 == 0 else f"<ele>{10 + i * 0.1:.1f}</ele>")
+        + f"<time>{(start + timedelta(seconds=i)).isoformat()}Z</time></trkpt>"
+        for i in range(n)
+    ]
+    half = n // 2
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>'
+        f'<gpx version="1.1" creator="Test Watch" xmlns="{namespace}">'
+        '<wpt lat="1.0" lon="2.0"/><trk>'
+        f"<trkseg>{''.join(trkpts[:half])}</trkseg>"
+        f"<trkseg>{''.join(trkpts[half:])}</trkseg>"
+        "</trk></gpx>"
+    ).encode()
+
+
+class TestParseGpx:
+    def test_streaming_matches_gpxpy(self):
+        parser = FileParserService()
+        content = _gpx(150)
+        activity = parser.parse_gpx(content)
+        assert len(activity.points) == 150
+        assert activity.source_device == "Test Watch"
+        assert activity == parser._parse_gpx_dom(content)
+
+    def test_path_matches_bytes(self, tmp_path):
+        parser = FileParserService()
+        content = _gpx(50)
+        path = tmp_path / "run.gpx"
+        path.write_bytes(content)
+        assert parser.parse_gpx(path) == parser.parse_gpx(content)
+        assert parser._parse_gpx_dom(str(path)) == parser.parse_gpx(content)
+
+    def test_no_track_points_returns_empty_activity(self):
+        activity = FileParserService().parse_gpx(_gpx(0))
+        assert activity.points == []
+        assert activity.distance_meters == 0
+
+
+def _fit_message(name: str, **values) -> SimpleNamespace:
+    fields = [SimpleNamespace(name=k, value=v) for k, v in values.items()]
+    return SimpleNamespace(name=name, fields=fields)
+
+
+class TestParseFit:
+    def test_records_and_device(self):
+        start = datetime(2024, 1, 1)
+        semis_per_deg = 2 ** 31 / 180.0
+        records = [
+            _fit_message(
+                "record",
+                position_lat=int((37.5 + i * 0.0001) * semis_per_deg),
+                position_long=int(127.0 * semis_per_deg),
+                altitude=10.0 + i,
+                timestamp=start + timedelta(seconds=i),
+                speed=3.0,
+                heart_rate=150,
+            )
+            for i in range(100)
+        ]
+        records.insert(10, _fit_message("record", timestamp=start))  # no position
+        records.insert(20, _fit_message("record", position_lat=2 ** 31 - 1, position_long=0))  # > 90 deg
+        messages = [
+            _fit_message("file_id", manufacturer="garmin"),
+            *records[:50],
+            _fit_message("device_info", product_name="Forerunner 965"),
+            _fit_message("device_info", product_name="HRM-Pro Plus"),
+            *records[50:],
+        ]
+        fit = SimpleNamespace(get_messages=lambda names: iter(messages))
+
+        with patch.object(file_parser, "FitFile", return_value=fit):
+            activity = FileParserService().parse_fit(b"")
+
+        assert len(activity.points) == 100
+        assert activity.source_device == "Forerunner 965"
+        first = activity.points[0]
+        assert first.lat == records[0].fields[0].value * (180.0 / 2 ** 31)
+        assert (first.alt, first.speed, first.heart_rate) == (10.0, 3.0, 150)
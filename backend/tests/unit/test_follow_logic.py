@@ -0,0 +1,178 @@
+"""Unit tests for follow service logic (no DB required)."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core.exceptions import ConflictError, NotFoundError, ValidationError
+from app.services import follow_service as follow_module
+from app.services.follow_service import FollowService
+
+
+class TestFollowStatus:
+    async def test_miss_counts_in_one_query_and_caches(self, mock_db):
+        mock_db.execute.return_value.one.return_value = (True, 12, 4)
+        cache_set = AsyncMock()
+
+        with (
+            patch.object(follow_module, "cache_get", AsyncMock(return_value=None)),
+            patch.object(follow_module, "cache_set", cache_set),
+        ):
+            status = await FollowService().get_follow_status(mock_db, uuid4(), uuid4())
+
+        assert status == {
+            "is_following": True,
+            "followers_count": 12,
+            "following_count": 4,
+        }
+        assert mock_db.execute.await_count == 1
+        assert cache_set.await_args.args[1] == [12, 4]
+
+    async def test_hit_only_probes_is_following(self, mock_db):
+        mock_db.execute.return_value.scalar_one.return_value = False
+
+        with patch.object(follow_module, "cache_get", AsyncMock(return_value=[30, 7])):
+            status = await FollowService().get_follow_status(mock_db, uuid4(), uuid4())
+
+        assert status == {
+            "is_following": False,
+            "followers_count": 30,
+            "following_count": 7,
+        }
+        assert mock_db.execute.await_count == 1
+        mock_db.execute.return_value.one.assert_not_called()
+
+
+class TestFollowUser:
+    async def test_self_follow_rejected_without_query(self, mock_db):
+        user_id = uuid4()
+        with pytest.raises(ValidationError):
+            await FollowService().follow_user(mock_db, user_id, user_id)
+        mock_db.execute.assert_not_called()
+
+    async def test_empty_returning_is_conflict(self, mock_db):
+        mock_db.execute.return_value.scalar_one_or_none.return_value = None
+
+        with pytest.raises(ConflictError) as exc:
+            await FollowService().follow_user(mock_db, uuid4(), uuid4())
+        assert exc.value.code == "ALREADY_FOLLOWING"
+        assert mock_db.execute.await_count == 1
+        mock_db.rollback.assert_not_called()
+        sql = str(mock_db.execute.await_args.args[0])
+        assert "ON CONFLICT" in sql
+
+    async def test_fk_violation_is_not_found(self, mock_db):
+        orig = Exception("fk")
+        orig.sqlstate = "23503"
+        mock_db.execute.side_effect = IntegrityError("INSERT", {}, orig)
+
+        with pytest.raises(NotFoundError):
+            await FollowService().follow_user(mock_db, uuid4(), uuid4())
+        mock_db.rollback.assert_awaited_once()
+
+
+@pytest.fixture
+def no_feed_cache():
+    """Force the cache-miss path regardless of Redis availability."""
+    with patch.object(follow_module, "make_cache_key", AsyncMock(return_value=None)):
+        yield
+
+
+class TestActivityFeed:
+    async def test_cache_hit_skips_db(self, mock_db):
+        cached = [{"type": "course_created", "user_id": "u"}]
+        with (
+            patch.object(follow_module, "make_cache_key", AsyncMock(return_value="k")),
+            patch.object(follow_module, "cache_get", AsyncMock(return_value=cached)),
+        ):
+            items = await FollowService().get_activity_feed(mock_db, uuid4())
+
+        assert items == cached
+        mock_db.execute.assert_not_called()
+
+    async def test_no_follows_skips_feed_query(self, mock_db, no_feed_cache):
+        assert await FollowService().get_activity_feed(mock_db, uuid4()) == []
+        assert mock_db.execute.await_count == 1
+
+    async def test_single_feed_query_stringifies_ids(self, mock_db, no_feed_cache):
+        user_id, run_id = uuid4(), uuid4()
+        mock_db.execute.return_value.scalars.return_value.all.return_value = [user_id]
+        mock_db.execute.return_value.mappings.return_value = [
+            {
+                "type": "run_completed",
+                "user_id": user_id,
+                "run_id": run_id,
+                "course_id": None,
+            }
+        ]
+
+        items = await FollowService().get_activity_feed(mock_db, uuid4())
+
+        assert mock_db.execute.await_count == 2
+        assert items[0]["user_id"] == str(user_id)
+        assert items[0]["run_id"] == str(run_id)
+        assert items[0]["course_id"] is None
+
+
+class TestFollowLists:
+    async def test_cursor_skips_offset_and_count(self, mock_db):
+        rows = [MagicMock() for _ in range(3)]
+        mock_db.execute.return_value.scalars.return_value.unique.return_value.all.return_value = rows
+
+        follows, total, has_more = await FollowService().get_followers(
+            mock_db, uuid4(), per_page=2, before=datetime.now(UTC),
+            include_total=False,
+        )
+
+        assert (len(follows), total, has_more) == (2, None, True)
+        assert mock_db.execute.await_count == 1
+        sql = str(mock_db.execute.await_args.args[0])
+        assert "OFFSET" not in sql
+        assert "follows.created_at <" in sql
+
+    async def test_composite_cursor_breaks_timestamp_ties(self, mock_db):
+        await FollowService().get_following(
+            mock_db, uuid4(), before=datetime.now(UTC), before_id=uuid4(),
+            include_total=False,
+        )
+
+        sql = str(mock_db.execute.await_args.args[0])
+        assert "(follows.created_at, follows.id) <" in sql
+        assert "ORDER BY follows.created_at DESC, follows.id DESC" in sql
+
+
+class TestFriendsRunning:
+    async def test_sessions_query_does_not_join_users_or_courses(self, mock_db):
+        await FollowService().get_following_active_sessions(mock_db, uuid4())
+
+        sql = str(mock_db.execute.await_args_list[0].args[0])
+        assert "JOIN" not in sql
+        mock_db.execute.return_value.scalars.return_value.unique.assert_not_called()
+
+
+class TestStatementCaching:
+    """Read-path FollowService statements must have a SQLAlchemy cache key, or
+    they are recompiled on each call. The follow insert is exempt: it keeps
+    the PostgreSQL ON CONFLICT construct, which has no cache key."""
+
+    async def test_hot_statements_are_cacheable(self, mock_db):
+        result = mock_db.execute.return_value
+        result.one.return_value = (False, 0, 0)
+        result.scalars.return_value.all.return_value = [uuid4()]
+        result.mappings.return_value = []
+        service = FollowService()
+
+        with (
+            patch.object(follow_module, "make_cache_key", AsyncMock(return_value=None)),
+            patch.object(follow_module, "cache_get", AsyncMock(return_value=None)),
+            patch.object(follow_module, "cache_set", AsyncMock()),
+        ):
+            await service.get_follow_status(mock_db, uuid4(), uuid4())
+            await service.get_followers(mock_db, uuid4())
+            await service.get_activity_feed(mock_db, uuid4())
+
+        for call in mock_db.execute.await_args_list:
+            assert call.args[0]._generate_cache_key() is not None
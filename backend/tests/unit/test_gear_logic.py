@@ -0,0 +1,103 @@
+"""Unit tests for gear service logic (no DB required)."""
+
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import NotFoundError
+from app.services.gear_service import GearService
+
+
+def _statements(mock_db) -> list[str]:
+    return [str(call.args[0]) for call in mock_db.execute.await_args_list]
+
+
+class TestPrimaryGear:
+    async def test_promotion_is_one_update(self, mock_db):
+        user_id = uuid4()
+        gear_id = uuid4()
+        gear = MagicMock(id=gear_id, user_id=user_id, is_primary=False)
+        mock_db.execute.return_value.scalar_one_or_none.return_value = gear
+        mock_db.execute.return_value.scalars.return_value.all.return_value = [
+            MagicMock(id=gear_id, is_primary=True)
+        ]
+
+        await GearService().update_gear(mock_db, user_id, gear_id, is_primary=True)
+
+        updates = [sql for sql in _statements(mock_db) if sql.startswith("UPDATE")]
+        assert len(updates) == 1
+        assert "SET is_primary=(user_gear.id =" in updates[0]
+
+    async def test_create_returns_promoted_row(self, mock_db):
+        gear_id = uuid4()
+        mock_db.execute.return_value.scalar_one.return_value = MagicMock(
+            id=gear_id, is_primary=False
+        )
+        # RETURNING yields the demoted old primary and the promoted new row
+        mock_db.execute.return_value.scalars.return_value.all.return_value = [
+            MagicMock(id=uuid4(), is_primary=False),
+            MagicMock(id=gear_id, is_primary=True),
+        ]
+
+        gear = await GearService().create_gear(
+            mock_db, uuid4(), "Nike", "Pegasus 41", is_primary=True
+        )
+
+        assert gear.id == gear_id
+        assert gear.is_primary is True
+
+    async def test_update_returns_promoted_row(self, mock_db):
+        user_id, gear_id = uuid4(), uuid4()
+        mock_db.execute.return_value.scalar_one_or_none.return_value = MagicMock(
+            id=gear_id, user_id=user_id, is_primary=False
+        )
+        mock_db.execute.return_value.scalars.return_value.all.return_value = [
+            MagicMock(id=gear_id, is_primary=True)
+        ]
+
+        gear = await GearService().update_gear(
+            mock_db, user_id, gear_id, brand="Asics", is_primary=True
+        )
+
+        assert gear.is_primary is True
+
+    async def test_promoted_row_gone_is_not_found(self, mock_db):
+        user_id, gear_id = uuid4(), uuid4()
+        mock_db.execute.return_value.scalar_one_or_none.return_value = MagicMock(
+            id=gear_id, user_id=user_id, is_primary=False
+        )
+        # Deleted between the ownership check and the swap: RETURNING holds
+        # only the demoted old primary
+        mock_db.execute.return_value.scalars.return_value.all.return_value = [
+            MagicMock(id=uuid4(), is_primary=False)
+        ]
+
+        with pytest.raises(NotFoundError):
+            await GearService().update_gear(mock_db, user_id, gear_id, is_primary=True)
+
+
+class TestGearWrites:
+    """Mutations hydrate rows through RETURNING instead of re-selecting."""
+
+    async def test_create_is_one_statement(self, mock_db):
+        await GearService().create_gear(mock_db, uuid4(), "Nike", "Pegasus 41")
+
+        assert mock_db.execute.await_count == 1
+        assert "RETURNING" in _statements(mock_db)[0]
+
+    async def test_field_update_is_one_statement(self, mock_db):
+        gear = MagicMock(is_primary=True)
+        mock_db.execute.return_value.scalar_one_or_none.return_value = gear
+
+        result = await GearService().update_gear(
+            mock_db, uuid4(), uuid4(), brand="Asics"
+        )
+
+        assert result is gear
+        assert mock_db.execute.await_count == 1
+
+    async def test_non_primary_create_skips_update(self, mock_db):
+        await GearService().create_gear(mock_db, uuid4(), "Nike", "Pegasus 41")
+
+        assert not any(sql.startswith("UPDATE") for sql in _statements(mock_db))
@@ -0,0 +1,105 @@
+"""Unit tests for the import pipeline (no DB or files required)."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from geoalchemy2.shape import from_shape, to_shape
+from shapely.geometry import LineString
+
+from app.core.exceptions import PayloadTooLargeError
+from app.services import import_service as import_module
+from app.services.file_parser import ParsedActivity
+from app.services.import_service import ImportService, _linestring_ewkb
+
+
+def _activity() -> ParsedActivity:
+    return ParsedActivity(
+        distance_meters=5000,
+        duration_seconds=1500,
+        route_coordinates=[[127.0, 37.5, 0.0], [127.01, 37.51, 0.0]],
+        started_at=datetime(2024, 5, 1, 7, 0, tzinfo=UTC),
+        finished_at=datetime(2024, 5, 1, 7, 25, tzinfo=UTC),
+    )
+
+
+class TestProcessImport:
+    async def test_no_intermediate_flushes(self, mock_db):
+        ext_import = MagicMock(source="gpx_upload", file_path="/tmp/run.gpx")
+        mock_db.execute.return_value.scalar_one_or_none.return_value = ext_import
+        mock_db.add_all = MagicMock()
+        service = ImportService()
+
+        with (
+            patch.object(service._parser, "parse_gpx", return_value=_activity()),
+            patch.object(service, "_match_to_courses", AsyncMock(return_value=None)),
+        ):
+            await service.process_import(mock_db, uuid4(), uuid4())
+
+        assert ext_import.status == "completed"
+        session, run_record = mock_db.add_all.call_args.args[0]
+        assert run_record.session_id == session.id is not None
+        assert ext_import.run_record_id == run_record.id
+        mock_db.flush.assert_not_awaited()
+        mock_db.commit.assert_awaited_once()
+        # Import lookup + user stats UPDATE
+        assert mock_db.execute.await_count == 2
+
+
+class TestLinestringEwkb:
+    def test_round_trips_through_shapely(self):
+        coords = [[127.0, 37.5, 12.0], [127.001, 37.5004], [127.002, 37.5011, 9.5]]
+        element = _linestring_ewkb(coords)
+
+        assert element.extended and element.srid == 4326
+        assert to_shape(element).equals(LineString([(c[0], c[1]) for c in coords]))
+
+
+class TestBestCourseMatch:
+    def test_picks_the_course_the_run_follows(self):
+        activity = ParsedActivity(
+            points=[SimpleNamespace(lat=37.5 + i * 1e-4, lng=127.0) for i in range(50)]
+        )
+        on_route = LineString([(127.0, 37.5), (127.0, 37.505)])
+        parallel = LineString([(127.002, 37.5), (127.002, 37.505)])
+        courses = [
+            SimpleNamespace(id=uuid4(), title="옆길", route_geometry=from_shape(parallel, 4326)),
+            SimpleNamespace(id=uuid4(), title="한강", route_geometry=from_shape(on_route, 4326)),
+            SimpleNamespace(id=uuid4(), title="없음", route_geometry=None),
+        ]
+
+        best = ImportService._best_course_match(courses, activity)
+
+        assert best["course"] is courses[1]
+        assert best["result"].is_completed
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+class TestSaveUploadFile:
+    @pytest.fixture(autouse=True)
+    def upload_dir(self, tmp_path):
+        settings = SimpleNamespace(UPLOAD_DIR=str(tmp_path))
+        with patch.object(import_module, "get_settings", return_value=settings):
+            yield tmp_path / "imports"
+
+    async def test_streams_chunks_to_disk(self, upload_dir):
+        path = await ImportService().save_upload_file(
+            _chunks(b"<gpx>", b"</gpx>"), "Morning Run.GPX", "gpx_upload"
+        )
+
+        assert path.endswith(".gpx")
+        assert open(path, "rb").read() == b"<gpx></gpx>"
+
+    async def test_oversize_removes_partial_file(self, upload_dir):
+        with pytest.raises(PayloadTooLargeError):
+            await ImportService().save_upload_file(
+                _chunks(b"a" * 4, b"b" * 4), "run.fit", "fit_upload", max_size=6
+            )
+
+        assert list(upload_dir.iterdir()) == []
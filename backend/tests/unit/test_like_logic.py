@@ -0,0 +1,94 @@
+"""Unit tests for course like logic (no DB required)."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core.exceptions import NotFoundError
+from app.services import like_service as like_module
+from app.services.like_service import LikeService
+
+
+class TestToggleLike:
+    async def test_single_round_trip(self, mock_db):
+        mock_db.execute.return_value.one.return_value = MagicMock(
+            is_liked=True, like_count=8
+        )
+
+        result = await LikeService().toggle_like(mock_db, uuid4(), uuid4())
+
+        assert result == {"is_liked": True, "like_count": 8}
+        assert mock_db.execute.await_count == 1
+
+    async def test_fk_violation_is_not_found(self, mock_db):
+        orig = Exception("fk")
+        orig.sqlstate = "23503"
+        mock_db.execute.side_effect = IntegrityError("INSERT", {}, orig)
+
+        with pytest.raises(NotFoundError):
+            await LikeService().toggle_like(mock_db, uuid4(), uuid4())
+        mock_db.rollback.assert_awaited_once()
+
+
+class TestLikeCount:
+    async def test_hit_skips_db(self, mock_db):
+        with patch.object(like_module, "cache_get", AsyncMock(return_value=41)):
+            count = await LikeService().get_course_like_count(mock_db, uuid4())
+
+        assert count == 41
+        mock_db.execute.assert_not_called()
+
+    async def test_miss_counts_and_caches(self, mock_db):
+        course_id = uuid4()
+        mock_db.execute.return_value.scalar_one.return_value = 5
+        cache_set = AsyncMock()
+
+        with (
+            patch.object(like_module, "cache_get", AsyncMock(return_value=None)),
+            patch.object(like_module, "cache_set", cache_set),
+        ):
+            count = await LikeService().get_course_like_count(mock_db, course_id)
+
+        assert count == 5
+        assert cache_set.await_args.args[:2] == (f"like_count:{course_id}", 5)
+
+
+class TestLikeStatus:
+    async def test_miss_answers_in_one_query(self, mock_db):
+        mock_db.execute.return_value.one.return_value = MagicMock(
+            course_exists=True, is_liked=True, like_count=3
+        )
+
+        with (
+            patch.object(like_module, "cache_get", AsyncMock(return_value=None)),
+            patch.object(like_module, "cache_set", AsyncMock()),
+        ):
+            status = await LikeService().get_like_status(mock_db, uuid4(), uuid4())
+
+        assert status == {"is_liked": True, "like_count": 3}
+        assert mock_db.execute.await_count == 1
+        assert "count(course_likes.id)" in str(mock_db.execute.await_args.args[0])
+
+    async def test_hit_drops_count_from_query(self, mock_db):
+        mock_db.execute.return_value.one.return_value = MagicMock(
+            course_exists=True, is_liked=False
+        )
+
+        with patch.object(like_module, "cache_get", AsyncMock(return_value=9)):
+            status = await LikeService().get_like_status(mock_db, uuid4(), uuid4())
+
+        assert status == {"is_liked": False, "like_count": 9}
+        assert "count(" not in str(mock_db.execute.await_args.args[0])
+
+    async def test_missing_course(self, mock_db):
+        mock_db.execute.return_value.one.return_value = MagicMock(course_exists=False)
+
+        with (
+            patch.object(like_module, "cache_get", AsyncMock(return_value=None)),
+            patch.object(like_module, "cache_set", AsyncMock()) as cache_set,
+        ):
+            with pytest.raises(NotFoundError):
+                await LikeService().get_like_status(mock_db, uuid4(), uuid4())
+        cache_set.assert_not_called()
@@ -0,0 +1,77 @@
+"""Unit tests for map matching helpers (no network required)."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.map_matching_service import MapMatchingService
+
+
+class TestRestoreAltitude:
+    def test_takes_nearest_original_altitude(self):
+        original = [[127.0, 37.5, 10.0], [127.001, 37.5, 20.0], [127.002, 37.5, 30.0]]
+        matched = [[127.0019, 37.5001], [127.0001, 37.4999], [127.0011, 37.5]]
+
+        restored = MapMatchingService._restore_altitude(original, matched)
+
+        assert restored == [
+            [127.0019, 37.5001, 30.0],
+            [127.0001, 37.4999, 10.0],
+            [127.0011, 37.5, 20.0],
+        ]
+
+    def test_does_not_lag_behind_dense_originals(self):
+        original = [[127.0 + i * 1e-5, 37.5, float(i)] for i in range(100)]
+        matched = [[127.0, 37.5], [127.00099, 37.5]]
+
+        restored = MapMatchingService._restore_altitude(original, matched)
+
+        assert [c[2] for c in restored] == [0.0, 99.0]
+
+    def test_2d_original_gets_zero_altitude(self):
+        restored = MapMatchingService._restore_altitude(
+            [[127.0, 37.5]], [[127.0, 37.5]]
+        )
+        assert restored == [[127.0, 37.5, 0.0]]
+
+
+
+class TestMatchLongRoute:
+    async def test_chunks_overlap_in_flight_and_stitch_in_order(self):
+        service = MapMatchingService()
+        coords = [[127.0 + i * 1e-4, 37.5] for i in range(250)]
+        in_flight = peak = 0
+
+        async def fake_match_chunk(chunk, token):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Later chunks finish first; stitching must still follow the route
+            await asyncio.sleep(0.01 * (3 - coords.index(chunk[0]) // 80))
+            in_flight -= 1
+            if coords.index(chunk[0]) == 80:
+                raise RuntimeError("boom")  # falls back to the raw chunk
+            return chunk
+
+        with patch.object(service, "_match_chunk", side_effect=fake_match_chunk):
+            stitched = await service._match_long_route(coords, "token")
+
+        assert stitched == coords
+        assert peak == 3
+
+
+class TestMatchChunkRequest:
+    async def test_encodes_coordinates_and_radiuses(self):
+        service = MapMatchingService()
+        client = MagicMock()
+        client.get = AsyncMock(return_value=MagicMock(status_code=500))
+        coords = [[127.1, 37.5, 5.0], [127.10001, 37.50002], [127.1002, 37.5003]]
+
+        with patch.object(service, "_get_client", AsyncMock(return_value=client)):
+            assert await service._match_chunk(coords, "token") is None
+
+        url = client.get.await_args.args[0]
+        params = client.get.await_args.kwargs["params"]
+        assert url.endswith(
+            "/127.100000,37.500000;127.100010,37.500020;127.100200,37.500300"
+        )
+        assert params["radiuses"] == "35;20;35"
@@ -0,0 +1,43 @@
+"""Unit tests for push notification logic (no DB or FCM required)."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+from app.services.notification_service import NotificationService
+
+
+def _service(fcm_path: str | None = "/secrets/fcm.json") -> NotificationService:
+    return NotificationService(SimpleNamespace(FCM_SERVICE_ACCOUNT_PATH=fcm_path))
+
+
+class TestSendToUser:
+    async def test_invalid_tokens_removed_in_one_delete(self, mock_db):
+        service = _service()
+        multicast = AsyncMock(return_value=(2, ["stale-a", "stale-b"]))
+
+        with (
+            patch.object(service, "get_user_tokens", AsyncMock(return_value=["a", "b", "stale-a", "stale-b"])),
+            patch.object(service, "_send_fcm_multicast", multicast),
+        ):
+            sent = await service.send_to_user(mock_db, uuid4(), "제목", "본문")
+
+        assert sent == 2
+        assert multicast.await_count == 1
+        assert mock_db.execute.await_count == 1
+        assert "device_tokens.device_token IN" in str(mock_db.execute.await_args.args[0])
+
+    async def test_all_sent_skips_delete(self, mock_db):
+        service = _service()
+
+        with (
+            patch.object(service, "get_user_tokens", AsyncMock(return_value=["a"])),
+            patch.object(service, "_send_fcm_multicast", AsyncMock(return_value=(1, []))),
+        ):
+            assert await service.send_to_user(mock_db, uuid4(), "제목", "본문") == 1
+
+        mock_db.execute.assert_not_called()
+
+    async def test_unconfigured_fcm_pretends_success(self):
+        sent, invalid = await _service(None)._send_fcm_multicast(["a", "b"], "t", "b")
+        assert (sent, invalid) == (2, [])
@@ -0,0 +1,168 @@
+"""Unit tests for course leaderboard logic (no DB required)."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.models.ranking import Ranking
+from app.services import ranking_service as ranking_module
+from app.services.ranking_service import RankingService
+
+
+def _row(position: int, tie_rank: int, *, in_page: bool, user_id=None, total: int = 50):
+    return SimpleNamespace(
+        user_id=user_id or uuid4(),
+        best_duration_seconds=1500 + position,
+        best_pace_seconds_per_km=300,
+        run_count=2,
+        achieved_at=datetime(2024, 5, 1, tzinfo=UTC),
+        nickname=f"runner{position}",
+        avatar_url=None,
+        crew_name=None,
+        runner_level=1,
+        position=position,
+        tie_rank=tie_rank,
+        total=total,
+        in_page=in_page,
+    )
+
+
+@pytest.fixture
+def no_cache():
+    """Force the cache-miss path regardless of Redis availability."""
+    with patch.object(ranking_module, "make_cache_key", AsyncMock(return_value=None)):
+        yield
+
+
+@pytest.mark.usefixtures("no_cache")
+class TestCourseRankings:
+    async def test_page_and_my_ranking_in_one_query(self, mock_db):
+        me = uuid4()
+        mock_db.execute.return_value.all.return_value = [
+            _row(21, 20, in_page=True),
+            _row(22, 20, in_page=True),
+            _row(37, 35, in_page=False, user_id=me),
+        ]
+
+        result = await RankingService().get_course_rankings(
+            mock_db, uuid4(), page=1, per_page=20, requesting_user_id=me
+        )
+
+        assert mock_db.execute.await_count == 1
+        assert [entry["rank"] for entry in result["data"]] == [21, 22]
+        assert result["my_ranking"]["rank"] == 35
+        assert result["total_runners"] == 50
+
+    async def test_own_row_on_page_is_listed_and_ranked(self, mock_db):
+        me = uuid4()
+        mock_db.execute.return_value.all.return_value = [_row(1, 1, in_page=True, user_id=me)]
+
+        result = await RankingService().get_course_rankings(
+            mock_db, uuid4(), requesting_user_id=me
+        )
+
+        assert len(result["data"]) == 1
+        assert result["my_ranking"]["rank"] == 1
+
+    async def test_past_last_page_falls_back_to_count(self, mock_db):
+        mock_db.execute.return_value.scalar.return_value = 7
+
+        result = await RankingService().get_course_rankings(mock_db, uuid4(), page=5)
+
+        assert result == {"data": [], "my_ranking": None, "total_runners": 7}
+        assert mock_db.execute.await_count == 2
+
+    async def test_empty_first_page_needs_no_count(self, mock_db):
+        result = await RankingService().get_course_rankings(mock_db, uuid4())
+
+        assert result["total_runners"] == 0
+        assert mock_db.execute.await_count == 1
+
+
+class TestLeaderboardCache:
+    async def test_hit_only_queries_own_ranking(self, mock_db):
+        cached = [[{"rank": 1, "user": {"id": "u"}}], 12]
+        mock_db.execute.return_value.one_or_none.return_value = MagicMock(
+            rank=4, best_duration_seconds=1600, best_pace_seconds_per_km=320
+        )
+
+        with (
+            patch.object(ranking_module, "make_cache_key", AsyncMock(return_value="k")),
+            patch.object(ranking_module, "cache_get", AsyncMock(return_value=cached)),
+        ):
+            result = await RankingService().get_course_rankings(
+                mock_db, uuid4(), requesting_user_id=uuid4()
+            )
+
+        assert result["data"] == cached[0]
+        assert result["total_runners"] == 12
+        assert result["my_ranking"]["rank"] == 4
+        assert mock_db.execute.await_count == 1
+
+    async def test_anonymous_hit_skips_db(self, mock_db):
+        with (
+            patch.object(ranking_module, "make_cache_key", AsyncMock(return_value="k")),
+            patch.object(ranking_module, "cache_get", AsyncMock(return_value=[[], 0])),
+        ):
+            await RankingService().get_course_rankings(mock_db, uuid4())
+
+        mock_db.execute.assert_not_called()
+
+    async def test_miss_caches_page_without_my_ranking(self, mock_db):
+        me = uuid4()
+        mock_db.execute.return_value.all.return_value = [
+            _row(1, 1, in_page=True),
+            _row(9, 9, in_page=False, user_id=me),
+        ]
+        cache_set = AsyncMock()
+
+        with (
+            patch.object(ranking_module, "make_cache_key", AsyncMock(return_value="k")),
+            patch.object(ranking_module, "cache_get", AsyncMock(return_value=None)),
+            patch.object(ranking_module, "cache_set", cache_set),
+        ):
+            await RankingService().get_course_rankings(
+                mock_db, uuid4(), requesting_user_id=me
+            )
+
+        data, total = cache_set.await_args.args[1]
+        assert [entry["rank"] for entry in data] == [1]
+        assert total == 50
+
+
+class TestMyRanking:
+    async def test_rank_and_total_in_one_query(self, mock_db):
+        mock_db.execute.return_value.one.return_value = MagicMock(
+            total_runners=40, best_duration_seconds=1500, rank=10
+        )
+
+        result = await RankingService().get_my_ranking(mock_db, uuid4(), uuid4())
+
+        assert result == {
+            "rank": 10,
+            "best_duration_seconds": 1500,
+            "total_runners": 40,
+            "percentile": 25.0,
+        }
+        assert mock_db.execute.await_count == 1
+
+    async def test_unranked_user_still_gets_total(self, mock_db):
+        mock_db.execute.return_value.one.return_value = MagicMock(
+            total_runners=40, best_duration_seconds=None, rank=1
+        )
+
+        result = await RankingService().get_my_ranking(mock_db, uuid4(), uuid4())
+
+        assert result["rank"] is None
+        assert result["total_runners"] == 40
+
+
+class TestRankingLoading:
+    def test_entity_select_does_not_join_users(self):
+        # The leaderboard joins users explicitly; other Ranking reads
+        # (my-ranking, upsert RETURNING, profile top 5) never touch .user.
+        assert "users" not in str(select(Ranking))
@@ -0,0 +1,29 @@
+"""Unit tests for course review logic (no DB required)."""
+
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions import ConflictError, NotFoundError
+from app.services.review_service import ReviewService
+
+
+class TestCreateReview:
+    async def test_missing_course(self, mock_db):
+        mock_db.execute.return_value.one.return_value = MagicMock(
+            course_exists=False, already_reviewed=False
+        )
+        with pytest.raises(NotFoundError):
+            await ReviewService().create_review(mock_db, uuid4(), uuid4(), rating=5)
+        assert mock_db.execute.await_count == 1
+        mock_db.add.assert_not_called()
+
+    async def test_duplicate_review(self, mock_db):
+        mock_db.execute.return_value.one.return_value = MagicMock(
+            course_exists=True, already_reviewed=True
+        )
+        with pytest.raises(ConflictError) as exc:
+            await ReviewService().create_review(mock_db, uuid4(), uuid4(), rating=5)
+        assert exc.value.code == "DUPLICATE_REVIEW"
+        assert mock_db.execute.await_count == 1